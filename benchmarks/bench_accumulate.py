@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of integrating spectra of "OCTAD-S".
+
+The time to integrate one second of spectra of the three threads is
+compared with the integration time (5 or 10 ms), in order to check
+that the accumulator keeps up in real time.
+
+Usage::
+
+    $ python benchmarks/bench_accumulate.py --channels 8192
+"""
+import argparse
+import time
+
+import numpy as np
+from maodevice.correlator import SpectralAccumulator
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=8192)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    auto = rng.random(args.channels)
+    cross = auto * np.exp(1j * rng.random(args.channels))
+    flags = rng.random((100, args.channels)) < 0.01
+
+    print(f"{'integ time (ms)':<16} {'add (us)':>10} {'add_block (us)':>16}")
+    for integ_time in (0.005, 0.01):
+        n = int(round(1. / integ_time))
+        acc = SpectralAccumulator(args.channels, integ_time, cadence=1.)
+
+        start = time.perf_counter()
+        for i in range(n):
+            acc.add(1, auto, flags=flags[i % 100])
+            acc.add(2, auto, flags=flags[i % 100])
+            acc.add(5, cross, flags=flags[i % 100])
+        per_add = (time.perf_counter() - start) / n / 3 * 1e6
+
+        autos = np.broadcast_to(auto, (n, args.channels))
+        crosses = np.broadcast_to(cross, (n, args.channels))
+        block_flags = np.resize(flags, (n, args.channels))
+        start = time.perf_counter()
+        acc.add_block(1, autos, flags=block_flags)
+        acc.add_block(2, autos, flags=block_flags)
+        acc.add_block(5, crosses, flags=block_flags)
+        per_block = (time.perf_counter() - start) / n / 3 * 1e6
+
+        print(f"{integ_time * 1e3:<16} {per_add:>10.1f} {per_block:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
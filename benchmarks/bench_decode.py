@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of decoding VDIF frames by the multiprocess pipeline.
+
+Every slot of the ring is filled once, and then the slots are decoded
+repeatedly, so that the throughput of the workers is measured without
+the cost of receiving. The number of workers 0 means decoding in the
+main process without the pipeline.
+
+Usage::
+
+    $ python benchmarks/bench_decode.py --workers 1 2 4 8
+"""
+import argparse
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+# The benchmark runs from the repository without installing the package.
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+from maodevice.correlator import DecodePipeline  # noqa: E402
+from maodevice.correlator.vdif import decode_frames  # noqa: E402
+
+
+def make_frames(frame_bytes, n_frames):
+    n_samples = (frame_bytes - 32) // 4
+    header = struct.pack(
+        "<8I", 0, 0, frame_bytes // 8, (1 << 31) | (31 << 26) | (5 << 16),
+        0, 0, 0, 0,
+    )
+    payload = np.arange(n_samples, dtype=">f4").tobytes()
+    return (header + payload) * n_frames
+
+
+def bench_serial(args):
+    data = bytearray(make_frames(args.frame_bytes, args.frames_per_slot))
+    start = time.perf_counter()
+    for _ in range(args.slots):
+        decode_frames(data, args.frame_bytes)
+    return args.slots * args.frames_per_slot / (time.perf_counter() - start)
+
+
+def bench_pipeline(args, n_workers):
+    data = make_frames(args.frame_bytes, args.frames_per_slot)
+    with DecodePipeline(
+            args.frame_bytes, args.frames_per_slot, n_workers=n_workers
+    ) as pipeline:
+        for _ in range(pipeline.n_slots):
+            pipeline.write(data)
+        for _ in range(pipeline.n_slots):
+            pipeline.get()
+
+        start = time.perf_counter()
+        for slot in range(pipeline.n_slots):
+            pipeline.submit(slot)
+        for _ in range(args.slots):
+            slot, frames = pipeline.get()
+            del frames
+            pipeline.submit(slot)
+        for _ in range(pipeline.n_slots):
+            pipeline.get()
+        elapsed = time.perf_counter() - start
+
+    n_slots = args.slots + pipeline.n_slots
+    return n_slots * args.frames_per_slot / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frame-bytes", type=int, default=8224)
+    parser.add_argument("--frames-per-slot", type=int, default=64)
+    parser.add_argument("--slots", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    print(f"{'workers':<8} {'frames/s':>12}")
+    print(f"{0:<8} {bench_serial(args):>12.0f}")
+    for n_workers in args.workers:
+        print(f"{n_workers:<8} {bench_pipeline(args, n_workers):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
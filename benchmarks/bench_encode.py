@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of encoding commands of "OCTAD-S".
+
+The cost per call of a generated method is compared between the cache
+of encoded commands enabled and disabled, with a communicator which
+discards written bytes.
+
+Usage::
+
+    $ python benchmarks/bench_encode.py --number 200000
+"""
+import argparse
+import timeit
+
+from maodevice.core import BaseCommunicator
+from maodevice.correlator import OctadS
+
+
+class NullCom(BaseCommunicator):
+    """Communicator which discards written bytes.
+    """
+    METHOD = "Null"
+
+    def __init__(self, encode_cache_size):
+        self.encode_cache_size = encode_cache_size
+
+    def open(self):
+        self.connection = True
+
+    def close(self):
+        self.connection = False
+
+    def write(self, data):
+        pass
+
+    def recv(self, byte=4096):
+        return b""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(
+        f"{'cache size':<12} {'scaling (ns)':>14}"
+        f" {'dynamic range (ns)':>20}"
+    )
+    for size in (0, 1024):
+        octad = OctadS(NullCom(size))
+        costs = [
+            timeit.timeit(stmt, number=args.number, globals={"o": octad})
+            / args.number * 1e9
+            for stmt in (
+                "o.select_correlation_scaling(5, 12)",
+                "o.set_adc_dynamic_range(1, 256., 0.)",
+            )
+        ]
+        print(f"{size:<12} {costs[0]:>14.1f} {costs[1]:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
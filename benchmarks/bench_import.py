@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of the cold import time of "maodevice".
+
+Each statement is executed in a fresh interpreter, so that the
+measured time includes all imports triggered by it. The package is
+compiled beforehand, so that the time does not include the compile.
+
+The benchmark fails if a statement of "LIGHT_STATEMENTS" imports one
+of "HEAVY_MODULES", or if the median time of a statement exceeds
+"--budget".
+
+Usage::
+
+    $ python benchmarks/bench_import.py --repeat 20
+    $ python benchmarks/bench_import.py --budget 20
+"""
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+STATEMENTS = [
+    "pass",
+    "import maodevice",
+    "from maodevice.correlator import OctadS",
+    "from maodevice.communicator import SocketCom",
+    "from maodevice.communicator import SerialCom",
+    "from maodevice.transmitter import Model3390AWG",
+]
+
+LIGHT_STATEMENTS = [
+    "import maodevice",
+    "from maodevice.correlator import OctadS",
+]
+
+HEAVY_MODULES = [
+    "concurrent.futures",
+    "contextlib",
+    "inspect",
+    "re",
+    "socket",
+    "string",
+]
+
+TIMER = (
+    "import time; t0 = time.perf_counter(); {stmt}; "
+    "print(time.perf_counter() - t0)"
+)
+
+MODULES = "{stmt}; import sys; print(' '.join(sys.modules))"
+
+
+def measure(stmt, repeat):
+    """Measure the import time of a statement in fresh interpreters.
+
+    Args:
+        stmt (str): Statement to execute.
+        repeat (int): Number of interpreters to launch.
+
+    Return:
+        ret (:obj:`list` of :obj:`float`): Elapsed times (sec).
+    """
+    ret = []
+    for _ in range(repeat):
+        out = subprocess.check_output(
+            [sys.executable, "-c", TIMER.format(stmt=stmt)], cwd=ROOT
+        )
+        ret.append(float(out))
+    return ret
+
+
+def heavy_modules(stmt):
+    """Find the heavy modules imported by a statement.
+
+    Args:
+        stmt (str): Statement to execute.
+
+    Return:
+        ret (:obj:`list` of :obj:`str`): Names of the heavy modules
+            which are not imported by "pass".
+    """
+    modules = []
+    for s in ("pass", stmt):
+        out = subprocess.check_output(
+            [sys.executable, "-c", MODULES.format(stmt=s)], cwd=ROOT
+        )
+        modules.append(set(out.decode().split()))
+    return [name for name in HEAVY_MODULES
+            if name in modules[1] - modules[0]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument(
+        "--budget", type=float, default=None,
+        help="maximum median time of a statement (ms)",
+    )
+    args = parser.parse_args()
+
+    compileall.compile_dir(
+        os.path.join(ROOT, "maodevice"), quiet=1, legacy=False
+    )
+    failures = []
+    print(f"{'statement':<50} {'median (ms)':>12} {'min (ms)':>10}")
+    for stmt in STATEMENTS:
+        times = measure(stmt, args.repeat)
+        median = statistics.median(times) * 1e3
+        print(f"{stmt:<50} {median:>12.3f} {min(times) * 1e3:>10.3f}")
+        if stmt in LIGHT_STATEMENTS:
+            heavy = heavy_modules(stmt)
+            if heavy:
+                failures.append(f"{stmt}: imports {', '.join(heavy)}")
+        if args.budget is not None and median > args.budget:
+            failures.append(f"{stmt}: {median:.3f} ms > {args.budget} ms")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""Stress test of the control host by a scripted observation night.
+
+The devices are simulated in a child process ("maodevice.simulator"),
+and this process drives them as an observation does:
+
+- VDIF of the threads 1, 2 and 5 at "--vdif-rate" each, started by
+  "set_vdif_destination_*" and received by the decode pipeline,
+- telemetry of "OctadS" at "--telemetry-rate",
+- status polling of the "RFLL-20-H" modules every "--rfll-interval",
+- frequency sweeps of the AWG with "--sweep-steps" steps every
+  "--sweep-interval".
+
+The commands are planned by "CommandScheduler" (one per stream), and
+their latencies are taken from the audit records. The report shows the
+CPU time of this process, the pipeline workers and the simulators, the
+peak memory, the dropped VDIF frames and the latency percentiles of
+the commands. The schedulers busy-wait for "--spin" before each entry
+as in production, and the report shows the bound of the CPU time of
+the busy-wait, which is included in the CPU time of this process.
+
+Usage::
+
+    $ python benchmarks/stress_night.py --duration 600 --vdif-rate 2e9
+"""
+import argparse
+import multiprocessing as mp
+import queue
+import resource
+import socket
+import threading
+import time
+
+import numpy as np
+from maodevice.communicator import SocketCom
+from maodevice.correlator import DecodePipeline, OctadS, octad_s
+from maodevice.scheduler import CommandScheduler
+from maodevice.simulator import DeviceSimulator, VdifSender
+from maodevice.transmitter import (
+    Lta20Q, Md20M, Model3390AWG, Pd30M, model3390_awg, rfll_20_h,
+)
+
+THREADS = (1, 2, 5)
+SCPI_REPLIES = {
+    "*IDN?": "Keithley Instruments Inc.,3390,0000000,0.0-0.0-0.0",
+    "SYST:ERR?": '+0,"No error"',
+}
+
+
+def simulate(conn, args):
+    """Serve the simulators until "stop" is received from the pipe."""
+    sender = VdifSender(args.vdif_rate, args.frame_bytes)
+    destinations = {}
+
+    def set_ip(n, ip):
+        destinations.setdefault(n, ["127.0.0.1", None])[0] = ip
+
+    def set_port(n, port):
+        destinations.setdefault(n, ["127.0.0.1", None])[1] = port
+        sender.start(destinations[n], n)
+
+    simulators = {
+        "octad": DeviceSimulator(octad_s.COMMANDS, ";", {
+            "show_status": "status=none",
+            "show_temperature": "temp=45.2",
+            "show_1pps_gap": "1ppsgap=12",
+        }),
+        "awg": DeviceSimulator(model3390_awg.COMMANDS, "\n", SCPI_REPLIES,
+                               separator=";:"),
+        "md": DeviceSimulator(rfll_20_h.MD_20_M_COMMANDS, "\r\n"),
+        "lta": DeviceSimulator(rfll_20_h.LTA_20_Q_COMMANDS, "\r\n"),
+        "pd": DeviceSimulator(rfll_20_h.PD_30_M_COMMANDS, "\r\n"),
+    }
+    simulators["octad"].on("set_vdif_destination_ip", set_ip)
+    simulators["octad"].on("set_vdif_destination_port", set_port)
+    for simulator in simulators.values():
+        simulator.start()
+
+    conn.send({name: sim.address for name, sim in simulators.items()})
+    conn.recv()
+    sender.stop()
+    for simulator in simulators.values():
+        simulator.stop()
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    conn.send({
+        "vdif": dict(sender.stats),
+        "cpu": usage.ru_utime + usage.ru_stime,
+        "rss": usage.ru_maxrss,
+    })
+
+
+def consume(pipeline, counts, stop):
+    """Count and release the decoded slots."""
+    while not stop.is_set():
+        try:
+            slot, frames = pipeline.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        counts["frames"] += len(frames)
+        counts["slots"] += 1
+        del frames
+        pipeline.release(slot)
+
+
+def free_port():
+    """A free UDP port of the local host."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def udp_receive_errors():
+    """"RcvbufErrors" of UDP in "/proc/net/snmp" (None if unavailable)."""
+    try:
+        with open("/proc/net/snmp") as f:
+            lines = [line.split() for line in f if line.startswith("Udp:")]
+        return int(lines[1][lines[0].index("RcvbufErrors")])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def plan(args, t0, devices):
+    """Schedule the commands of the night, one scheduler per stream.
+
+    The schedulers busy-wait for "--spin" (the default of
+    "CommandScheduler" if it is not given) before each entry.
+    """
+    octad, awg, rfll = devices["octad"], devices["awg"], devices["rfll"]
+    end = t0 + args.duration
+    options = {} if args.spin is None else {"spin": args.spin}
+    schedulers = {}
+
+    telemetry = CommandScheduler(**options)
+    period = 1. / args.telemetry_rate
+    entries = []
+    for i, t in enumerate(np.arange(t0, end, period)):
+        command = ("show_status", "show_temperature", "show_1pps_gap")[i % 3]
+        entries.append((t, octad, command))
+    telemetry.schedule_many(entries)
+    schedulers["telemetry"] = telemetry
+
+    polling = CommandScheduler(**options)
+    polling.schedule_many([
+        (t, device, "show_status")
+        for t in np.arange(t0, end, args.rfll_interval)
+        for device in rfll
+    ])
+    schedulers["rfll"] = polling
+
+    sweeps = CommandScheduler(**options)
+    entries = []
+    step = args.sweep_interval / (args.sweep_steps + 1)
+    freqs = np.linspace(1e6, 10e6, args.sweep_steps)
+    for t in np.arange(t0, end, args.sweep_interval):
+        for i, freq in enumerate(freqs):
+            entries.append((t + i * step, awg, "set_frequency", (freq,)))
+        entries.append((t + len(freqs) * step, awg, "query_frequency"))
+    sweeps.schedule_many(entries)
+    schedulers["awg"] = sweeps
+    return schedulers
+
+
+def percentiles(values):
+    if not len(values):
+        return "-"
+    p50, p90, p99 = np.percentile(values, [50, 90, 99]) * 1e3
+    return f"{p50:8.3f} {p90:8.3f} {p99:8.3f} {np.max(values) * 1e3:8.3f}"
+
+
+def report(args, schedulers, counts, sim, cpu, wall, rss, udp_errors):
+    print(f"duration        {wall:.1f} s")
+    for name in ("host", "pipeline", "simulator"):
+        print(f"cpu ({name}){'':<{9 - len(name)}} {cpu[name]:.2f} s "
+              f"({100 * cpu[name] / wall:.1f} %)")
+    # Each entry busy-waits for at most the spin, which is counted as
+    # the CPU time of the host.
+    spin = sum(len(s.audit) * s.spin for s in schedulers.values())
+    print(f"cpu (spin)      <= {spin:.2f} s "
+          f"({100 * spin / wall:.1f} %, "
+          f"spin {next(iter(schedulers.values())).spin * 1e3:g} ms)")
+    print(f"max rss         {rss['host'] / 1024:.1f} MiB (host), "
+          f"{rss['children'] / 1024:.1f} MiB (largest child), "
+          f"{rss['simulator'] / 1024:.1f} MiB (simulator)")
+
+    sent = sim["vdif"]
+    dropped = sent["sent"] - counts["frames"]
+    rate = 8 * args.frame_bytes * counts["frames"] / wall
+    print(f"vdif frames     sent {sent['sent']}, "
+          f"received {counts['frames']}, dropped {dropped} "
+          f"({100 * dropped / max(sent['sent'], 1):.2f} %), "
+          f"{rate / 1e6:.1f} Mbit/s")
+    print(f"vdif sender     skipped {sent['skipped']}, "
+          f"errors {sent['errors']}")
+    if udp_errors is not None:
+        print(f"udp rcvbuf err  {udp_errors}")
+
+    print()
+    print(f"{'stream':<10} {'command':<18} {'count':>6} {'errors':>6} "
+          f"{'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} (ms)")
+    for stream, scheduler in schedulers.items():
+        records = {}
+        for record in scheduler.audit:
+            records.setdefault(record.command, []).append(record)
+        for command, rows in sorted(records.items()):
+            latency = np.array([r.done - r.sent for r in rows])
+            errors = sum(r.error is not None for r in rows)
+            print(f"{stream:<10} {command:<18} {len(rows):>6} {errors:>6} "
+                  f"{percentiles(latency)}")
+        late = scheduler.lateness()
+        print(f"{stream:<10} {'(lateness)':<18} {late['count']:>6} "
+              f"{'':>6} mean {late['mean'] * 1e3:.3f}, "
+              f"max {late['max'] * 1e3:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=60.)
+    parser.add_argument("--vdif-rate", type=float, default=256e6,
+                        help="bit rate of a VDIF thread (bit/s)")
+    parser.add_argument("--frame-bytes", type=int, default=8224)
+    parser.add_argument("--frames-per-slot", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--telemetry-rate", type=float, default=10.)
+    parser.add_argument("--rfll-interval", type=float, default=1.)
+    parser.add_argument("--sweep-interval", type=float, default=10.)
+    parser.add_argument("--sweep-steps", type=int, default=50)
+    parser.add_argument("--spin", type=float, default=None,
+                        help="busy-wait of the schedulers (sec), "
+                             "defaults to the one of CommandScheduler")
+    args = parser.parse_args()
+
+    conn, child_conn = mp.Pipe()
+    simulator = mp.Process(target=simulate, args=(child_conn, args),
+                           daemon=True)
+    simulator.start()
+    addresses = conn.recv()
+
+    devices = {
+        "octad": OctadS(SocketCom(*addresses["octad"])),
+        "awg": Model3390AWG(SocketCom(*addresses["awg"])),
+        "rfll": [
+            Md20M(SocketCom(*addresses["md"])),
+            Lta20Q(SocketCom(*addresses["lta"])),
+            Pd30M(SocketCom(*addresses["pd"])),
+        ],
+    }
+
+    counts = {"frames": 0, "slots": 0}
+    stop = threading.Event()
+    udp_errors = udp_receive_errors()
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+
+    pipeline = DecodePipeline(args.frame_bytes, args.frames_per_slot,
+                              n_workers=args.workers)
+    pipeline.start()
+    consumer = threading.Thread(target=consume,
+                                args=(pipeline, counts, stop))
+    consumer.start()
+    octad = devices["octad"]
+    for n in THREADS:
+        address = ("127.0.0.1", free_port())
+        pipeline.receive(address)
+        octad.set_vdif_destination_ip(n, address[0])
+        octad.set_vdif_destination_port(n, address[1])
+
+    schedulers = plan(args, time.time() + 0.5, devices)
+    for scheduler in schedulers.values():
+        scheduler.start()
+    time.sleep(args.duration + 0.5)
+    for scheduler in schedulers.values():
+        scheduler.stop()
+
+    conn.send("stop")
+    sim = conn.recv()
+    time.sleep(0.2)
+    stop.set()
+    consumer.join()
+    pipeline.stop()
+    wall = time.perf_counter() - start
+    end = resource.getrusage(resource.RUSAGE_SELF)
+    if udp_errors is not None:
+        udp_errors = udp_receive_errors() - udp_errors
+
+    # The children include the simulator after it is joined, and its
+    # own usage is subtracted from them.
+    simulator.join()
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = {
+        "host": end.ru_utime + end.ru_stime
+        - usage.ru_utime - usage.ru_stime,
+        "pipeline": children.ru_utime + children.ru_stime - sim["cpu"],
+        "simulator": sim["cpu"],
+    }
+    rss = {
+        "host": end.ru_maxrss,
+        "children": children.ru_maxrss,
+        "simulator": sim["rss"],
+    }
+
+    for device in [octad, devices["awg"], *devices["rfll"]]:
+        device.close()
+    report(args, schedulers, counts, sim, cpu, wall, rss, udp_errors)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,23 @@
 # -*- coding: utf-8 -*-
-from . import communicator
-from . import correlator
-from . import transmitter
+from .utils.lazy import lazy_loader
+
+__all__ = [
+    "communicator",
+    "correlator",
+    "transmitter",
+    "utils",
+]
+
+__getattr__, __dir__ = lazy_loader(
+    __name__,
+    submodules=__all__,
+    attributes={
+        "SerialCom": ".communicator",
+        "SocketCom": ".communicator",
+        "OctadS": ".correlator",
+        "Model3390AWG": ".transmitter",
+        "Md20M": ".transmitter",
+        "Lta20Q": ".transmitter",
+        "Pd30M": ".transmitter",
+    },
+)
@@ -0,0 +1,589 @@
+# -*- coding: utf-8 -*-
+"""Append-only on-disk archive of fixed-size records.
+
+An archive is a directory which contains the following files.
+
+- ``meta.json``: Record dtype and layout of the archive.
+- ``index.bin``: Time index of the sealed segments.
+- ``<n>.seg``: Hot segments (raw records, memory-mapped by readers).
+- ``<n>.segz``: Cold segments (zlib-compressed chunks of records).
+
+Records are NumPy structured scalars and must be appended in
+non-decreasing order of the time field.
+"""
+__all__ = [
+    "ArchiveReader",
+    "ArchiveWriter",
+    "compress_segments",
+]
+
+import ast
+import bisect
+import json
+import os
+import struct
+import zlib
+
+import numpy as np
+
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+INDEX_FILE = "index.bin"
+HOT_SUFFIX = ".seg"
+COLD_SUFFIX = ".segz"
+COLD_MAGIC = b"MAOZ"
+COLD_HEADER = struct.Struct("<4sII")
+
+
+def _segment_path(path, number, suffix):
+    return os.path.join(path, f"{number:08d}{suffix}")
+
+
+def _index_dtype(time_dtype):
+    return np.dtype([
+        ("segment", "<i8"),
+        ("count", "<i8"),
+        ("t_first", time_dtype),
+        ("t_last", time_dtype),
+    ])
+
+
+def _chunk_dtype(time_dtype):
+    return np.dtype([
+        ("offset", "<u8"),
+        ("length", "<u8"),
+        ("count", "<u8"),
+        ("t_first", time_dtype),
+    ])
+
+
+def _read_meta(path):
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+
+    assert meta["version"] == FORMAT_VERSION, \
+        f"{path}: unsupported archive version {meta['version']}."
+
+    dtype = np.dtype(ast.literal_eval(meta["dtype"]))
+    return dtype, meta["time_field"], meta["segment_records"]
+
+
+def _read_index(path, time_dtype):
+    index_path = os.path.join(path, INDEX_FILE)
+    dtype = _index_dtype(time_dtype)
+    if not os.path.exists(index_path):
+        return np.empty(0, dtype=dtype)
+
+    with open(index_path, "rb") as f:
+        raw = f.read()
+    # Ignore a partially written entry.
+    n_entries = len(raw) // dtype.itemsize
+    return np.frombuffer(raw[:n_entries * dtype.itemsize], dtype=dtype)
+
+
+def _list_segments(path):
+    hot, cold = set(), set()
+    for name in os.listdir(path):
+        stem, suffix = os.path.splitext(name)
+        if not stem.isdigit():
+            continue
+        if suffix == HOT_SUFFIX:
+            hot.add(int(stem))
+        elif suffix == COLD_SUFFIX:
+            cold.add(int(stem))
+    return hot, cold
+
+
+class ArchiveWriter(object):
+    """Append records to an archive.
+
+    If the archive already exists, the writer resumes appending to it.
+
+    Args:
+        path (str): Directory of the archive.
+        dtype (numpy.dtype or None): Record dtype.
+            Required only when creating a new archive.
+        time_field (str): Name of the time field of the record.
+            Defaults to "time".
+        segment_records (int): Number of records per segment.
+            Defaults to 1048576.
+        buffer_records (int): Number of records buffered in memory
+            before they are written to the disk.
+            Defaults to 4096.
+
+    Attributes:
+        dtype (numpy.dtype): Record dtype.
+        time_field (str): Name of the time field of the record.
+        segment_records (int): Number of records per segment.
+    """
+    def __init__(
+            self,
+            path,
+            dtype=None,
+            time_field="time",
+            segment_records=1048576,
+            buffer_records=4096,
+    ):
+        self.path = path
+        if os.path.exists(os.path.join(path, META_FILE)):
+            self.dtype, self.time_field, self.segment_records = \
+                _read_meta(path)
+            assert dtype is None or np.dtype(dtype) == self.dtype, \
+                f"dtype: expected to be {self.dtype}."
+        else:
+            assert dtype is not None, \
+                "dtype: required to create a new archive."
+            self.dtype = np.dtype(dtype)
+            self.time_field = time_field
+            self.segment_records = segment_records
+            self._write_meta()
+
+        assert self.time_field in self.dtype.names, \
+            f"dtype: expected to have the field '{self.time_field}'."
+
+        self._time_dtype = self.dtype[self.time_field]
+        self._buffer = np.empty(buffer_records, dtype=self.dtype)
+        self._pending = 0
+        self._file = None
+        self._resume()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _write_meta(self):
+        os.makedirs(self.path, exist_ok=True)
+        meta = {
+            "version": FORMAT_VERSION,
+            "dtype": repr(self.dtype.descr),
+            "time_field": self.time_field,
+            "segment_records": self.segment_records,
+        }
+        with open(os.path.join(self.path, META_FILE), "w") as f:
+            json.dump(meta, f)
+
+    def _resume(self):
+        """Find the segment to append to.
+
+        Note:
+            This method is only for the internal use.
+
+        Return:
+            None
+        """
+        index = _read_index(self.path, self._time_dtype)
+        hot, cold = _list_segments(self.path)
+        sealed = set(index["segment"].tolist())
+        active = sorted(hot - sealed)
+        last_sealed = max(sealed | cold, default=-1)
+
+        self._last_time = index["t_last"][-1] if len(index) else None
+        self._segment = active[0] if active else last_sealed + 1
+        self._count = 0
+        if not active:
+            return
+
+        seg_path = _segment_path(self.path, self._segment, HOT_SUFFIX)
+        itemsize = self.dtype.itemsize
+        self._count = min(
+            os.path.getsize(seg_path) // itemsize, self.segment_records
+        )
+        # Drop a partially written record at the end of the segment.
+        with open(seg_path, "r+b") as f:
+            f.truncate(self._count * itemsize)
+
+        if self._count:
+            records = np.memmap(
+                seg_path, dtype=self.dtype, mode="r", shape=(self._count,)
+            )
+            self._t_first = records[0][self.time_field]
+            self._last_time = records[-1][self.time_field]
+            del records
+
+        if self._count == self.segment_records:
+            # A crash left the segment full but not registered.
+            self._seal(self._last_time)
+
+    def append(self, record):
+        """Append a record.
+
+        Args:
+            record (tuple or numpy.void): A record to append.
+
+        Return:
+            None
+        """
+        buf = self._buffer
+        buf[self._pending] = record
+        t = buf[self._pending][self.time_field]
+
+        assert self._last_time is None or t >= self._last_time, \
+            f"{self.time_field}: expected to be non-decreasing."
+
+        self._last_time = t
+        self._pending += 1
+        if self._pending == len(buf):
+            self._flush_buffer()
+        return
+
+    def extend(self, records):
+        """Append multiple records.
+
+        Args:
+            records (numpy.ndarray): Structured array of records.
+
+        Return:
+            None
+        """
+        records = np.asarray(records, dtype=self.dtype)
+        if not len(records):
+            return
+
+        t = records[self.time_field]
+        assert np.all(t[1:] >= t[:-1]) and (
+            self._last_time is None or t[0] >= self._last_time
+        ), f"{self.time_field}: expected to be non-decreasing."
+
+        self._flush_buffer()
+        self._write(records)
+        self._last_time = t[-1]
+        return
+
+    def flush(self):
+        """Write the buffered records to the disk.
+
+        Return:
+            None
+        """
+        self._flush_buffer()
+        if self._file is not None:
+            self._file.flush()
+        return
+
+    def close(self):
+        """Flush the records and close the archive.
+
+        Return:
+            None
+        """
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return
+
+    def _flush_buffer(self):
+        if self._pending:
+            self._write(self._buffer[:self._pending])
+            self._pending = 0
+
+    def _write(self, records):
+        """Write records across segment boundaries.
+
+        Note:
+            This method is only for the internal use.
+
+        Args:
+            records (numpy.ndarray): Structured array of records.
+
+        Return:
+            None
+        """
+        while len(records):
+            if self._file is None:
+                self._file = open(
+                    _segment_path(self.path, self._segment, HOT_SUFFIX), "ab"
+                )
+
+            room = self.segment_records - self._count
+            chunk, records = records[:room], records[room:]
+            self._file.write(chunk.tobytes())
+            if self._count == 0:
+                self._t_first = chunk[0][self.time_field]
+            self._count += len(chunk)
+
+            if self._count == self.segment_records:
+                self._seal(chunk[-1][self.time_field])
+        return
+
+    def _seal(self, t_last):
+        """Close the current segment and register it to the index.
+
+        Note:
+            This method is only for the internal use.
+
+        Return:
+            None
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        entry = np.zeros(1, dtype=_index_dtype(self._time_dtype))
+        entry["segment"] = self._segment
+        entry["count"] = self._count
+        entry["t_first"] = self._t_first
+        entry["t_last"] = t_last
+        with open(os.path.join(self.path, INDEX_FILE), "ab") as f:
+            f.write(entry.tobytes())
+
+        self._segment += 1
+        self._count = 0
+        return
+
+
+class ArchiveReader(object):
+    """Read records of an archive.
+
+    Hot segments are returned as read-only memory-mapped views and
+    cold segments are decompressed chunk by chunk on demand.
+
+    Args:
+        path (str): Directory of the archive.
+
+    Attributes:
+        dtype (numpy.dtype): Record dtype.
+        time_field (str): Name of the time field of the record.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.dtype, self.time_field, _ = _read_meta(path)
+        self._time_dtype = self.dtype[self.time_field]
+        self.refresh()
+
+    def __len__(self):
+        return self._total
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._total)
+            return self.read(start, stop)[::step]
+        if key < 0:
+            key += self._total
+        return self.read(key, key + 1)[0]
+
+    def refresh(self):
+        """Reload the index to see records appended after opening.
+
+        Return:
+            None
+        """
+        index = _read_index(self.path, self._time_dtype)
+        hot, cold = _list_segments(self.path)
+        sealed = index["segment"].tolist()
+
+        segments = [
+            (int(e["segment"]), int(e["count"]), e["t_first"], e["t_last"])
+            for e in index
+        ]
+        itemsize = self.dtype.itemsize
+        for number in sorted(hot - set(sealed)):
+            seg_path = _segment_path(self.path, number, HOT_SUFFIX)
+            count = os.path.getsize(seg_path) // itemsize
+            if not count:
+                continue
+            records = np.memmap(
+                seg_path, dtype=self.dtype, mode="r", shape=(count,)
+            )
+            t = records[self.time_field]
+            segments.append((number, count, t[0], t[-1]))
+
+        self._segments = segments
+        self._starts = np.cumsum([0] + [s[1] for s in segments]).tolist()
+        self._t_last = [s[3] for s in segments]
+        self._total = self._starts[-1]
+        self._cold = cold
+        self._views = {}
+        self._chunk_tables = {}
+        return
+
+    def read(self, start=0, stop=None):
+        """Read records by their position.
+
+        Note:
+            If the records lie in a single hot segment, the return
+            value is a view of the memory-mapped file.
+
+        Args:
+            start (int): Position of the first record. Defaults to 0.
+            stop (int or None): Position after the last record.
+                Defaults to None (the end of the archive).
+
+        Return:
+            ret (numpy.ndarray): Structured array of records.
+        """
+        parts = list(self.iter_records(start, stop))
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return np.empty(0, dtype=self.dtype)
+        return np.concatenate(parts)
+
+    def iter_records(self, start=0, stop=None):
+        """Iterate over records segment by segment.
+
+        Args:
+            start (int): Position of the first record. Defaults to 0.
+            stop (int or None): Position after the last record.
+                Defaults to None (the end of the archive).
+
+        Yield:
+            records (numpy.ndarray): Structured array of records.
+        """
+        stop = self._total if stop is None else min(stop, self._total)
+        i = bisect.bisect_right(self._starts, start) - 1
+        while start < stop and i < len(self._segments):
+            offset = self._starts[i]
+            end = min(stop, self._starts[i + 1])
+            yield self._slice(i, start - offset, end - offset)
+            start = end
+            i += 1
+
+    def search(self, t, side="left"):
+        """Find the position of the record at the given time.
+
+        Args:
+            t: Time to search.
+            side (str): Same as "numpy.searchsorted". Defaults to "left".
+
+        Return:
+            ret (int): Position of the record.
+        """
+        if side == "left":
+            i = bisect.bisect_left(self._t_last, t)
+        else:
+            i = bisect.bisect_right(self._t_last, t)
+        if i == len(self._segments):
+            return self._total
+
+        number = self._segments[i][0]
+        if number in self._cold:
+            table = self._chunk_table(number)
+            j = max(np.searchsorted(table["t_first"], t, side=side) - 1, 0)
+            chunk_start = int(np.sum(table["count"][:j]))
+            times = self._chunk(number, j)[self.time_field]
+            pos = chunk_start + np.searchsorted(times, t, side=side)
+        else:
+            times = self._hot(i)[self.time_field]
+            pos = np.searchsorted(times, t, side=side)
+        return self._starts[i] + int(pos)
+
+    def between(self, t_start, t_stop):
+        """Read records within the given time range.
+
+        Args:
+            t_start: Start time (inclusive).
+            t_stop: Stop time (exclusive).
+
+        Return:
+            ret (numpy.ndarray): Structured array of records.
+        """
+        return self.read(self.search(t_start), self.search(t_stop))
+
+    def _slice(self, i, start, stop):
+        number = self._segments[i][0]
+        if number not in self._cold:
+            return self._hot(i)[start:stop]
+
+        table = self._chunk_table(number)
+        bounds = np.cumsum(table["count"], dtype=np.int64).tolist()
+        first = bisect.bisect_right(bounds, start)
+        last = bisect.bisect_left(bounds, stop) + 1
+        offset = bounds[first - 1] if first else 0
+        records = np.concatenate(
+            [self._chunk(number, j) for j in range(first, last)]
+        )
+        return records[start - offset:stop - offset]
+
+    def _hot(self, i):
+        if i not in self._views:
+            number, count = self._segments[i][:2]
+            self._views[i] = np.memmap(
+                _segment_path(self.path, number, HOT_SUFFIX),
+                dtype=self.dtype,
+                mode="r",
+                shape=(count,),
+            )
+        return self._views[i]
+
+    def _chunk_table(self, number):
+        if number not in self._chunk_tables:
+            seg_path = _segment_path(self.path, number, COLD_SUFFIX)
+            with open(seg_path, "rb") as f:
+                magic, version, n_chunks = COLD_HEADER.unpack(
+                    f.read(COLD_HEADER.size)
+                )
+                assert magic == COLD_MAGIC and version == FORMAT_VERSION, \
+                    f"{seg_path}: not a cold segment."
+                dtype = _chunk_dtype(self._time_dtype)
+                table = np.frombuffer(
+                    f.read(n_chunks * dtype.itemsize), dtype=dtype
+                )
+            self._chunk_tables[number] = table
+        return self._chunk_tables[number]
+
+    def _chunk(self, number, j):
+        entry = self._chunk_table(number)[j]
+        seg_path = _segment_path(self.path, number, COLD_SUFFIX)
+        with open(seg_path, "rb") as f:
+            f.seek(int(entry["offset"]))
+            raw = zlib.decompress(f.read(int(entry["length"])))
+        return np.frombuffer(raw, dtype=self.dtype)
+
+
+def compress_segments(path, keep=1, chunk_records=65536, level=6):
+    """Compress cold segments of an archive.
+
+    Sealed segments except the newest "keep" ones are compressed in
+    chunks, so that a reader decompresses only the chunks it needs.
+
+    Args:
+        path (str): Directory of the archive.
+        keep (int): Number of the newest sealed segments to keep hot.
+            Defaults to 1.
+        chunk_records (int): Number of records per chunk.
+            Defaults to 65536.
+        level (int): Compression level of zlib. Defaults to 6.
+
+    Return:
+        compressed (:obj:`list` of :obj:`int`): Compressed segment numbers.
+    """
+    dtype, time_field, _ = _read_meta(path)
+    time_dtype = dtype[time_field]
+    index = _read_index(path, time_dtype)
+    hot, _ = _list_segments(path)
+
+    numbers = index["segment"].tolist()
+    targets = [n for n in numbers[:max(len(numbers) - keep, 0)] if n in hot]
+
+    compressed = []
+    for number in targets:
+        hot_path = _segment_path(path, number, HOT_SUFFIX)
+        cold_path = _segment_path(path, number, COLD_SUFFIX)
+        records = np.fromfile(hot_path, dtype=dtype)
+
+        n_chunks = -(-len(records) // chunk_records)
+        table = np.zeros(n_chunks, dtype=_chunk_dtype(time_dtype))
+        offset = COLD_HEADER.size + table.nbytes
+        blobs = []
+        for j in range(n_chunks):
+            chunk = records[j * chunk_records:(j + 1) * chunk_records]
+            blob = zlib.compress(chunk.tobytes(), level)
+            table[j] = (offset, len(blob), len(chunk), chunk[0][time_field])
+            offset += len(blob)
+            blobs.append(blob)
+
+        tmp_path = cold_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(COLD_HEADER.pack(COLD_MAGIC, FORMAT_VERSION, n_chunks))
+            f.write(table.tobytes())
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp_path, cold_path)
+        os.remove(hot_path)
+        compressed.append(number)
+
+    return compressed
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""Command-line tool to control MAO devices.
+
+Usage::
+
+    $ maodevice daemon start
+    $ maodevice list
+    $ maodevice call octad show_status
+    $ maodevice call octad select_correlation_scaling 1 scale=5
+    $ maodevice daemon stop
+
+If the daemon is running, "call" is sent to the daemon which holds
+the connections. Otherwise, the device is connected only for the call.
+"""
+__all__ = [
+    "main",
+]
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import time
+
+from maodevice.config import create_device, load_config
+from maodevice.daemon import DEFAULT_SOCKET, DaemonClient, DeviceDaemon
+
+
+def parse_value(text):
+    """Parse an argument given on the command line.
+
+    Args:
+        text (str): An argument.
+
+    Return:
+        ret: Python literal if "text" is the one, otherwise "text" itself.
+    """
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def parse_arguments(tokens):
+    """Parse arguments of a method given on the command line.
+
+    Args:
+        tokens (:obj:`list` of :obj:`str`): Arguments like "1" or "scale=5".
+
+    Return:
+        args (list): Positional arguments.
+        kwargs (dict): Keyword arguments.
+    """
+    args, kwargs = [], {}
+    for token in tokens:
+        key, sep, val = token.partition("=")
+        if sep and key.isidentifier():
+            kwargs[key] = parse_value(val)
+        else:
+            args.append(parse_value(token))
+    return args, kwargs
+
+
+def format_result(result):
+    """Format the result of a method to print.
+
+    Args:
+        result: The result of a method.
+
+    Return:
+        ret (str): The formatted result.
+    """
+    if isinstance(result, (bytes, bytearray)):
+        return bytes(result).decode(errors="replace").rstrip()
+    if isinstance(result, (dict, list)):
+        return json.dumps(result, indent=2, default=str)
+    return str(result)
+
+
+def _call(opts):
+    args, kwargs = parse_arguments(opts.args)
+    client = DaemonClient(opts.socket)
+    if not opts.direct and client.is_alive():
+        with client:
+            return client.call(opts.device, opts.method, *args, **kwargs)
+
+    config = load_config(opts.config)
+    handler = create_device(config[opts.device])
+    try:
+        return getattr(handler, opts.method)(*args, **kwargs)
+    finally:
+        handler.close()
+
+
+def _list(opts):
+    client = DaemonClient(opts.socket)
+    if client.is_alive():
+        with client:
+            return client.call(None, "list")
+    return {
+        name: {"handler": spec["handler"], "connected": False}
+        for name, spec in load_config(opts.config).items()
+    }
+
+
+def _daemon(opts):
+    client = DaemonClient(opts.socket)
+    if opts.action == "status":
+        return "running" if client.is_alive() else "stopped"
+
+    if opts.action == "stop":
+        if client.is_alive():
+            with client:
+                client.call(None, "shutdown")
+        return _wait(lambda: not client.is_alive(), opts, "stop")
+
+    if opts.foreground:
+        server = DeviceDaemon(load_config(opts.config), opts.socket)
+        with server:
+            server.serve_forever()
+        return None
+
+    cmd = [sys.executable, "-m", "maodevice.cli", "--socket", opts.socket]
+    if opts.config is not None:
+        cmd += ["--config", opts.config]
+    cmd += ["daemon", "start", "--foreground"]
+    subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    return _wait(client.is_alive, opts, "start")
+
+
+def _wait(condition, opts, action):
+    deadline = time.monotonic() + opts.wait
+    while time.monotonic() < deadline:
+        if condition():
+            return None
+        time.sleep(0.05)
+    raise SystemExit(f"{opts.socket}: daemon did not {action}.")
+
+
+def build_parser():
+    """Build the parser of the command line.
+
+    Return:
+        parser (argparse.ArgumentParser): The parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="maodevice", description="Control MAO devices."
+    )
+    parser.add_argument(
+        "--config", default=None,
+        help="configuration file of devices",
+    )
+    parser.add_argument(
+        "--socket", default=os.environ.get("MAODEVICE_SOCKET", DEFAULT_SOCKET),
+        help="Unix domain socket of the daemon",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    call = subparsers.add_parser("call", help="call a method of a device")
+    call.add_argument("device")
+    call.add_argument("method")
+    call.add_argument("args", nargs="*")
+    call.add_argument(
+        "--direct", action="store_true",
+        help="connect to the device without the daemon",
+    )
+    call.set_defaults(func=_call)
+
+    list_ = subparsers.add_parser("list", help="list configured devices")
+    list_.set_defaults(func=_list)
+
+    daemon = subparsers.add_parser("daemon", help="control the daemon")
+    daemon.add_argument("action", choices=["start", "stop", "status"])
+    daemon.add_argument(
+        "--foreground", action="store_true",
+        help="run the daemon in the foreground",
+    )
+    daemon.add_argument(
+        "--wait", type=float, default=5.,
+        help="seconds to wait for the daemon to start",
+    )
+    daemon.set_defaults(func=_daemon)
+    return parser
+
+
+def main(argv=None):
+    """Entry point of the command-line tool.
+
+    Args:
+        argv (:obj:`list` of :obj:`str` or None): Command-line arguments.
+            Defaults to None (sys.argv[1:]).
+
+    Return:
+        None
+    """
+    opts = build_parser().parse_args(argv)
+    result = opts.func(opts)
+    if result is not None:
+        print(format_result(result))
+    return
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,462 @@
+# -*- coding: utf-8 -*-
+"""Declarative command tables of devices.
+
+A device handler lists its commands in a "CommandTable" assigned to
+the class attribute "COMMANDS". The metaclass of the handler
+(see "maodevice.core.BaseValidator") generates a method for each
+command which is not written by hand.
+
+For each command, the format string of the message and the checks of
+the arguments are compiled into a single Python function. The
+generated methods send commands by "send_command" and "query_command"
+of the communicator, which caches the encoded messages, so that the
+function runs only for arguments which were not seen recently.
+"""
+__all__ = [
+    "Argument",
+    "Command",
+    "CommandTable",
+    "REQUIRED",
+    "Reply",
+]
+
+import numbers
+
+
+class _Required(object):
+    def __repr__(self):
+        return "REQUIRED"
+
+
+REQUIRED = _Required()
+
+_TYPE_NAMES = {int: "int", float: "float", str: "str", bool: "bool"}
+_TYPE_CHECKS = {int: "_Integral", float: "_Real", str: "str"}
+_TYPE_PATTERNS = {
+    int: r"[-+]?\d+",
+    float: r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?",
+}
+
+
+def _join_choices(choices):
+    choices = [repr(c) if isinstance(c, str) else str(c) for c in choices]
+    if len(choices) == 1:
+        return choices[0]
+    return ", ".join(choices[:-1]) + " or " + choices[-1]
+
+
+class Argument(object):
+    """Argument of a command.
+
+    Args:
+        name (str): Name of the argument.
+        type (type or None): Type of the argument.
+            One of int, float, str, bool or None (not checked).
+            Defaults to None.
+        doc (str): Description of the argument. Defaults to "".
+        default: Default value. Defaults to "REQUIRED" (no default).
+        range (tuple or None): Minimum and maximum values (inclusive).
+            Defaults to None.
+        step (int or float or None): Step of the value. Defaults to None.
+        choices (tuple or None): Allowed values. Defaults to None.
+        mapping (dict or None): Correspondance dict of values and
+            tokens in the message. Defaults to None.
+        unit (str or None): Unit of the value. Defaults to None.
+    """
+    def __init__(
+            self,
+            name,
+            type=None,
+            doc="",
+            default=REQUIRED,
+            range=None,
+            step=None,
+            choices=None,
+            mapping=None,
+            unit=None,
+    ):
+        self.name = name
+        self.type = type
+        self.doc = doc
+        self.default = default
+        self.range = range
+        self.step = step
+        self.choices = tuple(choices) if choices is not None else None
+        self.mapping = mapping
+        self.unit = unit
+
+    def __repr__(self):
+        return f"Argument({self.name!r}, type={self.type})"
+
+    def checks(self, namespace):
+        """Generate source lines which check and convert the argument.
+
+        Args:
+            namespace (dict): Namespace of the generated function.
+                Constants used by the lines are added to it.
+
+        Return:
+            lines (:obj:`list` of :obj:`str`): Source lines.
+        """
+        name = self.name
+        lines = []
+        if self.choices is not None:
+            namespace[f"_choices_{name}"] = self.choices
+            msg = f"{name}: expected to be {_join_choices(self.choices)}."
+            lines.append(f"assert {name} in _choices_{name}, {msg!r}")
+        elif self.type in _TYPE_CHECKS:
+            type_name = _TYPE_NAMES[self.type]
+            msg = f"{name}: expected to be `{type_name}`."
+            check = _TYPE_CHECKS[self.type]
+            lines.append(f"assert isinstance({name}, {check}), {msg!r}")
+
+        if self.range is not None:
+            min_val, max_val = self.range
+            msg = f"{name}: expected to be in the range of" \
+                  f" {min_val} - {max_val}."
+            lines.append(
+                f"assert {min_val!r} <= {name} <= {max_val!r}, {msg!r}"
+            )
+
+        if self.step is not None:
+            msg = f"{name}: expected to be a multiple of {self.step}."
+            lines.append(
+                f"assert abs({name} / {self.step!r}"
+                f" - round({name} / {self.step!r})) < 1e-9, {msg!r}"
+            )
+
+        if self.mapping is not None:
+            namespace[f"_map_{name}"] = self.mapping
+            key = f"bool({name})" if self.type is bool else name
+            lines.append(f"{name} = _map_{name}[{key}]")
+
+        return lines
+
+    def pattern(self):
+        """Regular expression of the argument in the message.
+
+        Return:
+            ret (str): The regular expression.
+        """
+        import re
+
+        if self.mapping is not None:
+            tokens = sorted(self.mapping.values(), key=len, reverse=True)
+            body = "|".join(re.escape(str(t)) for t in tokens)
+        elif self.choices is not None and self.type is str:
+            body = "|".join(re.escape(c) for c in self.choices)
+        else:
+            body = _TYPE_PATTERNS.get(self.type, r".+?")
+        return f"(?P<{self.name}>{body})"
+
+    def convert(self, token):
+        """Convert a token in the message to the value of the argument.
+
+        Args:
+            token (str): A token in the message.
+
+        Return:
+            ret: The value of the argument.
+        """
+        if self.mapping is not None:
+            inverse = {str(v): k for k, v in self.mapping.items()}
+            return inverse[token]
+        if self.type in (int, float):
+            return self.type(token)
+        return token
+
+    def describe(self):
+        """Describe the argument in the style of docstrings.
+
+        Return:
+            ret (str): Description of the argument.
+        """
+        type_name = _TYPE_NAMES.get(self.type, "object")
+        lines = [f"{self.name} ({type_name}): {self.doc}"]
+        unit = f" ({self.unit})" if self.unit else ""
+        if self.choices is not None:
+            lines.append(
+                f"    Allowed values are {_join_choices(self.choices)}{unit}."
+            )
+        if self.range is not None:
+            min_val, max_val = self.range
+            lines.append(
+                f"    Set within the range of {min_val} - {max_val}{unit}."
+            )
+        if self.default is not REQUIRED:
+            lines.append(f"    Defaults to {self.default!r}.")
+        return "\n".join(lines)
+
+
+class Reply(object):
+    """Reply of a query command.
+
+    Args:
+        type (function): Function which converts the text of the reply.
+            Defaults to str.
+        doc (str): Description of the reply. Defaults to "".
+        unit (str or None): Unit of the reply. Defaults to None.
+        byte (int or None): Bytes to read.
+            Defaults to None (the default of the communicator).
+    """
+    def __init__(self, type=str, doc="", unit=None, byte=None):
+        self.type = type
+        self.doc = doc
+        self.unit = unit
+        self.byte = byte
+
+    def parse(self, raw):
+        """Parse the reply.
+
+        Note:
+            The echoed name before "=" and the trailing termination
+            characters are removed.
+
+        Args:
+            raw (bytes): The reply from the device.
+
+        Return:
+            ret: The converted reply.
+        """
+        text = bytes(raw).decode().strip().rstrip(";").strip()
+        _, _, text = text.rpartition("=")
+        return self.type(text)
+
+
+class Command(object):
+    """Command of a device.
+
+    Args:
+        name (str): Name of the method of the command.
+        fmt (str): Format string of the message.
+            Arguments are referred by their names like "set_ipmask={mask}".
+        args (:obj:`list` of :obj:`Argument`): Arguments of the command.
+            Defaults to ().
+        reply (Reply or None): Reply of the command.
+            If it is None, the command is sent without reading a reply.
+            Defaults to None.
+        doc (str): Description of the command, which becomes the
+            docstring of the method with "Args" and "Return".
+            Defaults to "".
+        idempotent (bool or None): True if the command can be sent
+            again without changing the device, e.g. after its reply is
+            lost. Defaults to None (True if it is a query).
+
+    Attributes:
+        encode (function): Function which checks the arguments and
+            returns the message.
+    """
+    def __init__(self, name, fmt, args=(), reply=None, doc="",
+                 idempotent=None):
+        self.name = name
+        self.fmt = fmt
+        self.args = list(args)
+        self.reply = reply
+        self.doc = doc
+        self.idempotent = self.is_query if idempotent is None \
+            else idempotent
+        self.encode = self._compile_encoder()
+        self._regex = None
+
+    def __repr__(self):
+        return f"Command({self.name!r}, {self.fmt!r})"
+
+    @property
+    def is_query(self):
+        """bool: True if the command reads a reply."""
+        return self.reply is not None
+
+    def _parameters(self, namespace):
+        params = []
+        for arg in self.args:
+            if arg.default is REQUIRED:
+                params.append(arg.name)
+            else:
+                namespace[f"_default_{arg.name}"] = arg.default
+                params.append(f"{arg.name}=_default_{arg.name}")
+        return ", ".join(params)
+
+    def _compile_encoder(self):
+        """Compile the checks of the arguments and the format string.
+
+        Note:
+            This method is only for the internal use.
+
+        Return:
+            encode (function): The compiled function.
+        """
+        namespace = {"_Integral": numbers.Integral, "_Real": numbers.Real}
+        lines = [f"def {self.name}({self._parameters(namespace)}):"]
+        for arg in self.args:
+            lines.extend(f"    {line}" for line in arg.checks(namespace))
+        lines.append(f"    return f{self.fmt!r}")
+        exec("\n".join(lines), namespace)
+        return namespace[self.name]
+
+    def _compile_pattern(self):
+        import re
+        import string
+
+        args = {arg.name: arg for arg in self.args}
+        pattern = ""
+        for literal, field, _, _ in string.Formatter().parse(self.fmt):
+            pattern += re.escape(literal)
+            if field is not None:
+                pattern += args[field].pattern()
+        return pattern
+
+    def method(self):
+        """Generate the method of a device handler.
+
+        Return:
+            method (function): The generated method.
+        """
+        namespace = {"_command": self}
+        params = self._parameters(namespace)
+        call = "".join(f", {arg.name}" for arg in self.args)
+        lines = [f"def {self.name}(self{', ' if params else ''}{params}):"]
+        if self.reply is None:
+            lines.append(f"    self.com.send_command(_command{call})")
+            lines.append("    return")
+        elif self.reply.byte is None:
+            lines.append(f"    return self.com.query_command(_command{call})")
+        else:
+            lines.append(
+                f"    return self.com.query_command(_command{call},"
+                f" byte={self.reply.byte})"
+            )
+        exec("\n".join(lines), namespace)
+
+        method = namespace[self.name]
+        method.__doc__ = self.docstring()
+        method.command = self
+        return method
+
+    def docstring(self):
+        """Build the docstring of the generated method.
+
+        Return:
+            ret (str): The docstring.
+        """
+        sections = [_cleandoc(self.doc)] if self.doc else []
+        if self.args:
+            args = "\n".join(arg.describe() for arg in self.args)
+            sections.append("Args:\n" + _indent(args))
+        if self.reply is None:
+            sections.append("Return:\n    None")
+        else:
+            unit = f" ({self.reply.unit})" if self.reply.unit else ""
+            sections.append(
+                f"Return:\n    ret (bytes): {self.reply.doc}{unit}"
+            )
+        return "\n\n".join(sections)
+
+    def match(self, msg):
+        """Match a message with this command.
+
+        Args:
+            msg (str): A message without the termination character.
+
+        Return:
+            kwargs (dict or None): Arguments of the command if the
+                message matches, otherwise None.
+        """
+        if self._regex is None:
+            # The pattern is compiled at the first match, since "re" is
+            # needed only by simulators and validators.
+            import re
+            self._regex = re.compile(self._compile_pattern())
+        m = self._regex.fullmatch(msg)
+        if m is None:
+            return None
+        args = {arg.name: arg for arg in self.args}
+        return {
+            name: args[name].convert(token)
+            for name, token in m.groupdict().items()
+        }
+
+
+def _cleandoc(text):
+    # Same as "inspect.cleandoc", which is not imported since the
+    # docstrings are built at the import of every handler.
+    lines = text.expandtabs().splitlines() or [""]
+    margin = min(
+        (len(line) - len(line.lstrip()) for line in lines[1:]
+         if line.strip()),
+        default=0,
+    )
+    lines = [lines[0].lstrip()] + [line[margin:] for line in lines[1:]]
+    while lines and not lines[-1].strip():
+        lines.pop()
+    while lines and not lines[0].strip():
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+def _indent(text):
+    return "\n".join("    " + line if line else line
+                     for line in text.splitlines())
+
+
+class CommandTable(object):
+    """Table of commands of a device.
+
+    Args:
+        commands (:obj:`list` of :obj:`Command`): Commands of the device.
+    """
+    def __init__(self, commands):
+        self._commands = {command.name: command for command in commands}
+
+    def __contains__(self, name):
+        return name in self._commands
+
+    def __getitem__(self, name):
+        return self._commands[name]
+
+    def __iter__(self):
+        return iter(self._commands.values())
+
+    def __len__(self):
+        return len(self._commands)
+
+    def encode(self, name, *args, **kwargs):
+        """Build the message of a command by its name.
+
+        Args:
+            name (str): Name of the command.
+            *args: Positional arguments of the command.
+            **kwargs: Keyword arguments of the command.
+
+        Return:
+            msg (str): The message without the termination character.
+        """
+        return self._commands[name].encode(*args, **kwargs)
+
+    def parse(self, msg):
+        """Find the command and its arguments from a message.
+
+        This method is intended to be used by simulators and validators.
+
+        Args:
+            msg (str): A message without the termination character.
+
+        Return:
+            command (Command or None): The matched command.
+            kwargs (dict or None): Arguments of the command.
+        """
+        for command in self._commands.values():
+            try:
+                kwargs = command.match(msg)
+            except (KeyError, ValueError):
+                continue
+            if kwargs is not None:
+                return command, kwargs
+        return None, None
+
+    def methods(self):
+        """Generate the methods of all the commands.
+
+        Return:
+            methods (dict): Correspondance dict of names and methods.
+        """
+        return {name: cmd.method() for name, cmd in self._commands.items()}
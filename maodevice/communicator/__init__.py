@@ -1,6 +1,27 @@
 # -*- coding: utf-8 -*-
-from .serialcom import SerialCom
-from .socketcom import SocketCom
+from maodevice.utils.lazy import lazy_loader
 
-del serialcom
-del socketcom
+__all__ = [
+    "AdaptiveTimeout",
+    "Gateway",
+    "GatewayCom",
+    "ReconnectingCom",
+    "RecordingCom",
+    "ReplayCom",
+    "SerialCom",
+    "SocketCom",
+]
+
+__getattr__, __dir__ = lazy_loader(
+    __name__,
+    attributes={
+        "AdaptiveTimeout": ".timeouts",
+        "Gateway": ".gateway",
+        "GatewayCom": ".gateway",
+        "ReconnectingCom": ".reconnect",
+        "RecordingCom": ".record",
+        "ReplayCom": ".record",
+        "SerialCom": ".serialcom",
+        "SocketCom": ".socketcom",
+    },
+)
@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+"""Share a serial-to-Ethernet gateway among several devices.
+
+Devices behind a serial device server (e.g. the RFLL-20-H modules on
+a multi-drop bus) are controlled over one TCP connection, or a small
+pool of them, by a "Gateway". Each device has its own "GatewayCom"
+channel with its termination character and address prefix. The
+messages of a channel are queued in order, and the channels which have
+messages are served in round robin, so that polling one device does
+not starve the others. A query is one exchange which holds the
+connection until its reply is framed, and the bytes left by an
+earlier exchange (e.g. a late reply) are discarded before each write.
+"""
+__all__ = [
+    "Gateway",
+    "GatewayCom",
+]
+
+import socket
+import threading
+from collections import deque
+
+from maodevice.core import BaseCommunicator
+
+
+class _Exchange(object):
+    """Exchange of a channel on a connection.
+
+    Note:
+        This class is only for the internal use.
+    """
+    __slots__ = ("com", "data", "read", "byte", "done", "result", "error")
+
+    def __init__(self, com, data, read, byte):
+        self.com = com
+        self.data = data
+        self.read = read
+        self.byte = byte
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _Link(object):
+    """TCP connection to the gateway with a receive buffer.
+
+    Note:
+        This class is only for the internal use.
+    """
+    def __init__(self, address, timeout):
+        self.address = address
+        self.timeout = timeout
+        self.sock = None
+        self.buffer = bytearray()
+
+    def connect(self):
+        if self.sock is None:
+            self.sock = socket.create_connection(self.address, self.timeout)
+            self.buffer.clear()
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def discard_input(self):
+        self.buffer.clear()
+        self.sock.setblocking(False)
+        try:
+            while self.sock.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        finally:
+            self.sock.settimeout(self.timeout)
+
+    def read_frame(self, delimiter, byte, timeout):
+        self.sock.settimeout(timeout)
+        try:
+            while True:
+                end = self.buffer.find(delimiter)
+                if end >= 0:
+                    end += len(delimiter)
+                    break
+                if len(self.buffer) >= byte:
+                    end = byte
+                    break
+                chunk = self.sock.recv(4096)
+                if not chunk:
+                    raise ConnectionResetError("closed by the gateway")
+                self.buffer += chunk
+        finally:
+            self.sock.settimeout(self.timeout)
+
+        frame = bytes(self.buffer[:end])
+        del self.buffer[:end]
+        return frame
+
+
+class Gateway(object):
+    """Serial-to-Ethernet gateway shared by several devices.
+
+    The connections are opened when the first channel is opened and
+    closed when the last one is closed. A broken connection is
+    reopened at the next exchange, and the error of the broken one is
+    raised to the channel which was using it::
+
+        gateway = Gateway("192.168.10.10", 4001)
+        md = Md20M(gateway.channel("md", prefix=b"@1 "))
+        lta = Lta20Q(gateway.channel("lta", prefix=b"@2 "))
+
+    Args:
+        host (str): IP Address of the gateway.
+        port (int): Port of the gateway.
+        connections (int): Number of TCP connections. A channel uses
+            one of them at a time. Defaults to 1.
+        timeout (float): A read timeout values. Defaults to 1.0.
+
+    Attributes:
+        channels (dict): Correspondance dict of names and channels.
+    """
+    def __init__(self, host, port, connections=1, timeout=1.):
+        assert connections > 0, "connections: expected to be positive."
+
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.channels = {}
+        self._links = [
+            _Link((host, port), timeout) for _ in range(connections)
+        ]
+        self._queues = {}
+        self._ready = deque()
+        self._busy = set()
+        self._cond = threading.Condition()
+        self._users = 0
+        self._workers = []
+
+    def __repr__(self):
+        return f"Gateway({self.host!r}, {self.port!r})"
+
+    @property
+    def running(self):
+        """bool: True if the connections are in use."""
+        return bool(self._workers)
+
+    def channel(self, name, terminator="\r\n", prefix=b"", timeout=None):
+        """Create a channel of a device.
+
+        Args:
+            name (str): Name of the channel.
+            terminator (str): Termination character of the device.
+                Defaults to "\\r\\n".
+            prefix (bytes): Bytes put before each message, e.g. the
+                address of the device. Defaults to b"".
+            timeout (float or None): A read timeout values.
+                Defaults to None (the one of the gateway).
+
+        Return:
+            com (GatewayCom): The channel.
+        """
+        return GatewayCom(self, name, terminator, prefix, timeout)
+
+    def attach(self, com):
+        """Start to serve a channel.
+
+        Note:
+            This method is called by "GatewayCom.open".
+
+        Args:
+            com (GatewayCom): The channel.
+
+        Return:
+            None
+        """
+        with self._cond:
+            assert self.channels.get(com.name, com) is com, \
+                f"name: '{com.name}' is already used."
+
+            if not self._users:
+                for link in self._links:
+                    link.connect()
+                self._workers = [
+                    threading.Thread(
+                        target=self._serve,
+                        args=(link,),
+                        name=f"gateway-{self.host}:{self.port}-{i}",
+                        daemon=True,
+                    )
+                    for i, link in enumerate(self._links)
+                ]
+                for worker in self._workers:
+                    worker.start()
+            self.channels[com.name] = com
+            self._queues.setdefault(com.name, deque())
+            self._users += 1
+        return
+
+    def detach(self, com):
+        """Stop serving a channel.
+
+        Note:
+            This method is called by "GatewayCom.close".
+            The connections are closed with the last channel.
+
+        Args:
+            com (GatewayCom): The channel.
+
+        Return:
+            None
+        """
+        with self._cond:
+            if self.channels.get(com.name) is not com:
+                return
+            del self.channels[com.name]
+            self._users -= 1
+            workers = self._workers if not self._users else []
+            if workers:
+                self._workers = []
+                self._cond.notify_all()
+
+        for worker in workers:
+            worker.join()
+        if workers:
+            for link in self._links:
+                link.close()
+        return
+
+    def exchange(self, com, data, read=True, byte=4096):
+        """Queue an exchange of a channel and wait for it.
+
+        Args:
+            com (GatewayCom): The channel.
+            data (bytes or None): Bytes to write. None reads only.
+            read (bool): Read a reply after writing. Defaults to True.
+            byte (int): Maximum bytes of the reply. Defaults to 4096.
+
+        Return:
+            ret (bytes or None): The reply, or None if not read.
+        """
+        exchange = _Exchange(com, data, read, byte)
+        with self._cond:
+            if not self._workers:
+                raise ConnectionError(f"{self!r} is not open.")
+            queue = self._queues[com.name]
+            queue.append(exchange)
+            if len(queue) == 1 and com.name not in self._busy:
+                self._ready.append(com.name)
+                self._cond.notify()
+
+        exchange.done.wait()
+        if exchange.error is not None:
+            raise exchange.error
+        return exchange.result
+
+    def _serve(self, link):
+        """Serve exchanges on a connection.
+
+        Note:
+            This method is only for the internal use.
+            A channel is served by one connection at a time,
+            so that its exchanges are in order.
+        """
+        while True:
+            with self._cond:
+                while self._workers and not self._ready:
+                    self._cond.wait()
+                if not self._workers:
+                    self._fail_pending()
+                    return
+                name = self._ready.popleft()
+                exchange = self._queues[name].popleft()
+                self._busy.add(name)
+
+            try:
+                exchange.result = self._run(link, exchange)
+            except socket.timeout as err:
+                # A late reply is discarded before the next write.
+                exchange.error = err
+            except Exception as err:
+                link.close()
+                exchange.error = err
+
+            with self._cond:
+                self._busy.discard(name)
+                if self._queues[name]:
+                    self._ready.append(name)
+                    self._cond.notify()
+            exchange.done.set()
+
+    def _run(self, link, exchange):
+        link.connect()
+        com = exchange.com
+        if exchange.data is not None:
+            link.discard_input()
+            link.sock.sendall(exchange.data)
+        if not exchange.read:
+            return None
+        timeout = self.timeout if com.timeout is None else com.timeout
+        if com._read_timeout is not None:
+            timeout = com._read_timeout
+        return link.read_frame(
+            com.terminator.encode(), exchange.byte, timeout
+        )
+
+    def _fail_pending(self):
+        for queue in self._queues.values():
+            while queue:
+                exchange = queue.popleft()
+                exchange.error = ConnectionError(f"{self!r} is closed.")
+                exchange.done.set()
+        self._ready.clear()
+
+
+class GatewayCom(BaseCommunicator):
+    """Communicate with a device behind a shared gateway.
+
+    This is a child class of the base class "maodevice.core.BaseCommunicator".
+    A reply is framed by the termination character of the channel, and
+    a query (with the messages buffered by "batch") is one exchange.
+
+    Args:
+        gateway (Gateway): The gateway.
+        name (str): Name of the channel.
+        terminator (str): Termination character. Defaults to "\\r\\n".
+        prefix (bytes): Bytes put before each message. Defaults to b"".
+        timeout (float or None): A read timeout values.
+            Defaults to None (the one of the gateway).
+
+    Attributes:
+        METHOD (str): Communication method.
+        connection (bool): Connection indicator.
+            If it is true, the channel is served by the gateway.
+        terminator (str): Termination character.
+    """
+    METHOD = "Gateway"
+
+    def __init__(
+            self,
+            gateway,
+            name,
+            terminator="\r\n",
+            prefix=b"",
+            timeout=None,
+    ):
+        self.gateway = gateway
+        self.name = name
+        self.terminator = terminator
+        self.prefix = bytes(prefix)
+        self.timeout = timeout
+        self._read_timeout = None
+
+    def open(self):
+        """Open the channel.
+
+        Note:
+            This method override the "open" in the base class.
+
+        Return:
+            None
+        """
+        if not self.connection:
+            self.gateway.attach(self)
+            self._timeout = None
+            self.connection = True
+        return
+
+    def close(self):
+        """Close the channel.
+
+        Note:
+            This method override the "close" in the base class.
+
+        Return:
+            None
+        """
+        self.gateway.detach(self)
+        self.connection = False
+        return
+
+    def write(self, data):
+        """Write raw bytes to the device.
+
+        Note:
+            This method override the "write" in the base class.
+
+        Args:
+            data (bytes): Bytes to write.
+
+        Return:
+            None
+        """
+        self.gateway.exchange(self, bytes(data), read=False)
+        return
+
+    def recv(self, byte=4096):
+        """Receive the next frame from the device.
+
+        Note:
+            This method override the "recv" in the base class.
+            Since another channel may write in between, use "query"
+            to read the reply of a message.
+
+        Args:
+            byte (int): Maximum bytes to read. Defaults to 4096.
+
+        Return:
+            ret (bytes): The response of the device.
+        """
+        return self.gateway.exchange(self, None, byte=byte)
+
+    def _send(self, data):
+        # Each message has the address, so that the messages coalesced
+        # by "batch" reach the same module.
+        super()._send(self.prefix + data)
+
+    def _exchange(self, data, byte):
+        data = self.prefix + data
+        if self._batch:
+            data = b"".join(self._batch) + data
+            self._batch.clear()
+        return self.gateway.exchange(self, data, byte=byte)
+
+    def settimeout(self, timeout):
+        """Set the read timeout.
+
+        Note:
+            This method override the "settimeout" in the base class.
+
+        Args:
+            timeout (float or None): The read timeout (sec).
+                If it is None, "timeout" given at the initialization
+                is restored.
+
+        Return:
+            None
+        """
+        self._read_timeout = timeout
+        return
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+import time
+from collections import deque
+from maodevice.core import BaseCommunicator
+from maodevice.exceptions import ConnectionLostError
+
+
+def is_query(msg):
+    """Check whether the message is a query.
+
+    Args:
+        msg (str): A message to the device.
+
+    Return:
+        ret (bool): True if the message ends with "?".
+    """
+    return msg.rstrip().endswith("?")
+
+
+class ReconnectingCom(BaseCommunicator):
+    """Communicate with the device and reconnect when the connection drops.
+
+    This is a child class of the base class "maodevice.core.BaseCommunicator",
+    and wraps another communicator.
+
+    A broken pipe, a reset, a timeout or an empty reply to a query is
+    regarded as the loss of the connection. The connection is reopened
+    with capped exponential backoff at the next operation, and an
+    idempotent query is replayed automatically. Any other message
+    raises "maodevice.exceptions.ConnectionLostError", which lists the
+    messages that may have been already applied by the device.
+
+    A message is replayed only if it is a command of "commands" which
+    is declared idempotent (a query by default, but not a READ & CLEAR
+    one such as "show_status" of "OCTAD-S"). A device handler sets its
+    command table to "commands" if it is not given.
+
+    Args:
+        com (maodevice.core.BaseCommunicator): Communicator to wrap.
+        retries (int): Maximum number of retries of a reconnection
+            and of a replay. Defaults to 5.
+        backoff (float): Initial delay of the reconnection (sec).
+            Defaults to 0.1.
+        max_backoff (float): Maximum delay of the reconnection (sec).
+            Defaults to 5.0.
+        idempotent (function or None): Function which returns True
+            if a message can be replayed, e.g. "is_query".
+            Defaults to None (the "idempotent" of the command in
+            "commands", and no replay without "commands").
+        commands (maodevice.commands.CommandTable or None): Command
+            table of the device. Defaults to None.
+        journal_size (int): Maximum number of messages kept as applied.
+            Defaults to 64.
+
+    Attributes:
+        METHOD (str): Communication method.
+        com (maodevice.core.BaseCommunicator): The wrapped communicator.
+        applied (collections.deque): Messages sent after the last
+            successful query. Messages coalesced by "batch" are
+            recorded as one entry.
+    """
+    METHOD = "Reconnecting"
+
+    def __init__(
+            self,
+            com,
+            retries=5,
+            backoff=0.1,
+            max_backoff=5.,
+            idempotent=None,
+            journal_size=64,
+            commands=None,
+    ):
+        self.com = com
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.idempotent = idempotent or self.is_idempotent
+        self.commands = commands
+        self.applied = deque(maxlen=journal_size)
+
+    @property
+    def connection(self):
+        return self.com.connection
+
+    @property
+    def terminator(self):
+        return self.com.terminator
+
+    def is_idempotent(self, msg):
+        """Check whether a message can be replayed by "commands".
+
+        Args:
+            msg (str): A message to the device.
+
+        Return:
+            ret (bool): True if the message is a command which is
+                declared idempotent.
+        """
+        if self.commands is None:
+            return False
+        command, _ = self.commands.parse(msg.strip())
+        return command is not None and command.idempotent
+
+    def set_terminator(self, term_char):
+        """Set the termination character of the wrapped communicator.
+
+        Args:
+            term_char (str): Termination character.
+
+        Return:
+            None
+        """
+        self.com.set_terminator(term_char)
+        return
+
+    def open(self):
+        """Open the connection to the device.
+
+        Note:
+            This method override the "open" in the base class.
+            It retries with capped exponential backoff.
+
+        Return:
+            None
+
+        Raises:
+            ConnectionLostError: If all retries failed.
+        """
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                self.com.open()
+                return
+            except OSError as err:
+                if attempt == self.retries:
+                    raise ConnectionLostError(None, self._flush()) from err
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_backoff)
+
+    def close(self):
+        """Close the connection to the device.
+
+        Note:
+            This method override the "close" in the base class.
+
+        Return:
+            None
+        """
+        if self.com.connection:
+            self.com.close()
+        return
+
+    def write(self, data):
+        """Write raw bytes to the device.
+
+        Note:
+            This method override the "write" in the base class.
+
+        Args:
+            data (bytes): Bytes to write.
+
+        Return:
+            None
+
+        Raises:
+            ConnectionLostError: If the connection is lost.
+        """
+        self._ensure_open()
+        try:
+            self.com.write(data)
+        except OSError as err:
+            self._drop()
+            msg = self._decode(data)
+            raise ConnectionLostError(msg, self._flush()) from err
+        self.applied.append(self._decode(data))
+        return
+
+    def recv(self, byte=4096):
+        """Receive the response of the device.
+
+        Note:
+            This method override the "recv" in the base class.
+
+        Args:
+            byte (int): Bytes to read. Defaults to 4096.
+
+        Return:
+            ret (bytes): The response of the device.
+
+        Raises:
+            ConnectionLostError: If the connection is lost.
+        """
+        self._ensure_open()
+        try:
+            ret = self.com.recv(byte)
+        except OSError as err:
+            self._drop()
+            raise ConnectionLostError(None, self._flush()) from err
+        return ret
+
+    def _query(self, data, byte):
+        """Write a query and receive the response.
+
+        Note:
+            This method override the "_query" in the base class.
+            If the query is idempotent, it is replayed after
+            the reconnection.
+
+        Args:
+            data (bytes): The encoded query.
+            byte (int): Bytes to read.
+
+        Return:
+            ret (bytes): The response of the device.
+
+        Raises:
+            ConnectionLostError: If the connection is lost and the
+                query is not idempotent or all retries failed.
+        """
+        replay = self.idempotent(self._decode(data))
+        if self._batch:
+            # The buffered messages are sent together with the query,
+            # so that it cannot be replayed.
+            data = b"".join(self._batch) + data
+            self._batch.clear()
+            replay = False
+
+        for attempt in range(self.retries + 1):
+            self._ensure_open()
+            try:
+                ret = self.com._query(data, byte)
+                if not ret:
+                    raise ConnectionResetError("no response from the device")
+            except OSError as err:
+                self._drop()
+                if not replay or attempt == self.retries:
+                    raise ConnectionLostError(
+                        self._decode(data), self._flush()
+                    ) from err
+                continue
+            # The response shows that the preceding messages were applied.
+            self.applied.clear()
+            return ret
+
+    def _ensure_open(self):
+        if not self.com.connection:
+            self.open()
+
+    def _drop(self):
+        """Close the broken connection.
+
+        Note:
+            This method is only for the internal use.
+
+        Return:
+            None
+        """
+        try:
+            self.com.close()
+        except (OSError, AttributeError):
+            pass
+        self.com.connection = False
+        return
+
+    def _decode(self, data):
+        msg = data.decode(errors="replace")
+        if self.terminator and msg.endswith(self.terminator):
+            msg = msg[:-len(self.terminator)]
+        return msg
+
+    def _flush(self):
+        applied = list(self.applied)
+        self.applied.clear()
+        return applied
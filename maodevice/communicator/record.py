@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+"""Record and replay sessions with devices.
+
+A session file starts with the header "MAOREC" followed by the version
+(uint16) and the UNIX time of the start (int64, ns). Each record is
+the kind (1 byte), the time from the start (int64, ns), the length of
+the data (uint32) and the data, all in little endian. The kinds are
+as follows.
+
+- "O": The connection is opened.
+- "C": The connection is closed.
+- "W": Bytes are written.
+- "R": Bytes are received.
+- "E": An error is raised (the data is its type and message).
+"""
+__all__ = [
+    "Record",
+    "RecordingCom",
+    "ReplayCom",
+    "read_records",
+]
+
+import math
+import struct
+import threading
+import time
+from collections import namedtuple
+
+from maodevice.core import BaseCommunicator
+from maodevice.exceptions import ReplayError
+
+
+MAGIC = b"MAOREC"
+VERSION = 1
+HEADER = struct.Struct("<6sHq")
+RECORD = struct.Struct("<cqI")
+
+Record = namedtuple("Record", ["kind", "time", "data"])
+Record.__doc__ = """Record of a session.
+
+Attributes:
+    kind (str): One of "O", "C", "W", "R" and "E".
+    time (int): Time from the start of the session (ns).
+    data (bytes): Written or received bytes, or the error.
+"""
+
+
+def read_records(path):
+    """Read the records of a session file.
+
+    Args:
+        path (str): Path of the session file.
+
+    Return:
+        start (int): UNIX time of the start of the session (ns).
+        records (:obj:`list` of :obj:`Record`): The records.
+    """
+    with open(path, "rb") as f:
+        buf = f.read()
+
+    magic, version, start = HEADER.unpack_from(buf)
+    assert magic == MAGIC and version == VERSION, \
+        f"{path}: not a session file of version {VERSION}."
+
+    records = []
+    offset = HEADER.size
+    while offset < len(buf):
+        kind, t, size = RECORD.unpack_from(buf, offset)
+        offset += RECORD.size
+        records.append(Record(kind.decode(), t, buf[offset:offset + size]))
+        offset += size
+    return start, records
+
+
+class RecordingCom(BaseCommunicator):
+    """Communicate with the device and record the session.
+
+    This is a child class of the base class "maodevice.core.BaseCommunicator",
+    and wraps another communicator such as "SocketCom" or "SerialCom".
+    Every write and receive is recorded with the time in nanoseconds.
+
+    The session file is kept open across "close" and "open", e.g. by
+    "ReconnectingCom", and closed by "finish" or at the end of the
+    "with" block::
+
+        with RecordingCom(SocketCom(host, port), "night.rec") as com:
+            octad = OctadS(com)
+            ...
+
+    Args:
+        com (maodevice.core.BaseCommunicator): Communicator to wrap.
+        path (str): Path of the session file, which is overwritten.
+
+    Attributes:
+        METHOD (str): Communication method.
+        com (maodevice.core.BaseCommunicator): The wrapped communicator.
+    """
+    METHOD = "Recording"
+
+    def __init__(self, com, path):
+        self.com = com
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, time.time_ns()))
+        self._origin = time.perf_counter_ns()
+        if com.connection:
+            self._record("O", b"")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.finish()
+
+    @property
+    def connection(self):
+        return self.com.connection
+
+    @property
+    def terminator(self):
+        return self.com.terminator
+
+    def set_terminator(self, term_char):
+        """Set the termination character of the wrapped communicator.
+
+        Args:
+            term_char (str): Termination character.
+
+        Return:
+            None
+        """
+        self.com.set_terminator(term_char)
+        return
+
+    def settimeout(self, timeout):
+        """Set the read timeout of the wrapped communicator.
+
+        Args:
+            timeout (float or None): The read timeout (sec).
+
+        Return:
+            None
+        """
+        self.com.settimeout(timeout)
+        return
+
+    def discard_input(self):
+        """Discard the unread bytes of the wrapped communicator.
+
+        Return:
+            None
+        """
+        self.com.discard_input()
+        return
+
+    def open(self):
+        """Open the connection to the device.
+
+        Note:
+            This method override the "open" in the base class.
+
+        Return:
+            None
+        """
+        self._call("O", self.com.open)
+        self._timeout = None
+        return
+
+    def close(self):
+        """Close the connection to the device.
+
+        Note:
+            This method override the "close" in the base class.
+            The session file is flushed but kept open.
+
+        Return:
+            None
+        """
+        if self.com.connection:
+            self._call("C", self.com.close)
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+        return
+
+    def finish(self):
+        """Close the connection to the device and the session file.
+
+        Return:
+            None
+        """
+        self.close()
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        return
+
+    def write(self, data):
+        """Write raw bytes to the device.
+
+        Note:
+            This method override the "write" in the base class.
+
+        Args:
+            data (bytes): Bytes to write.
+
+        Return:
+            None
+        """
+        self._call("W", self.com.write, data)
+        return
+
+    def recv(self, byte=4096):
+        """Receive the response of the device.
+
+        Note:
+            This method override the "recv" in the base class.
+
+        Args:
+            byte (int): Bytes to read. Defaults to 4096.
+
+        Return:
+            ret (bytes): The response of the device.
+        """
+        return self._call("R", self.com.recv, byte)
+
+    def _call(self, kind, func, *args):
+        """Call a method of the wrapped communicator and record it.
+
+        Note:
+            This method is only for the internal use.
+            A write is recorded at its start, and the others are
+            recorded at their end.
+
+        Return:
+            ret: The result of the method.
+        """
+        start = time.perf_counter_ns()
+        try:
+            ret = func(*args)
+        except Exception as err:
+            self._record("E", f"{type(err).__name__}: {err}".encode())
+            raise
+        if kind == "W":
+            self._record(kind, bytes(args[0]), start)
+        else:
+            self._record(kind, bytes(ret or b""))
+        return ret
+
+    def _record(self, kind, data, t=None):
+        t = time.perf_counter_ns() if t is None else t
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(
+                RECORD.pack(kind.encode(), t - self._origin, len(data))
+            )
+            self._file.write(data)
+
+
+class ReplayCom(BaseCommunicator):
+    """Replay a recorded session against device handlers.
+
+    This is a child class of the base class "maodevice.core.BaseCommunicator".
+    Written bytes are compared with the recording, and the recorded
+    responses are returned after the recorded latency of the device.
+
+    Args:
+        path (str): Path of the session file.
+        speed (float): Speed of the replay. 1.0 reproduces the recorded
+            latency, and a larger value accelerates it.
+            Use math.inf to replay without delay. Defaults to 1.0.
+        strict (bool): Raise an error if written bytes differ from the
+            recording. Defaults to True.
+
+    Attributes:
+        METHOD (str): Communication method.
+        records (:obj:`list` of :obj:`Record`): The recorded session.
+    """
+    METHOD = "Replay"
+
+    def __init__(self, path, speed=1., strict=True):
+        assert speed > 0, "speed: expected to be positive."
+
+        self.path = path
+        self.speed = speed
+        self.strict = strict
+        self.start, self.records = read_records(path)
+        self._index = 0
+        self._pending = b""
+        self._written = (time.perf_counter_ns(), 0)
+
+    @property
+    def done(self):
+        """bool: True if all the records have been replayed."""
+        return self._index >= len(self.records) and not self._pending
+
+    def open(self):
+        """Open the replayed connection.
+
+        Note:
+            This method override the "open" in the base class.
+
+        Return:
+            None
+        """
+        self._skip("O")
+        self.connection = True
+        return
+
+    def close(self):
+        """Close the replayed connection.
+
+        Note:
+            This method override the "close" in the base class.
+
+        Return:
+            None
+        """
+        self._skip("C")
+        self.connection = False
+        return
+
+    def write(self, data):
+        """Compare written bytes with the recording.
+
+        Note:
+            This method override the "write" in the base class.
+
+        Args:
+            data (bytes): Bytes to write.
+
+        Return:
+            None
+
+        Raises:
+            ReplayError: If the bytes differ from the recording.
+        """
+        record = self._next("W")
+        if self.strict and record.data != bytes(data):
+            raise ReplayError(self._index - 1, record.data, bytes(data))
+        self._written = (time.perf_counter_ns(), record.time)
+        return
+
+    def recv(self, byte=4096):
+        """Return the recorded response after the recorded latency.
+
+        Note:
+            This method override the "recv" in the base class.
+
+        Args:
+            byte (int): Bytes to read. Defaults to 4096.
+
+        Return:
+            ret (bytes): The recorded response.
+        """
+        if not self._pending:
+            record = self._next("R")
+            self._wait(record.time)
+            self._pending = record.data
+        ret, self._pending = self._pending[:byte], self._pending[byte:]
+        return ret
+
+    def _skip(self, kind):
+        if self._index < len(self.records) \
+                and self.records[self._index].kind == kind:
+            self._index += 1
+
+    def _next(self, kind):
+        """Take the next record of the given kind.
+
+        Note:
+            This method is only for the internal use.
+            A recorded error is raised as OSError.
+
+        Return:
+            record (Record): The record.
+        """
+        self._skip("O")
+        if self._index >= len(self.records):
+            raise ReplayError(self._index, None, kind)
+        record = self.records[self._index]
+        self._index += 1
+        if record.kind == "E":
+            self._wait(record.time)
+            raise OSError(record.data.decode(errors="replace"))
+        if record.kind != kind:
+            raise ReplayError(self._index - 1, record.kind, kind)
+        return record
+
+    def _wait(self, t):
+        if math.isinf(self.speed):
+            return
+        actual, recorded = self._written
+        deadline = actual + (t - recorded) / self.speed
+        delay = (deadline - time.perf_counter_ns()) / 1e9
+        if delay > 0:
+            time.sleep(delay)
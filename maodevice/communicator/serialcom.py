@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import serial
 from maodevice.core import BaseCommunicator
 
 
@@ -8,16 +7,20 @@ class SerialCom(BaseCommunicator):
 
     This is a child class of the base class "maodevice.core.BaseCommunicator".
 
+    Note:
+        "pyserial" is imported when the connection is opened
+        for the first time, not when this module is imported.
+
     Args:
         port (str): Device name.
         baudrate (int): Baud rate.
             Defaults to 9600.
         byteize (int): Number of data bits.
-            Defaults to serial.EIGHTBITS.
+            Defaults to 8 (serial.EIGHTBITS).
         parity (str): Enable parity checking.
-            Defaults to serial.PARITY_NONE.
+            Defaults to "N" (serial.PARITY_NONE).
         stopbits (float): Number of stop bits.
-            Defaults to serial.STOPBITS_ONE.
+            Defaults to 1 (serial.STOPBITS_ONE).
         timeout (float): A read timeout values.
             Defaults to 1.0.
         xonxoff (bool): Enable software flow control.
@@ -34,6 +37,9 @@ class SerialCom(BaseCommunicator):
             A port cannot be opened in exclusive access mode
             if it is already open in exclusive access mode.
             Defaults to None.
+        timeout_policy (maodevice.communicator.AdaptiveTimeout or None):
+            Policy of the read timeout of each query.
+            Defaults to None (the timeout is fixed).
 
     Attributes:
         METHOD (str): Communication method.
@@ -47,9 +53,9 @@ class SerialCom(BaseCommunicator):
             self,
             port,
             baudrate=9600,
-            bytesize=serial.EIGHTBITS,
-            parity=serial.PARITY_NONE,
-            stopbits=serial.STOPBITS_ONE,
+            bytesize=8,
+            parity="N",
+            stopbits=1,
             timeout=1.,
             xonxoff=False,
             rtscts=False,
@@ -57,6 +63,7 @@ class SerialCom(BaseCommunicator):
             write_timeout=None,
             inter_byte_timeout=None,
             exclusive=None,
+            timeout_policy=None,
     ):
         self.port = port
         self.baudrate = baudrate
@@ -70,6 +77,7 @@ class SerialCom(BaseCommunicator):
         self.write_timeout = write_timeout
         self.inter_byte_timeout = inter_byte_timeout
         self.exclusive = exclusive
+        self.timeout_policy = timeout_policy
 
     def open(self):
         """Open the connection to the device.
@@ -81,6 +89,8 @@ class SerialCom(BaseCommunicator):
             None
         """
         if not self.connection:
+            import serial
+
             self.ser = serial.Serial(
                 port=self.port,
                 baudrate=self.baudrate,
@@ -95,6 +105,7 @@ class SerialCom(BaseCommunicator):
                 inter_byte_timeout=self.inter_byte_timeout,
                 exclusive=self.exclusive,
             )
+            self._timeout = None
             self.connection = True
         return
 
@@ -112,19 +123,19 @@ class SerialCom(BaseCommunicator):
         self.connection = False
         return
 
-    def send(self, msg):
-        """Send a message to the device.
+    def write(self, data):
+        """Write raw bytes to the device.
 
         Note:
-            This method override the "send" in the base class.
+            This method override the "write" in the base class.
 
         Args:
-            msg (str): A message to send the device.
+            data (bytes): Bytes to write.
 
         Return:
             None
         """
-        self.ser.write((msg + self.terminator).encode())
+        self.ser.write(data)
         return
 
     def recv(self, byte=4096):
@@ -141,3 +152,52 @@ class SerialCom(BaseCommunicator):
         """
         ret = self.ser.read(size=byte)
         return ret
+
+    def recv_into(self, buffer, byte=0):
+        """Receive the response of the device into a buffer.
+
+        Note:
+            This method override the "recv_into" in the base class.
+            It waits until the buffer is filled or the read timeout.
+
+        Args:
+            buffer (bytearray or memoryview): A writable buffer.
+            byte (int): Bytes to read. Defaults to 0 (the size of
+                the buffer).
+
+        Return:
+            n (int): Number of received bytes.
+        """
+        view = memoryview(buffer).cast("B")
+        return self.ser.readinto(view[:byte] if byte else view)
+
+    def discard_input(self):
+        """Discard the received bytes which are not read yet.
+
+        Note:
+            This method override the "discard_input" in the base class.
+
+        Return:
+            None
+        """
+        self.ser.reset_input_buffer()
+        return
+
+    def settimeout(self, timeout):
+        """Set the read timeout.
+
+        Note:
+            This method override the "settimeout" in the base class.
+
+        Args:
+            timeout (float or None): The read timeout (sec).
+                If it is None, "timeout" given at the initialization
+                is restored.
+
+        Return:
+            None
+        """
+        if timeout is None:
+            timeout = self.timeout
+        self.ser.timeout = timeout
+        return
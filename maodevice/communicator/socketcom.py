@@ -29,6 +29,9 @@ class SocketCom(BaseCommunicator):
             not a duplicate. This may help close a detached socket using
             socket.close().
             Defaults to None.
+        timeout_policy (maodevice.communicator.AdaptiveTimeout or None):
+            Policy of the read timeout of each query.
+            Defaults to None (the timeout is fixed).
 
     Attributes:
         METHOD (str): Communication method.
@@ -47,6 +50,7 @@ class SocketCom(BaseCommunicator):
             type=socket.SOCK_STREAM,
             proto=0,
             fileno=None,
+            timeout_policy=None,
     ):
         self.host = host
         self.port = port
@@ -55,6 +59,7 @@ class SocketCom(BaseCommunicator):
         self.type = type
         self.proto = proto
         self.fileno = fileno
+        self.timeout_policy = timeout_policy
 
     def open(self):
         """Open the connection to the device.
@@ -73,7 +78,20 @@ class SocketCom(BaseCommunicator):
                 self.fileno,
             )
             self.sock.settimeout(self.timeout)
-            self.sock.connect((self.host, self.port))
+            if self.type == socket.SOCK_STREAM and self.family in (
+                    socket.AF_INET, socket.AF_INET6):
+                # Send a setter and the following query without waiting
+                # for the delayed ACK of the setter (Nagle's algorithm).
+                self.sock.setsockopt(
+                    socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+                )
+            try:
+                self.sock.connect((self.host, self.port))
+            except OSError:
+                self.sock.close()
+                del(self.sock)
+                raise
+            self._timeout = None
             self.connection = True
         return
 
@@ -91,19 +109,19 @@ class SocketCom(BaseCommunicator):
         self.connection = False
         return
 
-    def send(self, msg):
-        """Send a message to the device.
+    def write(self, data):
+        """Write raw bytes to the device.
 
         Note:
-            This method override the "send" in the base class.
+            This method override the "write" in the base class.
 
         Args:
-            msg (str): A message to send the device.
+            data (bytes): Bytes to write.
 
         Return:
             None
         """
-        self.sock.send((msg + self.terminator).encode())
+        self.sock.sendall(data)
         return
 
     def recv(self, byte=4096):
@@ -119,4 +137,58 @@ class SocketCom(BaseCommunicator):
             ret (bytes): The response of the device.
         """
         ret = self.sock.recv(byte)
-        return ret
\ No newline at end of file
+        return ret
+
+    def recv_into(self, buffer, byte=0):
+        """Receive the response of the device into a buffer.
+
+        Note:
+            This method override the "recv_into" in the base class.
+
+        Args:
+            buffer (bytearray or memoryview): A writable buffer.
+            byte (int): Bytes to read. Defaults to 0 (the size of
+                the buffer).
+
+        Return:
+            n (int): Number of received bytes.
+        """
+        return self.sock.recv_into(buffer, byte)
+
+    def discard_input(self):
+        """Discard the received bytes which are not read yet.
+
+        Note:
+            This method override the "discard_input" in the base class.
+
+        Return:
+            None
+        """
+        self.sock.setblocking(False)
+        try:
+            while self.sock.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        finally:
+            self.settimeout(self._timeout)
+        return
+
+    def settimeout(self, timeout):
+        """Set the read timeout.
+
+        Note:
+            This method override the "settimeout" in the base class.
+
+        Args:
+            timeout (float or None): The read timeout (sec).
+                If it is None, "timeout" given at the initialization
+                is restored.
+
+        Return:
+            None
+        """
+        if timeout is None:
+            timeout = self.timeout
+        self.sock.settimeout(timeout)
+        return
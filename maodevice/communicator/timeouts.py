@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+__all__ = [
+    "AdaptiveTimeout",
+    "mnemonic",
+]
+
+import re
+import threading
+
+from maodevice.utils.stats import Ewma, P2Quantile
+
+
+_MNEMONIC = re.compile(r"[^\s=;]+")
+
+
+def mnemonic(data):
+    """Extract the mnemonic of the query in a message.
+
+    The mnemonic is the first token of the last command in the message,
+    e.g. "show_temp?" of "show_temp?;" and "FREQ?" of "FREQ?\\n".
+
+    Args:
+        data (bytes or str): An encoded message.
+
+    Return:
+        ret (str): The mnemonic.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode(errors="replace")
+    commands = [c for c in re.split(r"[;\r\n]+", data) if c.strip()]
+    if not commands:
+        return ""
+    m = _MNEMONIC.search(commands[-1])
+    return m.group() if m else ""
+
+
+class _Latency(object):
+    """Latency statistics of a mnemonic.
+
+    Note:
+        This class is only for the internal use.
+    """
+    def __init__(self, quantile, alpha):
+        self.ewma = Ewma(alpha)
+        self.sketch = P2Quantile(quantile)
+        self.timeouts = 0
+
+
+class AdaptiveTimeout(object):
+    """Read timeouts learned from the latency of each command.
+
+    The latency of each mnemonic is tracked by an EWMA and a P-square
+    quantile sketch. The timeout of a read is the larger of
+    "margin" times the quantile and the EWMA mean plus four standard
+    deviations, within "floor" and "ceiling". Until "min_samples"
+    latencies are observed, the default is used. After a timeout, the
+    timeout of the mnemonic is doubled until a response arrives.
+
+    Args:
+        default (float): Timeout of unknown mnemonics (sec).
+            Defaults to 1.0.
+        overrides (dict or None): Correspondance dict of mnemonics and
+            fixed timeouts (sec) for known long operations.
+            Defaults to None.
+        quantile (float): Quantile of the latency. Defaults to 0.99.
+        margin (float): Factor of the quantile. Defaults to 2.0.
+        floor (float): Minimum timeout (sec). Defaults to 0.05.
+        ceiling (float): Maximum timeout (sec). Defaults to 30.0.
+        min_samples (int): Number of latencies before adapting.
+            Defaults to 20.
+        alpha (float): Weight of a new latency of the EWMA.
+            Defaults to 0.1.
+    """
+    def __init__(
+            self,
+            default=1.,
+            overrides=None,
+            quantile=0.99,
+            margin=2.,
+            floor=0.05,
+            ceiling=30.,
+            min_samples=20,
+            alpha=0.1,
+    ):
+        self.default = default
+        self.overrides = dict(overrides or {})
+        self.quantile = quantile
+        self.margin = margin
+        self.floor = floor
+        self.ceiling = ceiling
+        self.min_samples = min_samples
+        self.alpha = alpha
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _latency(self, key):
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _Latency(self.quantile, self.alpha)
+        return stats
+
+    def key(self, data):
+        """Key of the statistics of a message.
+
+        Args:
+            data (bytes): The encoded message.
+
+        Return:
+            ret (str): The mnemonic of the message.
+        """
+        return mnemonic(data)
+
+    def timeout(self, key):
+        """Timeout of a read after a command.
+
+        Args:
+            key (str): Mnemonic of the command.
+
+        Return:
+            timeout (float): The timeout (sec).
+        """
+        if key in self.overrides:
+            return self.overrides[key]
+
+        stats = self._stats.get(key)
+        if stats is None or stats.ewma.count < self.min_samples:
+            timeout = self.default
+        else:
+            timeout = max(
+                self.margin * stats.sketch.value,
+                stats.ewma.mean + 4 * stats.ewma.std,
+            )
+            timeout = min(max(timeout, self.floor), self.ceiling)
+
+        if stats is not None and stats.timeouts:
+            backoff = 2 ** min(stats.timeouts, 16)
+            timeout = min(timeout * backoff, self.ceiling)
+        return timeout
+
+    def observe(self, key, latency):
+        """Add an observed latency.
+
+        Args:
+            key (str): Mnemonic of the command.
+            latency (float): The latency (sec).
+
+        Return:
+            None
+        """
+        with self._lock:
+            stats = self._latency(key)
+            stats.ewma.update(latency)
+            stats.sketch.update(latency)
+            stats.timeouts = 0
+        return
+
+    def timed_out(self, key):
+        """Notify a timeout of a read.
+
+        Args:
+            key (str): Mnemonic of the command.
+
+        Return:
+            None
+        """
+        with self._lock:
+            self._latency(key).timeouts += 1
+        return
+
+    def stats(self):
+        """Show the latency statistics.
+
+        Return:
+            ret (dict): Correspondance dict of mnemonics and dicts of
+                "count", "mean", "std", "quantile" and "timeout".
+        """
+        with self._lock:
+            items = list(self._stats.items())
+        return {
+            key: {
+                "count": stats.ewma.count,
+                "mean": stats.ewma.mean,
+                "std": stats.ewma.std,
+                "quantile": stats.sketch.value,
+                "timeout": self.timeout(key),
+            }
+            for key, stats in items
+        }
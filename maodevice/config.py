@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Configuration of devices.
+
+The configuration file is a JSON file which maps device names to
+their handlers and communicators like follows::
+
+    {
+        "octad": {
+            "handler": "OctadS",
+            "communicator": {
+                "type": "SocketCom",
+                "host": "192.168.10.2",
+                "port": 5000
+            }
+        },
+        "awg": {
+            "handler": "Model3390AWG",
+            "communicator": {"type": "SerialCom", "port": "/dev/ttyUSB0"}
+        }
+    }
+
+A handler or communicator is either a name exported by "maodevice"
+or an import path like "package.module:ClassName". If a device has
+the key "timeouts", the read timeouts of its communicator adapt by
+"maodevice.communicator.AdaptiveTimeout" with the given arguments.
+If a device has the key "reconnect", its communicator is wrapped by
+"maodevice.communicator.ReconnectingCom" with the given arguments.
+If a device has the key "validation", its methods are validated by
+"maodevice.core.ValidationPolicy" with the given arguments.
+"""
+__all__ = [
+    "DEFAULT_CONFIG",
+    "create_device",
+    "load_config",
+    "resolve",
+]
+
+import json
+import os
+from importlib import import_module
+
+
+DEFAULT_CONFIG = os.path.join(
+    os.path.expanduser("~"), ".config", "maodevice", "devices.json"
+)
+
+
+def load_config(path=None):
+    """Load the configuration of devices.
+
+    Args:
+        path (str or None): Path of the configuration file.
+            Defaults to None ($MAODEVICE_CONFIG or "DEFAULT_CONFIG").
+
+    Return:
+        config (dict): Correspondance dict of device names and specs.
+    """
+    if path is None:
+        path = os.environ.get("MAODEVICE_CONFIG", DEFAULT_CONFIG)
+
+    with open(path) as f:
+        config = json.load(f)
+
+    for name, spec in config.items():
+        assert "handler" in spec and "communicator" in spec, \
+            f"{name}: expected to have 'handler' and 'communicator'."
+
+    return config
+
+
+def resolve(name):
+    """Resolve a class from its name.
+
+    Args:
+        name (str): A name exported by "maodevice" or an import path
+            like "package.module:ClassName".
+
+    Return:
+        cls (type): The resolved class.
+    """
+    if ":" in name:
+        module_name, _, attr = name.partition(":")
+        return getattr(import_module(module_name), attr)
+
+    import maodevice
+
+    return getattr(maodevice, name)
+
+
+def create_device(spec):
+    """Create a device handler from its spec.
+
+    Note:
+        The connection to the device is opened by the handler.
+
+    Args:
+        spec (dict): Spec of the device in the configuration.
+
+    Return:
+        handler (maodevice.core.BaseDeviceHandler): The device handler.
+    """
+    com_spec = dict(spec["communicator"])
+    com_class = resolve(com_spec.pop("type"))
+    com = com_class(**com_spec)
+    if "timeouts" in spec:
+        from maodevice.communicator import AdaptiveTimeout
+
+        com.set_timeout_policy(AdaptiveTimeout(**spec["timeouts"]))
+    if "reconnect" in spec:
+        from maodevice.communicator import ReconnectingCom
+
+        com = ReconnectingCom(com, **spec["reconnect"])
+
+    handler_class = resolve(spec["handler"])
+    handler = handler_class(com)
+    if "validation" in spec:
+        from maodevice.core import ValidationPolicy
+
+        handler.set_validation_policy(ValidationPolicy(**spec["validation"]))
+    return handler
@@ -1,8 +1,23 @@
 # -*- coding: utf-8 -*-
+import time
 from abc import ABCMeta, abstractmethod
-from functools import wraps
+from collections import namedtuple
+from functools import lru_cache, wraps
 from types import FunctionType
 
+from maodevice.utils.profiling import profiled
+
+
+def _encode_command(command, terminator, *args):
+    return (command.encode(*args) + terminator).encode()
+
+
+def _is_timeout(err):
+    # "socket" is imported only when an error is raised, so that
+    # importing a handler does not import it.
+    import socket
+    return isinstance(err, socket.timeout)
+
 
 class BaseCommunicator(object, metaclass=ABCMeta):
     """Communicate with a device.
@@ -21,12 +36,26 @@ class BaseCommunicator(object, metaclass=ABCMeta):
         connection (bool): Connection indicator.
             If it is true, the connection has been established.
         terminator (str): Termination character.
+        encode_cache_size (int): Maximum size of the cache of
+            "encode_command".
+        timeout_policy (maodevice.communicator.AdaptiveTimeout or None):
+            Policy of the read timeout of each query.
+            If it is None, the timeout is fixed.
     """
     METHOD = ""
 
     connection = False
     terminator = "\n"
 
+    encode_cache_size = 1024
+
+    timeout_policy = None
+
+    _batch = None
+    _timeout = None
+    _recv_buffer = None
+    _stale = False
+
     def __init__(self, *args):
         if not len(args) != 0:
             self.open()
@@ -54,14 +83,14 @@ class BaseCommunicator(object, metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def send(self, msg):
-        """Send a message to the device.
+    def write(self, data):
+        """Write raw bytes to the device.
 
         Note:
             This method must be overridden in the child class.
 
         Args:
-            msg (str): A message to send the device.
+            data (bytes): Bytes to write.
         """
         pass
 
@@ -77,33 +106,447 @@ class BaseCommunicator(object, metaclass=ABCMeta):
         """
         pass
 
+    def recv_into(self, buffer, byte=0):
+        """Receive the response of the device into a buffer.
+
+        Note:
+            This method should be overridden in the child class
+            which can receive without allocating bytes.
+
+        Args:
+            buffer (bytearray or memoryview): A writable buffer.
+            byte (int): Bytes to read. Defaults to 0 (the size of
+                the buffer).
+
+        Return:
+            n (int): Number of received bytes.
+        """
+        view = memoryview(buffer).cast("B")
+        data = self.recv(byte or len(view))
+        view[:len(data)] = data
+        return len(data)
+
+    def recv_view(self, byte=4096):
+        """Receive the response of the device without allocating bytes.
+
+        Note:
+            The response is received into the buffer of this
+            communicator, so the returned view is overwritten by the
+            next "recv_view" or "read_block". Copy it by bytes() to
+            keep it.
+
+        Args:
+            byte (int): Bytes to read. Defaults to 4096.
+
+        Return:
+            ret (memoryview): The response of the device.
+        """
+        view = self._buffer(byte)
+        return view[:self.recv_into(view)]
+
+    def read_block(self, out=None):
+        """Receive an IEEE-488.2 definite length arbitrary block.
+
+        The header "#<digits><length>" is read first, and then the
+        bytes of the block are received directly into "out" or the
+        buffer of this communicator. The trailing termination
+        character is consumed.
+
+        Args:
+            out (writable buffer or None): Buffer of the bytes, such as
+                a numpy array. Defaults to None (the buffer of this
+                communicator, which is overwritten by the next read).
+
+        Return:
+            ret (memoryview): The bytes of the block.
+
+        Raises:
+            ValueError: If the response is not a definite length block.
+        """
+        head = self._read_exact(self._buffer(11)[:2])
+        if head[0] != ord("#") or not 0x31 <= head[1] <= 0x39:
+            raise ValueError(f"not a definite length block: {bytes(head)}")
+        n_digits = head[1] - 0x30
+        length = int(bytes(self._read_exact(self._buffer(11)[:n_digits])))
+
+        if out is None:
+            view = self._buffer(length)[:length]
+        else:
+            view = memoryview(out).cast("B")
+            assert len(view) >= length, \
+                f"out: expected to have {length} bytes or more."
+            view = view[:length]
+        self._read_exact(view)
+
+        if self.terminator:
+            tail = bytearray(len(self.terminator.encode()))
+            self._read_exact(memoryview(tail))
+        return view
+
+    def query_block(self, msg, out=None):
+        """Query a message whose response is an IEEE-488.2 block.
+
+        Args:
+            msg (str): A message to query the device.
+            out (writable buffer or None): Buffer of the bytes.
+                Defaults to None (see "read_block").
+
+        Return:
+            ret (memoryview): The bytes of the block.
+        """
+        self._send(self.encode(msg))
+        self.flush()
+        return self.read_block(out)
+
+    def _buffer(self, size):
+        """Reusable receive buffer of at least the given size.
+
+        Note:
+            This method is only for the internal use.
+            A larger buffer replaces the old one instead of resizing
+            it, since views of the old one may still be referred.
+
+        Return:
+            view (memoryview): View of the whole buffer.
+        """
+        buf = self._recv_buffer
+        if buf is None or len(buf) < size:
+            buf = self._recv_buffer = bytearray(max(size, 4096))
+        return memoryview(buf)
+
+    def _read_exact(self, view):
+        """Receive bytes until a view is filled.
+
+        Note:
+            This method is only for the internal use.
+
+        Return:
+            view (memoryview): The filled view.
+
+        Raises:
+            socket.timeout: If no more bytes are received.
+        """
+        got = 0
+        while got < len(view):
+            n = self.recv_into(view[got:])
+            if not n:
+                import socket
+                raise socket.timeout(
+                    f"received {got} of {len(view)} bytes"
+                )
+            got += n
+        return view
+
+    @profiled("encode")
+    def encode(self, msg):
+        """Encode a message to the bytes to write.
+
+        Args:
+            msg (str): A message to send the device.
+
+        Return:
+            ret (bytes): The message with the termination character.
+        """
+        return (msg + self.terminator).encode()
+
+    @profiled("encode")
+    def encode_command(self, command, args):
+        """Encode a command of a command table to the bytes to write.
+
+        Note:
+            The bytes are cached per (command, arguments, terminator)
+            in a LRU cache of the size "encode_cache_size", so that
+            the arguments are checked and formatted only at a miss.
+            Unhashable arguments are not cached.
+
+        Args:
+            command (maodevice.commands.Command): A command to encode.
+            args (tuple): Positional arguments of the command.
+
+        Return:
+            ret (bytes): The message with the termination character.
+        """
+        cached = self._encode_cache()
+        try:
+            return cached(command, self.terminator, *args)
+        except TypeError:
+            return _encode_command(command, self.terminator, *args)
+
+    def cache_info(self):
+        """Show statistics of the cache of "encode_command".
+
+        Return:
+            ret (functools._CacheInfo): Hits, misses, maximum and
+                current sizes of the cache.
+        """
+        return self._encode_cache().cache_info()
+
+    def _encode_cache(self):
+        try:
+            return self._encode_cached
+        except AttributeError:
+            self._encode_cached = lru_cache(
+                maxsize=self.encode_cache_size, typed=True,
+            )(_encode_command)
+            return self._encode_cached
+
+    def send(self, msg):
+        """Send a message to the device.
+
+        Note:
+            Inside the "batch" block, the message is buffered
+            and sent when the block exits.
+
+        Args:
+            msg (str): A message to send the device.
+
+        Return:
+            None
+        """
+        self._send(self.encode(msg))
+        return
+
+    def send_command(self, command, *args):
+        """Send a command of a command table to the device.
+
+        Args:
+            command (maodevice.commands.Command): A command to send.
+            *args: Positional arguments of the command.
+
+        Return:
+            None
+        """
+        self._send(self.encode_command(command, args))
+        return
+
+    def send_raw(self, data):
+        """Send raw bytes followed by the termination character.
+
+        This method is intended to send binary data such as
+        IEEE-488.2 blocks, which cannot be encoded from a string.
+
+        Args:
+            data (bytes-like): Bytes to send the device.
+
+        Return:
+            None
+        """
+        self._send(bytes(data) + self.terminator.encode())
+        return
+
     def query(self, msg, byte=4096):
         """Query a message to the device.
 
+        Note:
+            Inside the "batch" block, the buffered messages are sent
+            together with the query.
+
         Args:
             msg (str): A message to query the device.
+            byte (int): Bytes to read. Defaults to 4096.
 
         Return:
             ret (bytes): The response of the device.
         """
-        self.send(msg)
-        ret = self.recv(byte)
+        return self._query(self.encode(msg), byte)
+
+    def query_command(self, command, *args, byte=4096):
+        """Query a command of a command table to the device.
+
+        Args:
+            command (maodevice.commands.Command): A command to query.
+            *args: Positional arguments of the command.
+            byte (int): Bytes to read. Defaults to 4096.
+
+        Return:
+            ret (bytes): The response of the device.
+        """
+        return self._query(self.encode_command(command, args), byte)
+
+    @profiled("transport:send")
+    def _send(self, data):
+        if self._batch is not None:
+            self._batch.append(data)
+            return
+        self.write(data)
+
+    def _query(self, data, byte):
+        if self._stale:
+            # The reply of a timed-out query may arrive late, and it
+            # must not be read as the reply of this query.
+            self.discard_input()
+            self._stale = False
+
+        policy = self.timeout_policy
+        if policy is None:
+            try:
+                ret = self._exchange(data, byte)
+            except OSError as err:
+                self._stale = _is_timeout(err)
+                raise
+            self._stale = not ret
+            return ret
+
+        key = policy.key(data)
+        timeout = policy.timeout(key)
+        if timeout != self._timeout:
+            self.settimeout(timeout)
+            self._timeout = timeout
+
+        start = time.perf_counter()
+        try:
+            ret = self._exchange(data, byte)
+        except OSError as err:
+            if _is_timeout(err):
+                policy.timed_out(key)
+                self._stale = True
+            raise
+        if ret:
+            policy.observe(key, time.perf_counter() - start)
+        else:
+            # A serial port returns no bytes at the timeout.
+            policy.timed_out(key)
+            self._stale = True
         return ret
 
-    @classmethod
-    def set_terminator(cls, term_char):
+    @profiled("transport:exchange")
+    def _exchange(self, data, byte):
+        """Send a query with the buffered messages and read the reply.
+
+        Note:
+            This method is only for the internal use.
+            A child class which shares the connection with others
+            overrides it to make the exchange atomic.
+
+        Return:
+            ret (bytes): The response of the device.
+        """
+        self._send(data)
+        self.flush()
+        return self.recv(byte)
+
+    def discard_input(self):
+        """Discard the received bytes which are not read yet.
+
+        Note:
+            This method is called before the query which follows a
+            timed-out one. It should be overridden in the child class
+            which buffers the input, e.g. a socket or a serial port.
+
+        Return:
+            None
+        """
+        pass
+
+    def settimeout(self, timeout):
+        """Set the read timeout.
+
+        Note:
+            This method should be overridden in the child class
+            which supports "timeout_policy".
+
+        Args:
+            timeout (float or None): The read timeout (sec).
+                If it is None, the default of the communicator is restored.
+
+        Return:
+            None
+        """
+        pass
+
+    def set_timeout_policy(self, policy):
+        """Set the policy of the read timeout of each query.
+
+        Args:
+            policy (maodevice.communicator.AdaptiveTimeout or None):
+                The policy. If it is None, the timeout is fixed.
+
+        Return:
+            None
+        """
+        self.timeout_policy = policy
+        if self._timeout is not None and self.connection:
+            self.settimeout(None)
+        self._timeout = None
+        return
+
+    def batch(self):
+        """Coalesce messages sent inside the block into one write.
+
+        Since each message has the termination character, the
+        coalesced messages are sent as a single message to a device
+        which accepts several commands per message.
+        This method is intended to be used like follows::
+
+            >>> with com.batch():
+            ...     com.send("set_iplen=5")
+            ...     com.send("set_window=hanning")
+
+        Note:
+            A nested block joins the outermost one.
+
+        Return:
+            block (context manager): The block, which yields this
+                communicator.
+        """
+        return _Batch(self)
+
+    @profiled("transport:send")
+    def flush(self):
+        """Send the messages buffered in the "batch" block.
+
+        Return:
+            None
+        """
+        if self._batch:
+            data = b"".join(self._batch)
+            self._batch.clear()
+            self.write(data)
+        return
+
+    def set_terminator(self, term_char):
         """Set the termination character.
 
+        Note:
+            The character is set to this instance, so that
+            communicators of the same class may have different ones.
+
         Args:
             term_char (str): Termination character.
 
         Return:
             None
         """
-        cls.terminator = term_char
+        self.terminator = term_char
         return
 
 
+class _Batch(object):
+    """Block of "BaseCommunicator.batch".
+
+    Note:
+        This class is only for the internal use.
+        It is not written with "contextlib", which costs milliseconds
+        at the import of every handler.
+    """
+    def __init__(self, com):
+        self.com = com
+        self.outermost = False
+
+    def __enter__(self):
+        if self.com._batch is None:
+            self.com._batch = []
+            self.outermost = True
+        return self.com
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.outermost:
+            try:
+                self.com.flush()
+            finally:
+                self.com._batch = None
+
+
 class BaseDeviceHandler(object):
     """Control a device.
 
@@ -121,15 +564,45 @@ class BaseDeviceHandler(object):
         MANUFACTURER (str): Manufacturer of the device.
         PRODUCT_NAME (str): Name of the device.
         CLASSIFICATION (str): Classification of the device.
+        COMMANDS (maodevice.commands.CommandTable or None):
+            Command table of the device.
+        IDENTITY (str or None): Name of the method which identifies
+            the device (e.g. "*IDN?"), used by "probe".
+        PROBES (tuple of str): Names of the methods which probe
+            the capabilities of the device, used by "probe".
+        validation_policy (ValidationPolicy or None):
+            Policy of the validation of the methods.
+        capabilities (dict or None): Results of the probes.
     """
     MANUFACTURER = ""
     PRODUCT_NAME = ""
     CLASSIFICATION = ""
+    COMMANDS = None
+    IDENTITY = None
+    PROBES = ()
+    capabilities = None
 
     def __init__(self, com):
         self.com = com
+        if getattr(com, "commands", False) is None:
+            # e.g. "ReconnectingCom", which replays idempotent commands.
+            com.commands = self.COMMANDS
+        self.validation_policy = ValidationPolicy()
         self.open()
 
+    def set_validation_policy(self, policy):
+        """Set the policy of the validation of this instance.
+
+        Args:
+            policy (ValidationPolicy or None): The policy.
+                None validates every method.
+
+        Return:
+            None
+        """
+        self.validation_policy = policy
+        return
+
     def open(self):
         """Open the connection to the device.
         Note:
@@ -150,6 +623,410 @@ class BaseDeviceHandler(object):
         self.com.close()
         return
 
+    def probe(self, cache=None, name=None, refresh=False):
+        """Identify the device and read its capabilities.
+
+        Note:
+            The probes are executed only once per identity of the
+            device (see "maodevice.probe.probe").
+
+        Args:
+            cache (maodevice.probe.ProbeCache or None): The cache.
+                Defaults to None (the default cache file).
+            name (str or None): Name of the device. Defaults to None.
+            refresh (bool): Execute the probes even if they are cached.
+                Defaults to False.
+
+        Return:
+            result (maodevice.probe.ProbeResult): The result.
+        """
+        from .probe import probe
+        return probe(self, cache, name, refresh)
+
+    def parse_identity(self, raw):
+        """Parse the reply of the identity method to the identity.
+
+        Note:
+            The identity is the key of the cache of "probe", so that
+            it must not contain values which change at every query.
+
+        Args:
+            raw (bytes or str): The reply of the identity method.
+
+        Return:
+            identity (str): The identity, the stripped text by default.
+        """
+        if isinstance(raw, (bytes, bytearray, memoryview)):
+            raw = bytes(raw).decode(errors="replace")
+        return str(raw).strip()
+
+    def dispatch(self, name, *args, **kwargs):
+        """Execute a command in the command table by its name.
+
+        Args:
+            name (str): Name of the command.
+            *args: Positional arguments of the command.
+            **kwargs: Keyword arguments of the command.
+
+        Return:
+            ret (bytes or None): The response of the device.
+
+        Raises:
+            KeyError: If the command is not in the command table.
+        """
+        if self.COMMANDS is None or name not in self.COMMANDS:
+            raise KeyError(f"{type(self).__name__}: unknown command '{name}'.")
+        return getattr(self, name)(*args, **kwargs)
+
+
+MemberResult = namedtuple(
+    "MemberResult", ["name", "value", "error", "elapsed"]
+)
+MemberResult.__doc__ = """Result of a call on a member of a group.
+
+Attributes:
+    name (str): Name of the member.
+    value: Return value of the call (None if failed).
+    error (Exception or None): Exception raised by the call.
+    elapsed (float): Latency of the call (sec).
+"""
+
+
+class PerMember(object):
+    """Argument which differs among members of a group.
+
+    Args:
+        values (list, tuple, numpy.ndarray or dict): Values in the order
+            of the members, or correspondance dict of the names of
+            members and values.
+    """
+    def __init__(self, values):
+        self.values = values
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.values!r})"
+
+    def __len__(self):
+        return len(self.values)
+
+    def get(self, index, name):
+        """Get the value of a member.
+
+        Args:
+            index (int): Index of the member.
+            name (str): Name of the member.
+
+        Return:
+            ret: The value of the member. An element of an array is
+                converted to the Python scalar.
+        """
+        if isinstance(self.values, dict):
+            value = self.values[name]
+        else:
+            value = self.values[index]
+        if getattr(value, "ndim", None) == 0:
+            value = value.item()
+        return value
+
+
+class GroupResult(list):
+    """Results of a call on all the members of a group.
+
+    This is a list of "MemberResult" in the order of the members.
+    """
+    @property
+    def ok(self):
+        """bool: True if the call succeeded on all the members."""
+        return all(r.error is None for r in self)
+
+    @property
+    def values(self):
+        """dict: Correspondance dict of names of members and values."""
+        return {r.name: r.value for r in self}
+
+    @property
+    def errors(self):
+        """dict: Correspondance dict of names of members and exceptions."""
+        return {r.name: r.error for r in self if r.error is not None}
+
+    @property
+    def elapsed(self):
+        """dict: Correspondance dict of names of members and latencies."""
+        return {r.name: r.elapsed for r in self}
+
+    def to_array(self):
+        """Convert the results to a structured array.
+
+        Return:
+            ret (numpy.ndarray): Array of the fields "name", "value",
+                "error" and "elapsed". "value" and "error" are objects.
+        """
+        import numpy as np
+
+        dtype = [
+            ("name", f"U{max((len(r.name) for r in self), default=1)}"),
+            ("value", object),
+            ("error", object),
+            ("elapsed", float),
+        ]
+        return np.array([tuple(r) for r in self], dtype=dtype)
+
+    def raise_for_errors(self):
+        """Raise an error if the call failed on any member.
+
+        Return:
+            self (GroupResult): These results.
+
+        Raises:
+            maodevice.exceptions.FleetError: If the call failed
+                on any member.
+        """
+        if not self.ok:
+            from maodevice.exceptions import FleetError
+
+            raise FleetError(self)
+        return self
+
+
+class DeviceGroup(object):
+    """Call a method on several device handlers concurrently.
+
+    A method called on the group is executed on all the members by
+    a thread pool, so that it takes about as long as the slowest
+    member, and returns a "GroupResult". An argument wrapped by
+    "PerMember" is given to each member separately::
+
+        group = DeviceGroup({"md1": md1, "md2": md2})
+        group.set_vgain(PerMember(np.array([5., 6.])))
+        group.show_status().to_array()
+
+    Args:
+        members (dict or list): Correspondance dict of the names of
+            members and device handlers, or a list of device handlers
+            (named "member0", "member1", ...).
+        max_workers (int or None): Number of threads.
+            Defaults to None (the number of members).
+
+    Attributes:
+        NAME_PREFIX (str): Prefix of the names of members in a list.
+        members (dict): Correspondance dict of the names of members
+            and device handlers.
+    """
+    NAME_PREFIX = "member"
+
+    def __init__(self, members, max_workers=None):
+        if not isinstance(members, dict):
+            members = {
+                f"{self.NAME_PREFIX}{i}": member
+                for i, member in enumerate(members)
+            }
+
+        assert members, "members: expected to have at least one member."
+
+        self.members = dict(members)
+        self.max_workers = max_workers or len(self.members)
+        # The executor is imported here, since importing it costs
+        # several milliseconds at the import of every handler.
+        from concurrent.futures import ThreadPoolExecutor
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=type(self).__name__,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.members)
+
+    def __getattr__(self, name):
+        if name.startswith("_") or "members" not in self.__dict__:
+            raise AttributeError(name)
+        first = next(iter(self.members.values()))
+        attribute = getattr(type(first), name, None)
+        if attribute is None:
+            attribute = getattr(first, name, None)
+        if not callable(attribute):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+
+        method.__name__ = name
+        method.__doc__ = attribute.__doc__
+        return method
+
+    def close(self):
+        """Close the connections to all the members and the thread pool.
+
+        Return:
+            results (GroupResult): Results of closing each member.
+        """
+        results = self.call("close")
+        self._pool.shutdown()
+        return results
+
+    def call(self, method, *args, **kwargs):
+        """Execute a method on all the members concurrently.
+
+        Args:
+            method (str or function): Name of the method, or function
+                which takes a member as the first argument.
+            *args: Positional arguments, which may be "PerMember".
+            **kwargs: Keyword arguments, which may be "PerMember".
+
+        Return:
+            results (GroupResult): Results of the members.
+        """
+        for arg in (*args, *kwargs.values()):
+            if isinstance(arg, PerMember) \
+                    and not isinstance(arg.values, dict):
+                assert len(arg) == len(self.members), \
+                    "PerMember: expected to have a value per member."
+
+        futures = [
+            self._pool.submit(
+                self._run, index, name, member, method, args, kwargs
+            )
+            for index, (name, member) in enumerate(self.members.items())
+        ]
+        return GroupResult(future.result() for future in futures)
+
+    @staticmethod
+    def _run(index, name, member, method, args, kwargs):
+        """Execute a method on a member.
+
+        Note:
+            This method is only for the internal use.
+
+        Return:
+            result (MemberResult): The result of the member.
+        """
+        start = time.perf_counter()
+        try:
+            args = [_resolve(arg, index, name) for arg in args]
+            kwargs = {k: _resolve(v, index, name) for k, v in kwargs.items()}
+            func = getattr(member, method) if isinstance(method, str) \
+                else (lambda *a, **k: method(member, *a, **k))
+            value = func(*args, **kwargs)
+        except Exception as err:
+            return MemberResult(name, None, err, time.perf_counter() - start)
+        return MemberResult(name, value, None, time.perf_counter() - start)
+
+
+def _resolve(arg, index, name):
+    if isinstance(arg, PerMember):
+        return arg.get(index, name)
+    return arg
+
+
+def setter(method):
+    """Mark a method as a setter, which is always validated.
+
+    This function is intended to be used as a decorator like follows::
+
+        >>> @setter
+        >>> def func(self, *args, **kwargs):
+        >>>     # do something
+        >>>     return
+
+    Args:
+        method (function): A method of a device handler.
+
+    Return:
+        method (function): The marked method.
+    """
+    method.validation = "setter"
+    return method
+
+
+def query(method):
+    """Mark a method as a query, which is validated by sampling.
+
+    Args:
+        method (function): A method of a device handler.
+
+    Return:
+        method (function): The marked method.
+    """
+    method.validation = "query"
+    return method
+
+
+def unvalidated(method):
+    """Mark a method which is never validated.
+
+    Args:
+        method (function): A method of a device handler.
+
+    Return:
+        method (function): The marked method.
+    """
+    method.validation = None
+    return method
+
+
+_QUERY_PREFIXES = ("query_", "show_", "get_", "read_")
+
+
+class ValidationPolicy(object):
+    """Policy of the validation of the methods of a device handler.
+
+    Setters are validated every call if "setters" is True. Queries are
+    validated at the rate of "queries" by counting calls, e.g. every
+    fourth query for 0.25, so that monitoring with many queries does
+    not double the round trips.
+
+    Args:
+        setters (bool): Validate setters. Defaults to True.
+        queries (float): Rate of queries to validate from 0.0 (never)
+            to 1.0 (every call). Defaults to 0.0.
+
+    Attributes:
+        validated (int): Number of validated calls.
+        skipped (int): Number of calls which were not validated.
+    """
+    def __init__(self, setters=True, queries=0.):
+        assert 0. <= queries <= 1., "queries: expected to be in [0, 1]."
+
+        self.setters = setters
+        self.queries = queries
+        self.validated = 0
+        self.skipped = 0
+        self._credit = 0.
+
+    def __repr__(self):
+        return (
+            f"ValidationPolicy(setters={self.setters!r},"
+            f" queries={self.queries!r})"
+        )
+
+    def should_validate(self, kind):
+        """Decide whether to validate a call.
+
+        Args:
+            kind (str): Kind of the method, "setter" or "query".
+
+        Return:
+            ret (bool): True if the call should be validated.
+        """
+        if kind == "setter":
+            ret = bool(self.setters)
+        else:
+            self._credit += self.queries
+            ret = self._credit >= 1.
+            if ret:
+                self._credit -= 1.
+
+        if ret:
+            self.validated += 1
+        else:
+            self.skipped += 1
+        return ret
+
 
 class BaseValidator(type, metaclass=ABCMeta):
     """Validate a communication with a device.
@@ -157,35 +1034,92 @@ class BaseValidator(type, metaclass=ABCMeta):
     This is the base class of device validators.
 
     Note:
-        This class itself is not used, but it is inherited by
-        child classes and used.
+        - This class itself is not used, but it is inherited by
+          child classes and used.
+        - If the class has the attribute "COMMANDS"
+          (see "maodevice.commands.CommandTable"), the methods of
+          the commands which are not defined in the class are
+          generated from it.
+        - Public methods are classified as setters or queries
+          (see "classify"), and validated according to the
+          "validation_policy" of the instance.
     """
     def __new__(meta, class_name, bases, class_dict):
+        class_dict = dict(class_dict)
+        commands = class_dict.get("COMMANDS")
+        if commands is not None:
+            # Generate methods of commands which are not written by hand.
+            for name, method in commands.methods().items():
+                if name not in class_dict:
+                    method.__module__ = class_dict.get("__module__")
+                    method.__qualname__ = f"{class_name}.{name}"
+                    class_dict[name] = method
+
         new_class_dict = {}
         for attribute_name, attribute in class_dict.items():
             if isinstance(attribute, FunctionType):
                 if not attribute_name.startswith("_"):
-                    attribute = meta.validate(attribute)
+                    kind = meta.classify(attribute_name, attribute)
+                    if kind is not None:
+                        attribute = meta.validate(attribute, kind)
             new_class_dict[attribute_name] = attribute
         return type.__new__(meta, class_name, bases, new_class_dict)
 
+    @staticmethod
+    def classify(name, method):
+        """Classify a method as a setter or a query.
+
+        Note:
+            A method marked by "setter", "query" or "unvalidated" is
+            classified by the mark. A method generated from a command
+            is a query if the command reads a reply. Otherwise, a
+            method whose name starts with "query_", "show_", "get_"
+            or "read_", or ends with "_query", is a query.
+
+        Args:
+            name (str): Name of the method.
+            method (function): The method.
+
+        Return:
+            kind (str or None): "setter", "query" or None
+                (not validated).
+        """
+        if hasattr(method, "validation"):
+            return method.validation
+
+        command = getattr(method, "command", None)
+        if command is not None:
+            return "query" if command.is_query else "setter"
+
+        if name.startswith(_QUERY_PREFIXES) or name.endswith("_query"):
+            return "query"
+        return "setter"
+
     @classmethod
-    def validate(cls, method):
+    def validate(cls, method, kind="setter"):
         """Validate a communication with a device.
 
         This method decorates existing methods.
 
         Args:
             method (function): A function to be wrapped.
+            kind (str): Kind of the method, "setter" or "query".
+                Defaults to "setter".
 
         Return:
             wrapper (function): A wrapped function.
         """
+        check = profiled(f"validate:{cls.__name__}")(cls._validate)
+
         @wraps(method)
         def wrapper(self, *args, **kwargs):
             ret = method(self, *args, **kwargs)
-            cls._validate(self)
+            policy = getattr(self, "validation_policy", None)
+            if policy is None or policy.should_validate(kind):
+                check(self)
             return ret
+        wrapper = profiled(method.__qualname__)(wrapper)
+        wrapper.validation = kind
         return wrapper
 
     @abstractmethod
@@ -198,7 +1132,6 @@ class BaseValidator(type, metaclass=ABCMeta):
         pass
 
 
-# NOTE: TBD
 class BaseDeviceError(Exception):
     """Base exception class of "maodevice" package.
 
@@ -1,4 +1,25 @@
 # -*- coding: utf-8 -*-
-from .octad_s import OctadS
+from maodevice.utils.lazy import lazy_loader
 
-del octad_s
+__all__ = [
+    "AdcHealthAnalyzer",
+    "DecodePipeline",
+    "OctadS",
+    "OctadSFleet",
+    "SpectralAccumulator",
+    "StatusDispatcher",
+    "TimeSyncMonitor",
+]
+
+__getattr__, __dir__ = lazy_loader(
+    __name__,
+    attributes={
+        "AdcHealthAnalyzer": ".adc",
+        "DecodePipeline": ".pipeline",
+        "OctadS": ".octad_s",
+        "OctadSFleet": ".fleet",
+        "SpectralAccumulator": ".accumulator",
+        "StatusDispatcher": ".status",
+        "TimeSyncMonitor": ".timesync",
+    },
+)
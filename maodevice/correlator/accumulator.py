@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+__all__ = [
+    "IntegratedSpectrum",
+    "SpectralAccumulator",
+]
+
+from collections import namedtuple
+
+import numpy as np
+
+
+IntegratedSpectrum = namedtuple(
+    "IntegratedSpectrum",
+    ["thread", "start", "stop", "spectrum", "weight", "n_spectra"],
+)
+IntegratedSpectrum.__doc__ = """Integrated spectrum emitted by the accumulator.
+
+Attributes:
+    thread (int): Thread ID.
+    start (float or None): Time of the first spectrum.
+    stop (float or None): Time of the last spectrum.
+    spectrum (numpy.ndarray): Weighted mean of the spectra.
+        Channels without valid data are NaN.
+    weight (numpy.ndarray): Sum of the weights of each channel.
+    n_spectra (int): Number of the integrated spectra.
+"""
+
+
+class _Buffer(object):
+    """Preallocated buffers of a thread.
+
+    Note:
+        This class is only for the internal use.
+    """
+    def __init__(self, n_channels, dtype):
+        self.sum = np.zeros(n_channels, dtype=dtype)
+        self.weight = np.zeros(n_channels, dtype=np.float64)
+        self.valid = np.empty(n_channels, dtype=bool)
+        self.n_spectra = 0
+        self.start = None
+        self.stop = None
+
+    def reset(self):
+        self.sum.fill(0)
+        self.weight.fill(0)
+        self.n_spectra = 0
+        self.start = None
+        self.stop = None
+
+
+class SpectralAccumulator(object):
+    """Integrate spectra of "OCTAD-S" in real time.
+
+    The spectra of each thread are summed in place into preallocated
+    buffers (float64 for auto-correlation and complex128 for
+    cross-correlation). When the number of spectra reaches the cadence,
+    the weighted mean is emitted to the subscribers and returned by
+    "add" or "add_block".
+
+    Note:
+        The mean of thread ID are as follows.
+        1. Auto-correlation of channel 1
+        2. Auto-correlation of channel 2
+        5. Cross-correlation of channels 1 and 2
+
+    Args:
+        n_channels (int): Number of spectral channels.
+        integ_time (float): Integration time of each spectrum (sec),
+            which is selected by "OctadS.select_integration_time".
+            Defaults to 0.01.
+        cadence (float): Time span of an emitted spectrum (sec).
+            Defaults to 1.0.
+        threads (tuple): Thread IDs to integrate. Defaults to (1, 2, 5).
+        mask (array_like or None): Channels to flag (True is flagged).
+            Defaults to None (no channel is flagged).
+
+    Attributes:
+        n_integrate (int): Number of spectra of an emitted spectrum.
+    """
+    CROSS_THREADS = (5,)
+
+    def __init__(
+            self,
+            n_channels,
+            integ_time=0.01,
+            cadence=1.,
+            threads=(1, 2, 5),
+            mask=None,
+    ):
+        self.n_channels = n_channels
+        self.integ_time = integ_time
+        self.cadence = cadence
+        self.n_integrate = max(int(round(cadence / integ_time)), 1)
+        self.subscribers = []
+        self._buffers = {
+            thread: _Buffer(
+                n_channels,
+                np.complex128 if thread in self.CROSS_THREADS
+                else np.float64,
+            )
+            for thread in threads
+        }
+        self.set_mask(mask)
+
+    def set_mask(self, mask=None):
+        """Set the channels to flag.
+
+        Args:
+            mask (array_like or None): Channels to flag (True is flagged).
+                Defaults to None (no channel is flagged).
+
+        Return:
+            None
+        """
+        if mask is None:
+            mask = np.zeros(self.n_channels, dtype=bool)
+        mask = np.asarray(mask, dtype=bool)
+
+        assert mask.shape == (self.n_channels,), \
+            f"mask: expected to have {self.n_channels} channels."
+
+        self._unmasked = ~mask
+        return
+
+    def subscribe(self, callback):
+        """Register a function called with each emitted spectrum.
+
+        Args:
+            callback (function): Function which takes an
+                "IntegratedSpectrum".
+
+        Return:
+            None
+        """
+        self.subscribers.append(callback)
+        return
+
+    def add(self, thread, spectrum, time=None, flags=None):
+        """Add a spectrum.
+
+        Args:
+            thread (int): Thread ID.
+            spectrum (numpy.ndarray): A spectrum.
+            time (float or None): Time of the spectrum. Defaults to None.
+            flags (array_like or bool or None): Channels to flag in this
+                spectrum. True flags the whole spectrum.
+                Defaults to None (no channel is flagged).
+
+        Return:
+            emitted (:obj:`list` of :obj:`IntegratedSpectrum`):
+                Spectra emitted by this call.
+        """
+        buf = self._buffers[thread]
+        valid = buf.valid
+        np.copyto(valid, self._unmasked)
+        if flags is not None:
+            np.logical_and(valid, np.logical_not(flags), out=valid)
+
+        np.add(buf.sum, spectrum, out=buf.sum, where=valid)
+        np.add(buf.weight, valid, out=buf.weight)
+        self._count(buf, 1, time, time)
+
+        if buf.n_spectra >= self.n_integrate:
+            return [self._emit(thread, buf)]
+        return []
+
+    def add_block(self, thread, spectra, times=None, flags=None):
+        """Add consecutive spectra at once.
+
+        Args:
+            thread (int): Thread ID.
+            spectra (numpy.ndarray): Spectra of shape (n, n_channels).
+            times (array_like or None): Times of the spectra.
+                Defaults to None.
+            flags (array_like or None): Channels to flag in the spectra
+                of shape (n, n_channels) or (n, 1). Defaults to None.
+
+        Return:
+            emitted (:obj:`list` of :obj:`IntegratedSpectrum`):
+                Spectra emitted by this call.
+        """
+        buf = self._buffers[thread]
+        emitted = []
+        head = 0
+        while head < len(spectra):
+            tail = min(head + self.n_integrate - buf.n_spectra, len(spectra))
+            shape = (tail - head, self.n_channels)
+            valid = np.broadcast_to(self._unmasked, shape)
+            if flags is not None:
+                valid = valid & ~np.asarray(flags[head:tail], dtype=bool)
+
+            buf.sum += np.sum(spectra[head:tail], axis=0, where=valid)
+            buf.weight += np.count_nonzero(valid, axis=0)
+            if times is None:
+                self._count(buf, tail - head, None, None)
+            else:
+                self._count(buf, tail - head, times[head], times[tail - 1])
+
+            if buf.n_spectra >= self.n_integrate:
+                emitted.append(self._emit(thread, buf))
+            head = tail
+        return emitted
+
+    def flush(self):
+        """Emit the spectra being integrated.
+
+        Return:
+            emitted (:obj:`list` of :obj:`IntegratedSpectrum`):
+                Spectra of the threads which have any data.
+        """
+        return [
+            self._emit(thread, buf)
+            for thread, buf in self._buffers.items() if buf.n_spectra
+        ]
+
+    def reset(self):
+        """Discard the spectra being integrated.
+
+        Return:
+            None
+        """
+        for buf in self._buffers.values():
+            buf.reset()
+        return
+
+    def _count(self, buf, n_spectra, start, stop):
+        if buf.n_spectra == 0:
+            buf.start = start
+        buf.stop = stop
+        buf.n_spectra += n_spectra
+
+    def _emit(self, thread, buf):
+        """Emit the integrated spectrum of a thread and reset its buffers.
+
+        Note:
+            This method is only for the internal use.
+
+        Args:
+            thread (int): Thread ID.
+            buf (_Buffer): Buffers of the thread.
+
+        Return:
+            product (IntegratedSpectrum): The integrated spectrum.
+        """
+        spectrum = np.full_like(buf.sum, np.nan)
+        np.divide(buf.sum, buf.weight, out=spectrum, where=buf.weight > 0)
+        product = IntegratedSpectrum(
+            thread, buf.start, buf.stop, spectrum,
+            buf.weight.copy(), buf.n_spectra,
+        )
+        buf.reset()
+
+        for callback in self.subscribers:
+            callback(product)
+        return product
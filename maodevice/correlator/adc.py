@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+__all__ = [
+    "AdcHealthAnalyzer",
+    "optimal_step",
+    "parse_bit_distribution",
+]
+
+import re
+from functools import lru_cache
+
+import numpy as np
+
+
+def parse_bit_distribution(raw):
+    """Parse the reply of "OctadS.show_adc_sampling_bit".
+
+    Note:
+        The reply is regarded as the numbers of samples per ADC output
+        level, from the lowest level to the highest one. An echoed
+        command name before "=" is ignored.
+
+    Args:
+        raw (bytes or str): The reply of the device.
+
+    Return:
+        counts (numpy.ndarray): Numbers of samples per level.
+    """
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        raw = bytes(raw).decode()
+    _, _, body = raw.rpartition("=")
+    tokens = re.findall(r"\d+", body)
+    return np.array(tokens, dtype=np.int64)
+
+
+@lru_cache(maxsize=None)
+def optimal_step(bits):
+    """Optimal step of a uniform quantizer for a Gaussian signal.
+
+    The step minimizes the mean square error of the quantization
+    and is given in units of the standard deviation of the signal
+    (e.g. 0.9957 for 2 bits).
+
+    Args:
+        bits (int): Number of bits of the quantizer.
+
+    Return:
+        step (float): The optimal step.
+    """
+    assert bits >= 1, "bits: expected to be positive."
+
+    n_levels = 2 ** bits
+    x = np.linspace(-8., 8., 8001)
+    pdf = np.exp(-x ** 2 / 2)
+    pdf /= pdf.sum()
+
+    def search(steps):
+        steps = steps[:, None]
+        index = np.clip(np.floor(x / steps), -n_levels // 2, n_levels // 2 - 1)
+        error = (x - (index + 0.5) * steps) ** 2 @ pdf
+        return float(steps[np.argmin(error), 0])
+
+    # coarse search and then fine search around the minimum
+    step = search(np.linspace(0.01, 2.5, 250))
+    return search(np.linspace(step - 0.01, step + 0.01, 201))
+
+
+class AdcHealthAnalyzer(object):
+    """Analyze the health of an ADC of "OCTAD-S".
+
+    The bit distributions of the latest "window" polls are summed
+    incrementally, and the statistics below are derived from the sum.
+
+    - Occupancy of each level and of the given threshold levels.
+    - Standard deviation and power of the input signal.
+    - Clipping, missing codes and bit balance, which indicate the need
+      of "OctadS.calibrate_de_multiplexer".
+    - Optimal scaling of "OctadS.select_requantization_scaling".
+
+    Note:
+        The scaling of the requantization is assumed to be a right
+        shift by "scale" bits of the requantizer input, whose standard
+        deviation is the one of the ADC output times "input_gain".
+
+    Args:
+        n_bits (int): Number of bits of the ADC. Defaults to 8.
+        window (int): Number of polls to integrate. Defaults to 8.
+        requantization_bits (int): Number of bits after the
+            requantization. Defaults to 2.
+        input_gain (float): Gain of the standard deviation from the ADC
+            output to the requantizer input. Defaults to 1.0.
+
+    Attributes:
+        n_levels (int): Number of the ADC output levels.
+        levels (numpy.ndarray): Level values centered at zero (LSB).
+    """
+    MAX_SCALING = 31
+
+    def __init__(self, n_bits=8, window=8, requantization_bits=2,
+                 input_gain=1.):
+        self.n_bits = n_bits
+        self.n_levels = 2 ** n_bits
+        self.window = window
+        self.requantization_bits = requantization_bits
+        self.input_gain = input_gain
+        self.levels = np.arange(self.n_levels) - (self.n_levels - 1) / 2
+
+        self._history = np.zeros((window, self.n_levels), dtype=np.int64)
+        self._counts = np.zeros(self.n_levels, dtype=np.int64)
+        self._n_polls = 0
+
+    def __len__(self):
+        return min(self._n_polls, self.window)
+
+    def reset(self):
+        """Forget all the bit distributions.
+
+        Return:
+            None
+        """
+        self._history[:] = 0
+        self._counts[:] = 0
+        self._n_polls = 0
+        return
+
+    def update(self, distribution):
+        """Add a bit distribution to the window.
+
+        Args:
+            distribution (bytes or str or numpy.ndarray): The reply of
+                "OctadS.show_adc_sampling_bit" or the parsed one.
+
+        Return:
+            self (AdcHealthAnalyzer): This analyzer.
+        """
+        if not isinstance(distribution, np.ndarray):
+            distribution = parse_bit_distribution(distribution)
+
+        assert len(distribution) == self.n_levels, \
+            f"distribution: expected to have {self.n_levels} levels."
+
+        slot = self._n_polls % self.window
+        self._counts -= self._history[slot]
+        self._history[slot] = distribution
+        self._counts += distribution
+        self._n_polls += 1
+        return self
+
+    def poll(self, octad, n):
+        """Read a bit distribution from the device and add it.
+
+        Args:
+            octad (maodevice.correlator.OctadS): The device handler.
+            n (int): ADC number.
+
+        Return:
+            self (AdcHealthAnalyzer): This analyzer.
+        """
+        return self.update(octad.show_adc_sampling_bit(n))
+
+    @property
+    def counts(self):
+        """numpy.ndarray: Numbers of samples per level in the window."""
+        return self._counts.copy()
+
+    @property
+    def occupancy(self):
+        """numpy.ndarray: Fractions of samples per level."""
+        total = self._counts.sum()
+        assert total > 0, "no bit distribution in the window."
+        return self._counts / total
+
+    @property
+    def mean(self):
+        """float: Mean of the ADC output (LSB)."""
+        return float(self.occupancy @ self.levels)
+
+    @property
+    def sigma(self):
+        """float: Standard deviation of the ADC output (LSB).
+
+        It is estimated from the 15.87 and 84.13 percentiles, which
+        is robust against the clipping.
+        """
+        cdf = np.cumsum(self.occupancy)
+        edges = self.levels + 0.5
+        q_lo, q_hi = np.interp([0.158655, 0.841345], cdf, edges)
+        return float(q_hi - q_lo) / 2
+
+    @property
+    def power_dbfs(self):
+        """float: Power of the input relative to the full scale (dB)."""
+        return 20 * np.log10(self.sigma / (self.n_levels / 2))
+
+    @property
+    def clipping(self):
+        """float: Fraction of samples at the lowest or highest level."""
+        occupancy = self.occupancy
+        return float(occupancy[0] + occupancy[-1])
+
+    @property
+    def bit_balance(self):
+        """numpy.ndarray: Fraction of samples whose bit is 1 (LSB first)."""
+        codes = np.arange(self.n_levels)
+        bits = (codes[:, None] >> np.arange(self.n_bits)) & 1
+        return self.occupancy @ bits
+
+    def missing_codes(self, n_sigma=2.):
+        """Find levels without samples around the mean.
+
+        Args:
+            n_sigma (float): Range to search in units of "sigma".
+                Defaults to 2.0.
+
+        Return:
+            ret (numpy.ndarray): Indices of the missing levels.
+        """
+        near = np.abs(self.levels - self.mean) <= n_sigma * self.sigma
+        return np.flatnonzero(near & (self._counts == 0))
+
+    def needs_calibration(self, tolerance=0.05):
+        """Check whether the de-multiplexer should be calibrated.
+
+        Note:
+            A bit-alignment error of the de-multiplexer appears as
+            missing codes or as lower bits which are not balanced.
+            The lower bits are the ones below "sigma".
+
+        Args:
+            tolerance (float): Allowed deviation of the bit balance
+                from 0.5. Defaults to 0.05.
+
+        Return:
+            ret (bool): True if the calibration is needed.
+        """
+        if len(self.missing_codes()):
+            return True
+        n_lower = max(int(np.log2(max(self.sigma, 1.))), 1)
+        balance = self.bit_balance[:n_lower]
+        return bool(np.any(np.abs(balance - 0.5) > tolerance))
+
+    def threshold_occupancy(self, thresholds):
+        """Fractions of samples between the threshold levels.
+
+        Args:
+            thresholds (array_like): Ascending thresholds (LSB).
+
+        Return:
+            ret (numpy.ndarray): Fractions of samples in each bin,
+                whose length is len(thresholds) + 1.
+        """
+        bins = np.searchsorted(thresholds, self.levels, side="right")
+        return np.bincount(
+            bins, weights=self.occupancy, minlength=len(thresholds) + 1
+        )
+
+    def optimal_requantization_scaling(self):
+        """Optimal scaling of "OctadS.select_requantization_scaling".
+
+        The scaling makes the step of the requantizer closest to the
+        optimal one for the estimated standard deviation.
+
+        Return:
+            scale (int): The optimal scaling.
+        """
+        sigma = self.sigma * self.input_gain
+        step = optimal_step(self.requantization_bits)
+        scale = int(np.round(np.log2(max(sigma * step, 1.))))
+        return min(max(scale, 0), self.MAX_SCALING)
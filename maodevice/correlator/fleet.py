@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+__all__ = [
+    "FleetResult",
+    "OctadSFleet",
+    "PerUnit",
+    "UnitResult",
+]
+
+import threading
+import time
+
+from maodevice.core import DeviceGroup, GroupResult, MemberResult, PerMember
+from maodevice.correlator.octad_s import OctadS
+
+
+# Aliases of the generic group of devices (see "maodevice.core").
+UnitResult = MemberResult
+PerUnit = PerMember
+FleetResult = GroupResult
+
+
+class OctadSFleet(DeviceGroup):
+    """Control several "OCTAD-S" units in parallel.
+
+    This is a child class of "maodevice.core.DeviceGroup".
+    A method of "OctadS" called on the fleet is executed on all the
+    units by a thread pool, and returns a "FleetResult". An argument
+    wrapped by "PerUnit" is given to each unit separately::
+
+        fleet = OctadSFleet({"octad1": octad1, "octad2": octad2})
+        fleet.select_integration_time(10)
+        fleet.set_vdif_destination_port(1, PerUnit([60000, 60001]))
+        fleet.synchronize_with_external().raise_for_errors()
+
+    Args:
+        units (dict or list): Correspondance dict of the names of units
+            and "OctadS" instances, or a list of "OctadS" instances
+            (named "unit0", "unit1", ...).
+        max_workers (int or None): Number of threads.
+            Defaults to None (the number of units).
+
+    Attributes:
+        units (dict): Correspondance dict of the names of units and
+            "OctadS" instances.
+    """
+    NAME_PREFIX = "unit"
+
+    @property
+    def units(self):
+        return self.members
+
+    def __getattr__(self, name):
+        if not callable(getattr(OctadS, name, None)):
+            raise AttributeError(name)
+        return super().__getattr__(name)
+
+    def synchronize_with_external(self, offset=0.2, timeout=5.):
+        """Synchronize all the units to the same external 1PPS.
+
+        The units wait at a barrier, and then send the command at the
+        same time, "offset" seconds after the next second boundary,
+        so that all the units are synchronized to the same 1PPS.
+
+        Args:
+            offset (float): Time after a second boundary to send the
+                command (sec). Defaults to 0.2.
+            timeout (float): Time to wait for all the units at the
+                barrier (sec). Defaults to 5.0.
+
+        Return:
+            results (FleetResult): Results of the units. The "value"
+                of each result is the time when the command was sent.
+        """
+        assert self.max_workers >= len(self.units), \
+            "max_workers: expected to be the number of units or more."
+
+        target = []
+
+        def choose():
+            now = time.time()
+            target.append(int(now) + 1 + offset)
+
+        barrier = threading.Barrier(len(self.units), action=choose)
+
+        def sync(unit):
+            barrier.wait(timeout)
+            delay = target[0] - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            sent = time.time()
+            unit.synchronize_with_external()
+            return sent
+
+        return self.call(sync)
@@ -1,406 +1,300 @@
 # -*- coding: utf-8 -*-
+from maodevice.commands import Argument, Command, CommandTable, Reply
 from maodevice.core import BaseDeviceHandler
 from maodevice.validators import OctadSValidator
 
 
-class OctadS(BaseDeviceHandler, metaclass=OctadSValidator):
-    """Control "OCTAD-S".
+THREAD_ID_NOTE = """Note:
+    The mean of thread ID are as follows.
+    1. Auto-correlation of channel 1
+    2. Auto-correlation of channel 2
+    5. Cross-correlation of channels 1 and 2"""
 
-    The OCTAD-S is the FPGA-based correlator.
 
-    Note:
-        This class is based on "maodevice.core.BaseDeviceHandler".
+def _adc(doc="ADC number."):
+    return Argument("n", int, doc, choices=(1, 2))
 
-    Args:
-        com (maodevice.communicator):
-            Communicator instance to control the device.
 
-    Attributes:
-        MANUFACTURER (str): Manufacturer of the device.
-        PRODUCT_NAME (str): Name of the device.
-        CLASSIFICATION (str): Classification of the device.
-    """
-    MANUFACTURER = "Elecs"
-    PRODUCT_NAME = "OCTAD-S"
-    CLASSFICATION = "Correlator"
+def _thread(doc="Thread ID."):
+    return Argument("n", int, doc, choices=(1, 2, 5))
 
-    CORRELATION_MODE = {
-        "Auto1":    0x01,
-        "Auto2":    0x02,
-        "Cross1-2": 0x10,
-    }
 
-    def __init__(self, com):
-        super().__init__(com)
-        self.com.set_terminator(";")
-
-    def calibrate_de_multiplexer(self, n):
-        """Calibrate the data transfer from the ADC to the FPGA.
+COMMANDS = CommandTable([
+    Command(
+        "calibrate_de_multiplexer", "ctl_dmxcal{n}", [_adc()],
+        doc="""Calibrate the data transfer from the ADC to the FPGA.
 
         Notes:
             - Execute this method only when "show_status" shows
               "DBBC_module_adc_de-multiplexer_bit-alignment_error".
             - This method may take up to several minutes to complete.
             - You must execute "synchronize_with_external"
-              after executing this method.
-
-        Args:
-            n (int): ADC number.
-                Allowed values are 1 or 2.
-
-        Return:
-            None
-        """
-        self.com.send(f"ctl_dmxcal{n}")
-        return
-
-    def restart(self):
-        """Restart "OCTAD-S".
-
-        Return:
-            None
-        """
-        self.com.send("reset=system")
-        return
-
-    def select_correlation_scaling(self, n, scale=0):
-        """Set scaling of X (Correlation) part.
+              after executing this method.""",
+    ),
+    Command(
+        "restart", "reset=system",
+        doc="""Restart "OCTAD-S".""",
+    ),
+    Command(
+        "select_correlation_scaling", "set_scaling{n}={scale}",
+        [
+            _thread(),
+            Argument("scale", int, "Scaling of X (Correlation) part.",
+                     default=0, range=(0, 31)),
+        ],
+        doc="Set scaling of X (Correlation) part.\n\n" + THREAD_ID_NOTE,
+    ),
+    Command(
+        "select_integration_time", "set_iplen={integ_time}",
+        [Argument("integ_time", int, "Integration time.",
+                  default=5, choices=(5, 10), unit="msec")],
+        doc="Select integration time.",
+    ),
+    Command(
+        "select_repeat_response", "set_ipreq={is_repeat}",
+        [Argument("is_repeat", bool, "Response indicator.\n"
+                  "    If it is true, output the repeat message.",
+                  default=False, mapping={True: "on", False: "off"})],
+        doc="Select whether to output the repeat message.",
+    ),
+    Command(
+        "select_requantization_scaling", "set_requantization{n}={scale}",
+        [
+            _adc(),
+            Argument("scale", int, "Scaling of Y (Requantization) part.",
+                     default=0, range=(0, 31)),
+        ],
+        doc="Set scaling of Y (Requantization) part.",
+    ),
+    Command(
+        "set_adc_delay_offset", "set_dlyoffset{n}={offset}",
+        [
+            _adc(),
+            Argument("offset", int, "Delay offset of ADC.",
+                     default=16384, range=(0, 32767)),
+        ],
+        doc="Set the delay offset of ADC.",
+    ),
+    Command(
+        "set_adc_dynamic_range", "set_adc{n}={d_range}:{offset}",
+        [
+            _adc(),
+            Argument("d_range", float, "Dynamic range of ADC.",
+                     default=256., range=(240., 270.)),
+            Argument("offset", float,
+                     "Offset voltage of ADC dynamic range.",
+                     default=0., range=(-128., 128.)),
+        ],
+        doc="""Set dynamic range of ADC.
 
         Note:
-            The mean of thread ID are as follows.
-            1. Auto-correlation of channel 1
-            2. Auto-correlation of channel 2
-            5. Cross-correlation of channels 1 and 2
-
-        Args:
-            n (int): Thread ID.
-                Allowed values are 1, 2 or 5.
-            scale (int): Scaling of X (Correlation) part.
-                Set within the range of 0 - 31.
-                Defaults to 0.
-
-        Return:
-            None
-        """
-        self.com.send(f"set_scaling{n}={scale}")
-        return
-
-    def select_integration_time(self, integ_time=5):
-        """Select integration time.
-
-        Args:
-            integ_time (int): Integration time.
-                Allowed values are 5 or 10 (msec).
-                Defaults to 5.
-
-        Return:
-            None
-        """
-        self.com.send(f"set_iplen={integ_time}")
-        return
-
-    def select_repeat_response(self, is_repeat=False):
-        """Select whether to output the repeat message.
-
-        Args:
-            is_repeat (bool): Response indicator.
-                If it is true, output the repeat message.
-
-        Return:
-            None
-        """
-        is_output = "on" if is_repeat else "off"
-        self.com.send(f"set_ipreq={is_output}")
-        return
-
-    def select_requantization_scaling(self, n, scale=0):
-        """Set scaling of Y (Requantization) part.
-
-        Args:
-            n (int): ADC number.
-                Allowed values are 1 or 2.
-            scale (int): Scaling of Y (Requantization) part.
-                Set within the range of 0 - 31.
-                Defaults to 0.
-
-        Return:
-            None
-        """
-        self.com.send(f"set_requantization{n}={scale}")
-        return
-
-    def set_adc_delay_offset(self, n, offset=16384):
-        """Set the delay offset of ADC.
-
-        Args:
-            n (int): ADC number.
-                Allowed values are 1 or 2.
-            offset (int): Delay offset of ADC.
-                You must set within the range of 0 - 32767.
-                Defaults to 16384.
-
-        Return:
-            None
-        """
-        self.com.send(f"set_dlyoffset{n}={offset}")
-        return
-
-    def set_adc_dynamic_range(self, n, d_range=256., offset=0.):
-        """Set dynamic range of ADC.
-
-        Note:
-            Do not change the dynamic range as much as possible.
-
-        Args:
-            n (int): ADC number.
-                Allowed values are 1 or 2.
-            d_range (float): Dynamic range of ADC.
-                Set within the range of 240.0 - 270.0.
-                Defaults to 256.0.
-            offset (float): Offset voltage of ADC dynamic range.
-                Set within the range of -128.0 - 128.0.
-                Defaults to 0.0.
-
-        Return:
-            None
-        """
-        self.com.send(f"set_adc{n}={d_range}:{offset}")
-        return
-
-    def set_control_port_ip(self, ip):
-        """Set IP address of the control port.
+            Do not change the dynamic range as much as possible.""",
+    ),
+    Command(
+        "set_control_port_ip", "set_ctlip={ip}",
+        [Argument("ip", str, "IP address of the control port.")],
+        doc="""Set IP address of the control port.
 
         Note:
-            You must restart after executing thie method.
-
-        Args:
-            ip (str): IP address of the control port.
-
-        Return:
-            None
-        """
-        self.com.send(f"set_ctlip={ip}")
-        return
-
-    def set_control_port_subnet_mask(self, mask):
-        """Set subnet mask of the control port.
+            You must restart after executing this method.""",
+    ),
+    Command(
+        "set_control_port_subnet_mask", "set_ctlmask={mask}",
+        [Argument("mask", str, "Subnet mask of the control port.")],
+        doc="""Set subnet mask of the control port.
 
         Notes:
             - You must restart after executing this method.
-            - The subnet mask of the 10G port is the same as this one.
-
-        Args:
-            mask (str): Subnet mask of the control port.
-
-        Return:
-            None
-        """
-        self.com.send(f"set_ctlmask={mask}")
-        return
-
-    def set_date(self, year, doy, hour, minute, second):
-        """Set the date to add to sampling data.
+            - The subnet mask of the 10G port is the same as this one.""",
+    ),
+    Command(
+        "set_date",
+        "set_smpdate={year}y{doy}d{hour}h{minute}m{second:.0f}s",
+        [
+            Argument("year", int, "Year."),
+            Argument("doy", int, "Day of the year.", range=(1, 366)),
+            Argument("hour", int, "Hour.", range=(0, 23)),
+            Argument("minute", int, "Minute.", range=(0, 59)),
+            Argument("second", float, "Second.", range=(0, 60)),
+        ],
+        doc="""Set the date to add to sampling data.
 
         Notes:
             - You must execute this method after the method
               "synchronize_with_external".
             - You do not need to execute this method
-              if you use a NTP server.
-
-        Args:
-            year (int): Year.
-            doy (int): Day of the year.
-            hour (int): Hour.
-            minute (int): Minute.
-            second (int): Second.
-
-        Return:
-            None
-        """
-        self.com.send(
-            f"set_smpdate={year}y{doy}d{hour}h{minute}m{second:.0f}s"
-        )
-        return
-
-    def set_gigabit_ethernet_ip(self, ip):
-        """Set IP address of the Gigabit ethernet.
+              if you use a NTP server.""",
+    ),
+    Command(
+        "set_gigabit_ethernet_ip", "set_gbeip={ip}",
+        [Argument("ip", str, "IP address of the Gigabit ethernet.")],
+        doc="""Set IP address of the Gigabit ethernet.
 
         Note:
-            You must restart after executing this method.
-
-        Args:
-            ip (str): IP address of the Gigabit ethernet.
-
-        Return:
-            None
-        """
-        self.com.send(f"set_gbeip={ip}")
-        return
-
-    def set_mask_time_of_integration(self, mask_time=0):
-        """Set the time to mask integration.
+            You must restart after executing this method.""",
+    ),
+    Command(
+        "set_mask_time_of_integration", "set_ipmask={mask_time}",
+        [Argument("mask_time", int, "Time to mask integration.",
+                  default=0, range=(0, 2000))],
+        doc="""Set the time to mask integration.
 
         Note:
             You set this time by FFT segment unit.
-            (e.g. 2000 FFT segment is 2 ms)
-
-        Args:
-            mask_time (int): Time to mask integration.
-                You must set within the range of 0 - 2000.
-
-        Return:
-            None
-        """
-        self.com.send(f"set_ipmask={mask_time}")
-        return
-
-    def set_ntp_ip(self, ip):
-        """Set IP address of a NTP server.
+            (e.g. 2000 FFT segment is 2 ms)""",
+    ),
+    Command(
+        "set_ntp_ip", "set_ntp={ip}",
+        [Argument("ip", str, "IP address of a NTP server.")],
+        doc="""Set IP address of a NTP server.
 
         Notes:
             - You must restart or execute "synchronize_with_external"
               after execution of this method.
-            - You set the IP address "0.0.0.0" to disable the SNTP function.
-
-        Args:
-            ip (str): IP address of a NTP server.
-
-        Return:
-            None
-        """
-        self.com.send(f"set_ntp={ip}")
-        return
-
-    def set_vdif_destination_ip(self, n, ip):
-        """Set the destination IP address of VDIF.
+            - You set the IP address "0.0.0.0" to disable the SNTP
+              function.""",
+    ),
+    Command(
+        "set_vdif_destination_ip", "set_vdifdes{n}={ip}",
+        [_thread(), Argument("ip", str, "Destination IP address of VDIF.")],
+        doc="Set the destination IP address of VDIF.\n\n" + THREAD_ID_NOTE,
+    ),
+    Command(
+        "set_vdif_destination_port", "set_vdifdesport{n}={port}",
+        [
+            _thread(),
+            Argument("port", int, "Destination UDP port of VDIF.",
+                     range=(0, 65535)),
+        ],
+        doc="Set the destination UDP port of VDIF.\n\n" + THREAD_ID_NOTE,
+    ),
+    Command(
+        "set_window_function", "set_window={win_func}",
+        [Argument("win_func", str, "Window function of FFT.",
+                  default="none",
+                  choices=("none", "hamming", "hanning", "blackman"))],
+        doc="Set the window function of FFT.",
+    ),
+    Command(
+        "show_1pps_gap", "show_1ppsgap?",
+        reply=Reply(int, "The 1PPS gap.", unit="ns"),
+        doc="Show the gap between internal 1PPS and external one.",
+    ),
+    Command(
+        "show_adc_sampling_bit", "show_adcsmpbit{n}?", [_adc()],
+        reply=Reply(str, "Bit distribution."),
+        doc="Show the bit distribution after sampling with ADC.",
+    ),
+    Command(
+        "show_fpga_power", "show_fpga_power{n}?",
+        [Argument("n", int, "Module number.\n"
+                  "    If n = 1 to 4, it corresponds to DSP module <n>, and\n"
+                  "    when n = 5 it corresponds to output module.",
+                  choices=(1, 2, 3, 4, 5))],
+        reply=Reply(float, "Power supply voltage.", unit="V"),
+        doc="Show the power supply voltage measured by FPGA.",
+    ),
+    Command(
+        "show_status", "show_status?",
+        reply=Reply(str, "Status string."),
+        doc="""Show malfunctions occured now or in the past.
 
         Note:
-            The mean of thread ID are as follows.
-            1. Auto-correlation of channel 1
-            2. Auto-correlation of channel 2
-            5. Cross-correlation of channels 1 and 2
-
-        Args:
-            n (int): Thread ID.
-                Allowed values are 1, 2 or 5.
-            ip (str): Destination IP address of VDIF.
-
-        Return:
-            None
-        """
-        self.com.send(f"set_vdifdes{n}={ip}")
-        return
-
-    def set_vdif_destination_port(self, n, port):
-        """Set the destination UDP port of VDIF.
-
-        Note:
-            The mean of thread ID are as follows.
-            1. Auto-correlation of channel 1
-            2. Auto-correlation of channel 2
-            5. Cross-correlation of channels 1 and 2
-
-        Args:
-            n (int): Thread ID.
-                Allowed values are 1, 2 or 5.
-            port (int): Destination UDP port of VDIF.
-
-        Return:
-            None
-        """
-        self.com.send(f"set_vdifdesport{n}={port}")
-        return
-
-    def set_window_function(self, win_func="none"):
-        """Set the window function of FFT.
-
-        Note:
-            You can choose window functions as follows.
-            - None
-            - Hamming
-            - Hanning
-            - Blackman
-
-        Args:
-            win_func (str): Window function of FFT.
-                Select one of "nont", "hamming", "hanning" or "blackman".
-                Defaults to "none".
-
-        Return:
-            None
-        """
-        self.com.send(f"set_window={win_func}")
-        return
+            Since it is READ & CLEAR, alarms that occured in the past
+            are displayed only once. Regarding the current ongoing
+            alram, no matter how many times this command is issued,
+            the alarm will be displayed.""",
+        idempotent=False,
+    ),
+    Command(
+        "show_system", "show_system?",
+        reply=Reply(str, "Information of \"OCTAD-S\"."),
+        doc="""Show various information of "OCTAD-S".""",
+    ),
+    Command(
+        "show_temperature", "show_temp?",
+        reply=Reply(float, "FPGA junction temperature.", unit="degC"),
+        doc="Show FPGA junction temperature.",
+    ),
+    Command(
+        "synchronize_with_external", "ctl_sync",
+        doc="Synchronize the device to an external synchronization signal.",
+    ),
+])
 
-    def show_1pps_gap(self):
-        """Show the gap between internal 1PPS and external one.
 
-        Return:
-            ret (bytes): The 1PPS gap (ns).
-        """
-        ret = self.com.query("show_1ppsgap?")
-        return ret
+class OctadS(BaseDeviceHandler, metaclass=OctadSValidator):
+    """Control "OCTAD-S".
 
-    def show_adc_sampling_bit(self, n):
-        """Show the bit distribution after sampling with ADC.
+    The OCTAD-S is the FPGA-based correlator.
 
-        Args:
-            n (int): ADC number.
-                Allowed values are 1 or 2.
+    Note:
+        - This class is based on "maodevice.core.BaseDeviceHandler".
+        - The methods of the commands are generated from "COMMANDS".
 
-        Return:
-            ret (bytes): Bit distribution.
-        """
-        ret = self.com.query(f"show_adcsmpbit{n}?")
-        return ret
+    Args:
+        com (maodevice.communicator):
+            Communicator instance to control the device.
 
-    def show_fpga_power(self, n):
-        """Show the power supply voltage measured by FPGA.
+    Attributes:
+        MANUFACTURER (str): Manufacturer of the device.
+        PRODUCT_NAME (str): Name of the device.
+        CLASSIFICATION (str): Classification of the device.
+        COMMANDS (maodevice.commands.CommandTable):
+            Command table of the device.
+        IDENTITY (str): Name of the method which identifies the device,
+            whose result is cached by "probe".
+        PROBES (tuple of str): Methods whose results are cached
+            once per identity by "probe".
+        VOLATILE_FIELDS (tuple of str): Fields of "show_system" which
+            change while running and are excluded from the identity.
+    """
+    MANUFACTURER = "Elecs"
+    PRODUCT_NAME = "OCTAD-S"
+    CLASSFICATION = "Correlator"
+    COMMANDS = COMMANDS
+    IDENTITY = "show_system"
+    PROBES = ("show_system",)
+    VOLATILE_FIELDS = ("alarm", "date", "gap", "power", "status", "temp",
+                       "time", "uptime")
 
-        Args:
-            n (int): Module number.
-                If n = 1 to 4, it corresponds to DSP module <n>, and
-                when n = 5 it corresponds to output module.
-                Allowed values are 1, 2, 3, 4 or 5.
+    CORRELATION_MODE = {
+        "Auto1":    0x01,
+        "Auto2":    0x02,
+        "Cross1-2": 0x10,
+    }
 
-        Return:
-            ret (bytes): Power supply voltage.
-        """
-        ret = self.com.query(f"show_fpga_power{n}?")
-        return ret
+    def __init__(self, com):
+        super().__init__(com)
+        self.com.set_terminator(";")
 
-    def show_status(self):
-        """Show malfunctions occured now or in the past.
+    def parse_identity(self, raw):
+        """Parse the reply of "show_system" to the identity.
 
         Note:
-            Since it is READ & CLEAR, alarms that occured in the past
-            are displayed only once. Regarding the current ongoing
-            alram, no matter how many times this command is issued,
-            the alarm will be displayed.
-
-        Return:
-            ret (bytes): Status string.
-        """
-        ret = self.com.query("show_status?")
-        return ret
-
-    def show_system(self):
-        """Show various information of "OCTAD-S".
-
-        Return:
-            ret (bytes): Information of "OCTAD-S".
-        """
-        ret = self.com.query("show_system?")
-        return ret
+            The identity is made of the "<key>=<value>" fields of the
+            reply except "VOLATILE_FIELDS" (matched by the prefixes of
+            the keys), so that the status in the reply does not change
+            the key of the cache. The whole text is used if the reply
+            has no fields.
 
-    def show_temperature(self):
-        """Show FPGA junction temperature.
+        Args:
+            raw (bytes or str): The reply of "show_system".
 
         Return:
-            ret (bytes): FPGA junction temperature.
+            identity (str): The identity.
         """
-        ret = self.com.query("show_temp?")
-        return ret
+        import re
+
+        text = super().parse_identity(raw).rstrip(";")
+        fields = re.findall(r"([\w.-]+)\s*=\s*([^\s,;]*)", text)
+        if not fields:
+            return text
+        stable = [
+            f"{key}={value}" for key, value in fields
+            if not key.lower().startswith(self.VOLATILE_FIELDS)
+        ]
+        return ",".join(stable)
 
     def start_correlation(self, time, *mode):
         """Start correlation.
@@ -411,12 +305,3 @@ class OctadS(BaseDeviceHandler, metaclass=OctadSValidator):
         """Stop correlation.
         """
         pass
-
-    def synchronize_with_external(self):
-        """Synchronize the device to an external synchronization signal.
-
-        Return:
-            None
-        """
-        self.com.send("ctl_sync")
-        return
\ No newline at end of file
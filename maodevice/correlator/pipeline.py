@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""Multiprocess decode pipeline of VDIF frames.
+
+Frames are written into the slots of a ring on shared memory, either by
+the caller ("DecodePipeline.write") or by a receiver process which
+receives UDP packets directly into the slots ("DecodePipeline.receive").
+Worker processes decode the slots in place, and only slot indices go
+through the queues, so that payloads are never pickled::
+
+    with DecodePipeline(frame_bytes=8224) as pipeline:
+        pipeline.receive(("0.0.0.0", 60000))
+        while True:
+            slot, frames = pipeline.get()
+            payload = payload_view(frames)
+            ...
+            pipeline.release(slot)
+"""
+__all__ = [
+    "DecodePipeline",
+    "DecodedSlot",
+]
+
+import multiprocessing as mp
+import os
+import socket
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+from maodevice.correlator.vdif import decode_frames, frame_dtype
+
+
+DecodedSlot = namedtuple("DecodedSlot", ["slot", "frames"])
+DecodedSlot.__doc__ = """Decoded slot returned by "DecodePipeline.get".
+
+Attributes:
+    slot (int): Index of the slot.
+    frames (numpy.ndarray): Decoded frames on the shared memory.
+        They are valid until the slot is released.
+"""
+
+
+def _decode_worker(shm, tasks, done, frame_bytes, slot_bytes, sample):
+    """Decode slots given by the task queue.
+
+    Note:
+        This function is only for the internal use.
+    """
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        slot, n_frames = task
+        try:
+            decode_frames(
+                shm.buf, frame_bytes, n_frames, slot * slot_bytes, sample
+            )
+            done.put((slot, n_frames, None))
+        except Exception as err:
+            done.put((slot, 0, repr(err)))
+
+
+def _receive_worker(shm, free, tasks, address, frame_bytes, frames_per_slot,
+                    slot_bytes, timeout):
+    """Receive UDP packets of frames into free slots.
+
+    Note:
+        This function is only for the internal use.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(address)
+    sock.settimeout(timeout)
+    buf = memoryview(shm.buf)
+    while True:
+        slot = free.get()
+        if slot is None:
+            return
+        head = slot * slot_bytes
+        n_frames = 0
+        while n_frames < frames_per_slot:
+            start = head + n_frames * frame_bytes
+            try:
+                size, _, flags, _ = sock.recvmsg_into(
+                    [buf[start:start + frame_bytes]]
+                )
+            except socket.timeout:
+                if n_frames:
+                    break
+                continue
+            # A larger datagram is truncated to the frame, and is
+            # dropped as well as a smaller one.
+            if size == frame_bytes and not flags & socket.MSG_TRUNC:
+                n_frames += 1
+        tasks.put((slot, n_frames))
+
+
+class DecodePipeline(object):
+    """Decode VDIF frames by a pool of worker processes.
+
+    A slot holds "frames_per_slot" consecutive frames, which are
+    decoded at once by a worker. The caller acquires a free slot,
+    fills it and submits it, and gets decoded slots by "get". A slot
+    must be released after its frames are used.
+
+    Args:
+        frame_bytes (int): Bytes of a frame including the header.
+        frames_per_slot (int): Number of frames in a slot.
+            Defaults to 64.
+        n_slots (int): Number of slots of the ring. Defaults to 64.
+        n_workers (int or None): Number of worker processes.
+            Defaults to None (the number of CPUs).
+        sample (str): Data type of a sample in the payload.
+            Defaults to ">f4" (big-endian float32).
+
+    Attributes:
+        slot_bytes (int): Bytes of a slot.
+    """
+    def __init__(
+            self,
+            frame_bytes,
+            frames_per_slot=64,
+            n_slots=64,
+            n_workers=None,
+            sample=">f4",
+    ):
+        self.frame_bytes = frame_bytes
+        self.frames_per_slot = frames_per_slot
+        self.n_slots = n_slots
+        self.n_workers = n_workers or os.cpu_count()
+        self.sample = np.dtype(sample)
+        self.slot_bytes = frame_bytes * frames_per_slot
+        self._dtype = frame_dtype(frame_bytes, self.sample.newbyteorder("="))
+        self._ctx = mp.get_context()
+        self._shm = None
+        self._workers = []
+        self._receivers = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def running(self):
+        """bool: True if the worker processes are running."""
+        return self._shm is not None
+
+    def start(self):
+        """Allocate the ring and start the worker processes.
+
+        Return:
+            None
+        """
+        assert not self.running, "the pipeline is already running."
+
+        size = self.n_slots * self.slot_bytes
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._free = self._ctx.Queue()
+        self._tasks = self._ctx.Queue()
+        self._done = self._ctx.Queue()
+        for slot in range(self.n_slots):
+            self._free.put(slot)
+
+        for _ in range(self.n_workers):
+            worker = self._ctx.Process(
+                target=_decode_worker,
+                args=(self._shm, self._tasks, self._done, self.frame_bytes,
+                      self.slot_bytes, self.sample.str),
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+        return
+
+    def stop(self):
+        """Stop the processes and free the ring.
+
+        Note:
+            Frames returned by "get" become invalid.
+
+        Return:
+            None
+        """
+        if not self.running:
+            return
+
+        for receiver in self._receivers:
+            receiver.terminate()
+        for _ in self._workers:
+            self._tasks.put(None)
+        for process in self._workers + self._receivers:
+            process.join()
+        self._workers, self._receivers = [], []
+
+        try:
+            self._shm.close()
+        except BufferError:
+            # frames returned by "get" still refer to the ring
+            pass
+        self._shm.unlink()
+        self._shm = None
+        return
+
+    def receive(self, address, timeout=0.1):
+        """Start a receiver process which fills slots by UDP packets.
+
+        Note:
+            Do not use "acquire" or "write" together with a receiver,
+            since the receiver takes all the free slots.
+
+        Args:
+            address (tuple): Address (host, port) to bind.
+            timeout (float): Time to wait for the next packet (sec).
+                A partially filled slot is submitted after it.
+                Defaults to 0.1.
+
+        Return:
+            None
+        """
+        assert self.running, "the pipeline is not running."
+
+        receiver = self._ctx.Process(
+            target=_receive_worker,
+            args=(self._shm, self._free, self._tasks, address,
+                  self.frame_bytes, self.frames_per_slot, self.slot_bytes,
+                  timeout),
+            daemon=True,
+        )
+        receiver.start()
+        self._receivers.append(receiver)
+        return
+
+    def acquire(self, timeout=None):
+        """Acquire a free slot.
+
+        Args:
+            timeout (float or None): Time to wait for a free slot (sec).
+                Defaults to None (wait forever).
+
+        Return:
+            slot (int): Index of the slot.
+        """
+        return self._free.get(timeout=timeout)
+
+    def slot_buffer(self, slot):
+        """Writable buffer of a slot.
+
+        Args:
+            slot (int): Index of the slot.
+
+        Return:
+            buf (memoryview): The buffer of "slot_bytes".
+        """
+        head = slot * self.slot_bytes
+        return self._shm.buf[head:head + self.slot_bytes]
+
+    def submit(self, slot, n_frames=None):
+        """Submit a filled slot to the workers.
+
+        Args:
+            slot (int): Index of the slot.
+            n_frames (int or None): Number of frames in the slot.
+                Defaults to None ("frames_per_slot").
+
+        Return:
+            None
+        """
+        n_frames = self.frames_per_slot if n_frames is None else n_frames
+        self._tasks.put((slot, n_frames))
+        return
+
+    def write(self, data, timeout=None):
+        """Copy frames into a free slot and submit it.
+
+        Args:
+            data (bytes-like): Up to "frames_per_slot" consecutive frames.
+            timeout (float or None): Time to wait for a free slot (sec).
+                Defaults to None (wait forever).
+
+        Return:
+            slot (int): Index of the slot.
+        """
+        n_frames, rest = divmod(len(data), self.frame_bytes)
+
+        assert rest == 0 and 0 < n_frames <= self.frames_per_slot, \
+            "data: expected to be whole frames within a slot."
+
+        slot = self.acquire(timeout)
+        self.slot_buffer(slot)[:len(data)] = data
+        self.submit(slot, n_frames)
+        return slot
+
+    def get(self, timeout=None):
+        """Get a decoded slot.
+
+        Note:
+            Slots may be decoded out of order. Use the frame numbers in
+            the headers to order the frames.
+
+        Args:
+            timeout (float or None): Time to wait for a decoded slot (sec).
+                Defaults to None (wait forever).
+
+        Return:
+            decoded (DecodedSlot): The decoded slot.
+
+        Raises:
+            queue.Empty: If no slot is decoded within the timeout.
+            RuntimeError: If a worker failed to decode the slot.
+        """
+        slot, n_frames, error = self._done.get(timeout=timeout)
+        if error is not None:
+            self.release(slot)
+            raise RuntimeError(f"slot {slot}: {error}")
+
+        frames = np.frombuffer(
+            self._shm.buf, dtype=self._dtype, count=n_frames,
+            offset=slot * self.slot_bytes,
+        )
+        return DecodedSlot(slot, frames)
+
+    def release(self, slot):
+        """Release a slot to be filled again.
+
+        Args:
+            slot (int): Index of the slot.
+
+        Return:
+            None
+        """
+        self._free.put(slot)
+        return
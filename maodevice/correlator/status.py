@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""Status alarms of "OCTAD-S".
+
+"OctadS.show_status" is READ & CLEAR, so that only one service should
+poll it. "StatusDispatcher" owns the polling and turns the alarms into
+"raised" and "cleared" events with sequence numbers. The events are
+published to callbacks in the process and, by "StatusPublisher", to
+clients over a Unix domain socket. A client which reconnects resumes
+from the last sequence number it received, so that no alarm is lost::
+
+    dispatcher = StatusDispatcher(octad)
+    with StatusPublisher(dispatcher) as publisher:
+        threading.Thread(target=publisher.serve_forever).start()
+        dispatcher.run()
+
+    # in another process
+    for event in StatusClient().events():
+        print(event.code, event.state)
+"""
+__all__ = [
+    "DEFAULT_STATUS_SOCKET",
+    "StatusClient",
+    "StatusDispatcher",
+    "StatusEvent",
+    "StatusPublisher",
+    "parse_status",
+]
+
+import json
+import os
+import re
+import socket
+import socketserver
+import threading
+import time
+from collections import deque, namedtuple
+
+from maodevice.daemon import DaemonError, _is_alive
+
+
+DEFAULT_STATUS_SOCKET = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR", "/tmp"),
+    f"maodevice-status-{os.getuid()}.sock",
+)
+
+NO_ALARMS = ("", "ok", "none", "normal", "no_error")
+
+StatusEvent = namedtuple("StatusEvent", ["seq", "time", "code", "state"])
+StatusEvent.__doc__ = """Event of a status alarm.
+
+Attributes:
+    seq (int): Sequence number of the event, which starts from 1.
+    time (float): Time when the event was detected (sec).
+    code (str): Code of the alarm,
+        e.g. "DBBC_module_adc_de-multiplexer_bit-alignment_error".
+    state (str): "raised" or "cleared".
+"""
+
+
+def parse_status(raw):
+    """Parse the reply of "OctadS.show_status" into alarm codes.
+
+    Args:
+        raw (bytes or str): The reply of the device.
+
+    Return:
+        codes (:obj:`list` of :obj:`str`): Codes of the alarms
+            without duplicates in order of appearance.
+    """
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        raw = bytes(raw).decode(errors="replace")
+    _, _, body = raw.rpartition("=")
+    codes = []
+    for token in re.split(r"[\s,;]+", body):
+        if token.lower() not in NO_ALARMS and token not in codes:
+            codes.append(token)
+    return codes
+
+
+class StatusDispatcher(object):
+    """Poll the status of "OCTAD-S" and dispatch alarm events.
+
+    An alarm which appears in a reply is "raised" once, and "cleared"
+    when it disappears from the next reply. A past alarm, which
+    appears only once, is thus raised and cleared at consecutive polls.
+
+    Args:
+        octad (maodevice.correlator.OctadS): The device handler.
+        history (int): Number of events kept for late subscribers.
+            Defaults to 4096.
+        clock (function): Function which returns the current time (sec).
+            Defaults to time.time.
+
+    Attributes:
+        active (dict): Correspondance dict of the codes of the ongoing
+            alarms and their "raised" events.
+        history (collections.deque): The latest events.
+    """
+    def __init__(self, octad, history=4096, clock=time.time):
+        self.octad = octad
+        self.clock = clock
+        self.active = {}
+        self.history = deque(maxlen=history)
+        self._seq = 0
+        self._subscribers = []
+        self._cond = threading.Condition()
+
+    @property
+    def seq(self):
+        """int: Sequence number of the latest event."""
+        return self._seq
+
+    def subscribe(self, callback, since=None):
+        """Register a function called with each event.
+
+        Args:
+            callback (function): Function which takes a "StatusEvent".
+            since (int or None): Replay the events in the history after
+                this sequence number. Defaults to None (no replay).
+
+        Return:
+            None
+        """
+        with self._cond:
+            if since is not None:
+                for event in self.since(since):
+                    callback(event)
+            self._subscribers.append(callback)
+        return
+
+    def unsubscribe(self, callback):
+        """Unregister a function registered by "subscribe".
+
+        Args:
+            callback (function): The registered function.
+
+        Return:
+            None
+        """
+        with self._cond:
+            self._subscribers.remove(callback)
+        return
+
+    def since(self, seq):
+        """Events in the history after a sequence number.
+
+        Args:
+            seq (int): The sequence number.
+
+        Return:
+            events (:obj:`list` of :obj:`StatusEvent`): The events.
+        """
+        with self._cond:
+            start = max(len(self.history) - (self._seq - seq), 0)
+            return list(self.history)[start:]
+
+    def wait(self, seq, timeout=None):
+        """Wait for events after a sequence number.
+
+        Args:
+            seq (int): The sequence number.
+            timeout (float or None): Time to wait (sec).
+                Defaults to None (wait forever).
+
+        Return:
+            events (:obj:`list` of :obj:`StatusEvent`): The events,
+                which is empty if timed out.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > seq, timeout)
+            return self.since(seq)
+
+    def poll(self):
+        """Read the status from the device and dispatch events.
+
+        Return:
+            events (:obj:`list` of :obj:`StatusEvent`): The new events.
+        """
+        return self.update(parse_status(self.octad.show_status()))
+
+    def update(self, codes, t=None):
+        """Compare alarm codes with the ongoing ones and dispatch events.
+
+        Args:
+            codes (:obj:`list` of :obj:`str`): Codes of the alarms.
+            t (float or None): Time of the status (sec).
+                Defaults to None (the current time).
+
+        Return:
+            events (:obj:`list` of :obj:`StatusEvent`): The new events.
+        """
+        t = self.clock() if t is None else t
+        with self._cond:
+            events = [
+                self._event(t, code, "cleared")
+                for code in list(self.active) if code not in codes
+            ]
+            events += [
+                self._event(t, code, "raised")
+                for code in codes if code not in self.active
+            ]
+            for event in events:
+                if event.state == "raised":
+                    self.active[event.code] = event
+                else:
+                    del self.active[event.code]
+            subscribers = list(self._subscribers)
+            if events:
+                self._cond.notify_all()
+
+        # The callbacks are called without the lock, so that a callback
+        # which waits for another thread using the dispatcher does not
+        # deadlock.
+        for event in events:
+            for callback in subscribers:
+                callback(event)
+        return events
+
+    def _event(self, t, code, state):
+        self._seq += 1
+        event = StatusEvent(self._seq, t, code, state)
+        self.history.append(event)
+        return event
+
+    def run(self, interval=1., stop=None):
+        """Poll the status periodically.
+
+        Args:
+            interval (float): Interval of polling (sec). Defaults to 1.0.
+            stop (threading.Event or None): Event to stop polling.
+                Defaults to None (poll forever).
+
+        Return:
+            None
+        """
+        stop = stop or threading.Event()
+        deadline = time.monotonic()
+        while not stop.is_set():
+            self.poll()
+            deadline += interval
+            stop.wait(max(deadline - time.monotonic(), 0.))
+        return
+
+
+class _PublishHandler(socketserver.StreamRequestHandler):
+    """Stream events to a client connection.
+    """
+    def handle(self):
+        request = json.loads(self.rfile.readline() or b"{}")
+        seq = request.get("since")
+        dispatcher = self.server.dispatcher
+        if seq is None:
+            seq = dispatcher.seq
+
+        try:
+            while not self.server.closed.is_set():
+                for event in dispatcher.wait(seq, self.server.heartbeat):
+                    line = json.dumps(event._asdict()) + "\n"
+                    self.wfile.write(line.encode())
+                    seq = event.seq
+                self.wfile.flush()
+        except OSError:
+            # the client disconnected
+            pass
+
+
+class StatusPublisher(socketserver.ThreadingMixIn,
+                      socketserver.UnixStreamServer):
+    """Publish events of a dispatcher over a Unix domain socket.
+
+    A client sends a JSON object like ``{"since": 10}`` terminated by a
+    newline, and receives the events after the sequence number as JSON
+    objects terminated by newlines. Without "since", the client receives
+    only new events.
+
+    Args:
+        dispatcher (StatusDispatcher): The dispatcher.
+        path (str): Path of the Unix domain socket.
+            Defaults to "DEFAULT_STATUS_SOCKET".
+        heartbeat (float): Interval to check the closing (sec).
+            Defaults to 1.0.
+
+    Raises:
+        maodevice.daemon.DaemonError: If another publisher is listening
+            on the path.
+    """
+    daemon_threads = True
+
+    def __init__(self, dispatcher, path=DEFAULT_STATUS_SOCKET, heartbeat=1.):
+        self.dispatcher = dispatcher
+        self.path = path
+        self.heartbeat = heartbeat
+        self.closed = threading.Event()
+        if os.path.exists(path):
+            if _is_alive(path):
+                raise DaemonError(f"{path}: publisher is already running.")
+            os.unlink(path)
+        super().__init__(path, _PublishHandler)
+        os.chmod(path, 0o600)
+
+    def server_close(self):
+        self.closed.set()
+        super().server_close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class StatusClient(object):
+    """Receive events from "StatusPublisher".
+
+    Args:
+        path (str): Path of the Unix domain socket.
+            Defaults to "DEFAULT_STATUS_SOCKET".
+        timeout (float or None): Timeout of receiving an event.
+            Defaults to None.
+    """
+    def __init__(self, path=DEFAULT_STATUS_SOCKET, timeout=None):
+        self.path = path
+        self.timeout = timeout
+
+    def events(self, since=None):
+        """Iterate over the events.
+
+        Args:
+            since (int or None): Receive the events after this sequence
+                number. Defaults to None (only new events).
+
+        Yield:
+            event (StatusEvent): An event.
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            sock.sendall(json.dumps({"since": since}).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                for line in f:
+                    yield StatusEvent(**json.loads(line))
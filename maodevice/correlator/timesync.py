@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+__all__ = [
+    "TimeSyncAlert",
+    "TimeSyncMonitor",
+]
+
+import math
+import threading
+import time
+from collections import namedtuple
+
+from maodevice.utils.stats import RunningRegression
+
+
+TimeSyncAlert = namedtuple(
+    "TimeSyncAlert", ["time", "gap", "predicted", "drift", "eta", "synced"]
+)
+TimeSyncAlert.__doc__ = """Alert of the time-sync monitor.
+
+Attributes:
+    time (float): Time of the sample which raised the alert (sec).
+    gap (float): The 1PPS gap of the sample (ns).
+    predicted (float): The 1PPS gap predicted at the horizon (ns).
+    drift (float): The fitted drift of the gap (ns/s).
+    eta (float): Time left until the fitted gap reaches the threshold
+        (sec). It is 0 if the threshold is already exceeded.
+    synced (bool): True if "synchronize_with_external" was executed.
+"""
+
+
+class TimeSyncMonitor(object):
+    """Monitor the 1PPS gap of "OCTAD-S" and predict its drift.
+
+    The 1PPS gaps are fitted by a running linear regression. An alert
+    is raised when the gap, or the gap predicted at "horizon" seconds
+    later, exceeds the threshold. The monitor optionally executes
+    "OctadS.synchronize_with_external" at the alert.
+
+    Args:
+        octad (maodevice.correlator.OctadS): The device handler.
+        threshold (float): Allowed absolute 1PPS gap (ns).
+            Defaults to 100.
+        horizon (float): Time to look ahead (sec). Defaults to 60.
+        window (int): Number of samples to fit. Defaults to 600.
+        min_samples (int): Number of samples before predicting.
+            Defaults to 10.
+        holdoff (float): Time to suppress alerts after an alert (sec).
+            Defaults to 60.
+        auto_sync (bool): Synchronize at the alert. Defaults to False.
+        clock (function): Function which returns the current time (sec).
+            Defaults to time.time.
+
+    Attributes:
+        regression (maodevice.utils.stats.RunningRegression):
+            The regression, which holds the history of the gaps.
+        alerts (list): Functions called with each "TimeSyncAlert".
+    """
+    def __init__(
+            self,
+            octad,
+            threshold=100.,
+            horizon=60.,
+            window=600,
+            min_samples=10,
+            holdoff=60.,
+            auto_sync=False,
+            clock=time.time,
+    ):
+        self.octad = octad
+        self.threshold = threshold
+        self.horizon = horizon
+        self.min_samples = min_samples
+        self.holdoff = holdoff
+        self.auto_sync = auto_sync
+        self.clock = clock
+        self.regression = RunningRegression(window)
+        self.alerts = []
+        self._reply = octad.COMMANDS["show_1pps_gap"].reply
+        self._quiet_until = -math.inf
+
+    @property
+    def drift(self):
+        """float: The fitted drift of the 1PPS gap (ns/s)."""
+        return self.regression.slope
+
+    def poll(self):
+        """Read the 1PPS gap from the device and check it.
+
+        Return:
+            alert (TimeSyncAlert or None): The raised alert.
+        """
+        gap = self._reply.parse(self.octad.show_1pps_gap())
+        return self.update(self.clock(), gap)
+
+    def update(self, t, gap):
+        """Add a 1PPS gap and check it.
+
+        Args:
+            t (float): Time of the sample (sec).
+            gap (float): The 1PPS gap (ns).
+
+        Return:
+            alert (TimeSyncAlert or None): The raised alert.
+        """
+        reg = self.regression
+        reg.update(t, gap)
+        if t < self._quiet_until:
+            return None
+
+        if abs(gap) >= self.threshold:
+            predicted = reg.predict(t + self.horizon) \
+                if len(reg) >= self.min_samples else math.nan
+            return self._alert(t, gap, predicted, 0.)
+
+        if len(reg) < self.min_samples:
+            return None
+
+        predicted = reg.predict(t + self.horizon)
+        if not math.isfinite(predicted) or abs(predicted) < self.threshold:
+            return None
+
+        eta = reg.solve(math.copysign(self.threshold, reg.slope)) - t
+        return self._alert(t, gap, predicted, max(eta, 0.))
+
+    def _alert(self, t, gap, predicted, eta):
+        """Raise an alert and synchronize if enabled.
+
+        Note:
+            This method is only for the internal use.
+
+        Return:
+            alert (TimeSyncAlert): The raised alert.
+        """
+        alert = TimeSyncAlert(
+            t, gap, predicted, self.drift, eta, self.auto_sync
+        )
+        if self.auto_sync:
+            self.octad.synchronize_with_external()
+            self.regression.reset()
+
+        self._quiet_until = t + self.holdoff
+        for callback in self.alerts:
+            callback(alert)
+        return alert
+
+    def run(self, interval=1., stop=None):
+        """Poll the 1PPS gap periodically.
+
+        Args:
+            interval (float): Interval of polling (sec). Defaults to 1.0.
+            stop (threading.Event or None): Event to stop polling.
+                Defaults to None (poll forever).
+
+        Return:
+            None
+        """
+        stop = stop or threading.Event()
+        deadline = time.monotonic()
+        while not stop.is_set():
+            self.poll()
+            deadline += interval
+            stop.wait(max(deadline - time.monotonic(), 0.))
+        return
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""VDIF frames of "OCTAD-S".
+
+A frame consists of the 32-byte header of little-endian words and the
+payload. The payload of "OCTAD-S" is the array of big-endian samples,
+and the samples of the cross-correlation (thread 5) are the pairs of
+real and imaginary parts.
+
+The functions below decode frames in place: the payload is byte-swapped
+in the given buffer, so that decoding needs no copy and works on shared
+memory (see "maodevice.correlator.pipeline").
+"""
+__all__ = [
+    "HEADER_BYTES",
+    "VDIFHeader",
+    "decode_frames",
+    "frame_dtype",
+    "parse_header",
+    "parse_headers",
+    "payload_view",
+]
+
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+
+HEADER_BYTES = 32
+
+VDIFHeader = namedtuple(
+    "VDIFHeader",
+    [
+        "invalid", "seconds", "ref_epoch", "frame_number", "version",
+        "n_channels", "frame_bytes", "is_complex", "bits_per_sample",
+        "thread", "station",
+    ],
+)
+VDIFHeader.__doc__ = """Header of a VDIF frame.
+
+Attributes:
+    invalid (bool): True if the frame is invalid.
+    seconds (int): Seconds from the reference epoch.
+    ref_epoch (int): Reference epoch (half years from 2000).
+    frame_number (int): Frame number within the second.
+    version (int): VDIF version.
+    n_channels (int): Number of channels.
+    frame_bytes (int): Bytes of the frame including the header.
+    is_complex (bool): True if the samples are complex.
+    bits_per_sample (int): Bits per sample (per part if complex).
+    thread (int): Thread ID.
+    station (int): Station ID.
+"""
+
+
+def parse_header(buf):
+    """Parse the header of a VDIF frame.
+
+    Args:
+        buf (bytes-like): A frame or its first 32 bytes.
+
+    Return:
+        header (VDIFHeader): The parsed header.
+    """
+    w0, w1, w2, w3 = struct.unpack_from("<4I", buf)
+    return VDIFHeader(
+        invalid=bool(w0 >> 31),
+        seconds=w0 & 0x3FFFFFFF,
+        ref_epoch=(w1 >> 24) & 0x3F,
+        frame_number=w1 & 0xFFFFFF,
+        version=w2 >> 29,
+        n_channels=1 << ((w2 >> 24) & 0x1F),
+        frame_bytes=(w2 & 0xFFFFFF) * 8,
+        is_complex=bool(w3 >> 31),
+        bits_per_sample=((w3 >> 26) & 0x1F) + 1,
+        thread=(w3 >> 16) & 0x3FF,
+        station=w3 & 0xFFFF,
+    )
+
+
+def parse_headers(headers):
+    """Parse the headers of VDIF frames at once.
+
+    Args:
+        headers (numpy.ndarray): Headers as 32-bit words of shape (n, 8),
+            e.g. the "header" field of "frame_dtype".
+
+    Return:
+        ret (dict): Correspondance dict of the field names of
+            "VDIFHeader" and arrays of them.
+    """
+    w0, w1, w2, w3 = (headers[:, i].astype(np.int64) for i in range(4))
+    return {
+        "invalid": (w0 >> 31).astype(bool),
+        "seconds": w0 & 0x3FFFFFFF,
+        "ref_epoch": (w1 >> 24) & 0x3F,
+        "frame_number": w1 & 0xFFFFFF,
+        "version": w2 >> 29,
+        "n_channels": 1 << ((w2 >> 24) & 0x1F),
+        "frame_bytes": (w2 & 0xFFFFFF) * 8,
+        "is_complex": (w3 >> 31).astype(bool),
+        "bits_per_sample": ((w3 >> 26) & 0x1F) + 1,
+        "thread": (w3 >> 16) & 0x3FF,
+        "station": w3 & 0xFFFF,
+    }
+
+
+def frame_dtype(frame_bytes, sample=">f4"):
+    """Structured data type of a VDIF frame.
+
+    Args:
+        frame_bytes (int): Bytes of the frame including the header.
+        sample (str): Data type of a sample in the payload.
+            Defaults to ">f4" (big-endian float32).
+
+    Return:
+        dtype (numpy.dtype): Data type with the fields "header"
+            (eight 32-bit words) and "payload".
+    """
+    sample = np.dtype(sample)
+    n_samples, rest = divmod(frame_bytes - HEADER_BYTES, sample.itemsize)
+
+    assert frame_bytes > HEADER_BYTES and rest == 0, \
+        "frame_bytes: expected to be the header and whole samples."
+
+    return np.dtype([("header", "<u4", 8), ("payload", sample, n_samples)])
+
+
+def decode_frames(buf, frame_bytes, count=-1, offset=0, sample=">f4"):
+    """Decode the payloads of consecutive VDIF frames in place.
+
+    The big-endian samples in the buffer are byte-swapped to the native
+    byte order. Use "payload_view" to read the decoded payloads.
+
+    Args:
+        buf (bytes-like): Writable buffer of frames.
+        frame_bytes (int): Bytes of a frame including the header.
+        count (int): Number of frames. Defaults to -1 (all).
+        offset (int): Offset of the first frame in bytes. Defaults to 0.
+        sample (str): Data type of a sample in the buffer.
+            Defaults to ">f4" (big-endian float32).
+
+    Return:
+        frames (numpy.ndarray): Frames in the buffer of "frame_dtype"
+            with the native byte order.
+    """
+    sample = np.dtype(sample)
+    frames = np.frombuffer(
+        buf, dtype=frame_dtype(frame_bytes, sample),
+        count=count, offset=offset,
+    )
+    if not sample.isnative:
+        frames["payload"].byteswap(inplace=True)
+    return frames.view(frame_dtype(frame_bytes, sample.newbyteorder("=")))
+
+
+def payload_view(frames, is_complex=None):
+    """View the decoded payloads of frames as an array.
+
+    Args:
+        frames (numpy.ndarray): Frames returned by "decode_frames".
+        is_complex (bool or None): True if the samples are complex.
+            Defaults to None (the flag in the header of the first frame).
+
+    Return:
+        payload (numpy.ndarray): Payloads of shape (n, n_samples).
+            The samples are complex if "is_complex".
+    """
+    payload = frames["payload"]
+    if is_complex is None:
+        is_complex = bool(len(frames)) and bool(frames["header"][0, 3] >> 31)
+    if not is_complex:
+        return payload
+
+    base = payload.dtype.base
+    complex_dtype = np.dtype(f"c{base.itemsize * 2}")
+    return payload.view(complex_dtype)
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""Local daemon which keeps connections to the configured devices.
+
+The daemon accepts requests over a Unix domain socket. Each request
+and response is a JSON object terminated by a newline.
+
+Request::
+
+    {"device": "octad", "method": "show_status", "args": [], "kwargs": {}}
+
+Response::
+
+    {"ok": true, "result": ...} or {"ok": false, "error": "..."}
+
+Values of the type "bytes" are encoded as ``{"bytes": "<base64>"}``.
+"""
+__all__ = [
+    "DEFAULT_SOCKET",
+    "DaemonClient",
+    "DaemonError",
+    "DeviceDaemon",
+]
+
+import json
+import os
+import socket
+import socketserver
+import threading
+
+from maodevice.config import create_device
+from maodevice.utils.serialize import decode, encode
+
+
+DEFAULT_SOCKET = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR", "/tmp"),
+    f"maodevice-{os.getuid()}.sock",
+)
+
+
+class DaemonError(Exception):
+    """Error raised by a request to the daemon.
+    """
+    pass
+
+
+def _jsonable(obj):
+    if hasattr(obj, "tolist"):
+        # numpy arrays and scalars
+        return obj.tolist()
+    raise TypeError(f"{obj!r} is not JSON serializable.")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handle requests of a client connection.
+    """
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                result = self.server.dispatch(request)
+                response = json.dumps(
+                    {"ok": True, "result": encode(result)},
+                    default=_jsonable,
+                )
+            except Exception as err:
+                response = json.dumps({
+                    "ok": False,
+                    "error": f"{type(err).__name__}: {err}",
+                })
+            self.wfile.write(response.encode() + b"\n")
+
+
+class DeviceDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Hold open connections to devices and serve requests.
+
+    Devices are connected when they are requested for the first time,
+    and requests to the same device are serialized.
+
+    Args:
+        config (dict): Configuration of devices.
+            See "maodevice.config.load_config".
+        path (str): Path of the Unix domain socket.
+            Defaults to "DEFAULT_SOCKET".
+    """
+    daemon_threads = True
+
+    def __init__(self, config, path=DEFAULT_SOCKET):
+        self.config = config
+        self.path = path
+        self._devices = {}
+        self._locks = {name: threading.Lock() for name in config}
+
+        if os.path.exists(path):
+            if _is_alive(path):
+                raise DaemonError(f"{path}: daemon is already running.")
+            os.unlink(path)
+
+        super().__init__(path, _RequestHandler)
+        os.chmod(path, 0o600)
+
+    def dispatch(self, request):
+        """Execute a request.
+
+        Args:
+            request (dict): A request from the client.
+
+        Return:
+            ret: The result of the request.
+
+        Raises:
+            DaemonError: If the device is unknown or the method is
+                private.
+        """
+        device = request.get("device")
+        method = request["method"]
+        if device is None:
+            return self._control(method)
+
+        # These checks are not asserts, which are removed by "-O".
+        if device not in self.config:
+            raise DaemonError(f"{device}: unknown device.")
+        if method.startswith("_"):
+            raise DaemonError(f"{method}: not allowed.")
+
+        with self._locks[device]:
+            handler = self._devices.get(device)
+            if handler is None:
+                handler = create_device(self.config[device])
+                self._devices[device] = handler
+            try:
+                return getattr(handler, method)(
+                    *decode(request.get("args", [])),
+                    **decode(request.get("kwargs", {})),
+                )
+            except OSError:
+                # Reconnect at the next request.
+                try:
+                    handler.close()
+                except Exception:
+                    pass
+                self._devices.pop(device, None)
+                raise
+
+    def _control(self, method):
+        if method == "ping":
+            return "pong"
+        if method == "list":
+            return {
+                name: {
+                    "handler": spec["handler"],
+                    "connected": name in self._devices,
+                }
+                for name, spec in self.config.items()
+            }
+        if method == "shutdown":
+            threading.Thread(target=self.shutdown).start()
+            return None
+        raise ValueError(f"{method}: unknown control method.")
+
+    def server_close(self):
+        super().server_close()
+        for handler in self._devices.values():
+            try:
+                handler.close()
+            except OSError:
+                pass
+        self._devices.clear()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def _is_alive(path):
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+        return True
+    except OSError:
+        return False
+
+
+class DaemonClient(object):
+    """Send requests to the daemon.
+
+    Args:
+        path (str): Path of the Unix domain socket.
+            Defaults to "DEFAULT_SOCKET".
+        timeout (float or None): Timeout of a request.
+            Defaults to None.
+    """
+    def __init__(self, path=DEFAULT_SOCKET, timeout=None):
+        self.path = path
+        self.timeout = timeout
+        self._sock = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def is_alive(self):
+        """Check whether the daemon is running.
+
+        Return:
+            ret (bool): True if the daemon is running.
+        """
+        return _is_alive(self.path)
+
+    def call(self, device, method, *args, **kwargs):
+        """Call a method of a device handler held by the daemon.
+
+        Args:
+            device (str or None): Name of the device.
+                If it is None, "method" is a control method of
+                the daemon ("ping", "list" or "shutdown").
+            method (str): Name of the method.
+            *args: Positional arguments of the method.
+            **kwargs: Keyword arguments of the method.
+
+        Return:
+            ret: The result of the method.
+
+        Raises:
+            DaemonError: If the method raised an exception.
+        """
+        if self._sock is None:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(self.timeout)
+            self._sock.connect(self.path)
+            self._file = self._sock.makefile("rb")
+
+        request = {
+            "device": device,
+            "method": method,
+            "args": encode(args),
+            "kwargs": encode(kwargs),
+        }
+        self._sock.sendall(json.dumps(request).encode() + b"\n")
+        response = json.loads(self._file.readline())
+        if not response["ok"]:
+            raise DaemonError(response["error"])
+        return decode(response["result"])
+
+    def close(self):
+        """Close the connection to the daemon.
+
+        Return:
+            None
+        """
+        if self._sock is not None:
+            self._file.close()
+            self._sock.close()
+            self._sock = None
+        return
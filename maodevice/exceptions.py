@@ -2,6 +2,82 @@
 from maodevice.core import BaseDeviceError
 
 
+# Communicators
+class ConnectionLostError(BaseDeviceError):
+    """Error raised when the connection to a device is lost.
+
+    This class is based on "maodevice.core.BaseDeviceError".
+
+    Args:
+        msg (str or None): The message which was being sent.
+            None if the connection was lost while receiving.
+        applied (:obj:`list` of :obj:`str`): Messages which were sent
+            after the last successful query, that is, may have been
+            already applied by the device.
+
+    Attributes:
+        msg (str or None): The message which was being sent.
+        applied (:obj:`list` of :obj:`str`): Messages which may have been
+            already applied by the device.
+    """
+    def __init__(self, msg, applied):
+        self.msg = msg
+        self.applied = applied
+        super().__init__(
+            f"connection lost while sending {msg!r}"
+            f" (already applied: {applied})"
+        )
+
+
+class ReplayError(BaseDeviceError):
+    """Error raised when a replayed session diverges from the recording.
+
+    This class is based on "maodevice.core.BaseDeviceError".
+
+    Args:
+        index (int): Index of the record.
+        expected: The recorded operation.
+        actual: The operation in the replay.
+
+    Attributes:
+        index (int): Index of the record.
+        expected: The recorded operation.
+        actual: The operation in the replay.
+    """
+    def __init__(self, index, expected, actual):
+        self.index = index
+        self.expected = expected
+        self.actual = actual
+        super().__init__(
+            f"record {index}: expected {expected!r}, got {actual!r}"
+        )
+
+
+# Groups of devices
+class FleetError(BaseDeviceError):
+    """Error raised when an operation failed on some devices of a group.
+
+    This class is based on "maodevice.core.BaseDeviceError".
+
+    Args:
+        results (list): Results of the operation of all the devices.
+
+    Attributes:
+        results (list): Results of the operation of all the devices.
+        errors (dict): Correspondance dict of the names of the failed
+            devices and their exceptions.
+    """
+    def __init__(self, results):
+        self.results = results
+        self.errors = {r.name: r.error for r in results if r.error}
+        details = ", ".join(
+            f"{name}: {err!r}" for name, err in self.errors.items()
+        )
+        super().__init__(
+            f"{len(self.errors)} of {len(results)} devices failed ({details})"
+        )
+
+
 # OCTAD-S (Elecs, Inc.)
 # NOTE: TBD
 class OctadSError(BaseDeviceError):
@@ -13,13 +89,81 @@ class OctadSError(BaseDeviceError):
 
 
 # Model 3390 Arbitrary Waveform Generator (Keithley Instruments, Inc.)
-# NOTE: TBD
 class Model3390AWGError(BaseDeviceError):
     """Error class for "Model 3390 Arbitrary Waveform Generator".
 
     This class is based on "maodevice.core.BaseDeviceError".
+    The error is built from the entries of the error queue of the
+    device by "from_errors", whose class is chosen by the SCPI
+    error code of the first entry.
+
+    Args:
+        errors (list): Entries of the error queue
+            (see "maodevice.scpi.ScpiError").
+
+    Attributes:
+        CODES (range or None): SCPI error codes of the class.
+        errors (list): Entries of the error queue.
+        code (int or None): Error code of the first entry.
     """
-    pass
+    CODES = None
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.code = self.errors[0].code if self.errors else None
+        super().__init__(
+            "; ".join(f"{e.code},\"{e.message}\"" for e in self.errors)
+        )
+
+    @classmethod
+    def from_errors(cls, errors):
+        """Build the error of the class of the first entry.
+
+        Args:
+            errors (list): Entries of the error queue.
+
+        Return:
+            error (Model3390AWGError): The error.
+        """
+        code = errors[0].code
+        for subclass in cls.__subclasses__():
+            if subclass.CODES is not None and code in subclass.CODES:
+                return subclass(errors)
+        return Model3390AWGDeviceError(errors)
+
+
+class Model3390AWGCommandError(Model3390AWGError):
+    """Command error (-100 to -199) of "Model 3390".
+
+    The command was not understood, e.g. a syntax error.
+    """
+    CODES = range(-199, -99)
+
+
+class Model3390AWGExecutionError(Model3390AWGError):
+    """Execution error (-200 to -299) of "Model 3390".
+
+    The command was understood but could not be executed,
+    e.g. a value out of range.
+    """
+    CODES = range(-299, -199)
+
+
+class Model3390AWGDeviceError(Model3390AWGError):
+    """Device-specific error (-300 to -399 and positive) of "Model 3390".
+
+    The device failed an operation, e.g. a self-test or
+    a calibration.
+    """
+    CODES = range(-399, -299)
+
+
+class Model3390AWGQueryError(Model3390AWGError):
+    """Query error (-400 to -499) of "Model 3390".
+
+    A reply was not read properly, e.g. interrupted or unterminated.
+    """
+    CODES = range(-499, -399)
 
 
 # RFLL-20-H (Optilab, LLC.)
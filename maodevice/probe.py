@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""Probe devices once per identity and cache the results.
+
+A device handler declares the method which identifies the device
+("IDENTITY", e.g. "*IDN?" with the serial number and the firmware
+version) and the methods which probe its capabilities ("PROBES").
+The reply of the identity method is parsed by "parse_identity" of the
+handler, which drops the values changing at every query.
+The probes are executed only when the identity is not in the cache
+file, so that a script needs one identification round trip at the
+connection::
+
+    awg = Model3390AWG(SerialCom("/dev/ttyUSB0"))
+    awg.probe(name="awg")
+    awg.capabilities["query_scpi_version"]
+
+An entry is invalidated when the identity of the named device changes
+(e.g. by a firmware update) or the probes of the handler change.
+"""
+__all__ = [
+    "DEFAULT_PROBE_CACHE",
+    "ProbeCache",
+    "ProbeResult",
+    "probe",
+]
+
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+from maodevice.utils.serialize import decode, encode
+
+
+DEFAULT_PROBE_CACHE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME")
+    or os.path.join(os.path.expanduser("~"), ".cache"),
+    "maodevice", "probes.json",
+)
+
+ProbeResult = namedtuple("ProbeResult", ["key", "identity", "results",
+                                         "cached"])
+ProbeResult.__doc__ = """Result of a probe of a device.
+
+Attributes:
+    key (str): Key of the entry in the cache.
+    identity (str): Identity of the device.
+    results (dict): Correspondance dict of the probe methods and
+        their return values.
+    cached (bool): True if the results were read from the cache.
+"""
+
+
+class ProbeCache(object):
+    """Cache file of the probes of devices.
+
+    The file is a JSON object of "entries" (keyed by the class of the
+    handler and the identity) and "devices" (names of devices and the
+    keys of their current entries).
+
+    Args:
+        path (str or None): Path of the cache file. Defaults to None
+            ("$XDG_CACHE_HOME/maodevice/probes.json", or
+            "~/.cache/maodevice/probes.json").
+    """
+    def __init__(self, path=None):
+        self.path = path or DEFAULT_PROBE_CACHE
+        self._lock = threading.Lock()
+        self._data = None
+
+    def _load(self):
+        if self._data is None:
+            try:
+                with open(self.path) as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+            self._data.setdefault("entries", {})
+            self._data.setdefault("devices", {})
+        return self._data
+
+    def _save(self):
+        """Write the cache file.
+
+        Note:
+            This method is only for the internal use.
+            The file is written to a temporary file and renamed.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp, "w") as f:
+            json.dump(self._data, f, indent=2, sort_keys=True)
+        os.replace(temp, self.path)
+
+    def get(self, key):
+        """Get an entry.
+
+        Args:
+            key (str): Key of the entry.
+
+        Return:
+            entry (dict or None): The entry of "identity", "probes",
+                "results" and "time", or None if not cached.
+        """
+        with self._lock:
+            entry = self._load()["entries"].get(key)
+        if entry is None:
+            return None
+        return dict(entry, results=decode(entry["results"]))
+
+    def put(self, key, identity, results, name=None):
+        """Store an entry.
+
+        Args:
+            key (str): Key of the entry.
+            identity (str): Identity of the device.
+            results (dict): Results of the probes.
+            name (str or None): Name of the device. If the device had
+                another entry, the entry is removed. Defaults to None.
+
+        Return:
+            None
+        """
+        with self._lock:
+            data = self._load()
+            data["entries"][key] = {
+                "identity": identity,
+                "probes": sorted(results),
+                "results": encode(results),
+                "time": time.time(),
+            }
+            if name is not None:
+                old = data["devices"].get(name)
+                if old is not None and old != key:
+                    data["entries"].pop(old, None)
+                data["devices"][name] = key
+            self._save()
+        return
+
+    def invalidate(self, key=None, name=None):
+        """Remove an entry by its key or the name of the device.
+
+        Args:
+            key (str or None): Key of the entry. Defaults to None.
+            name (str or None): Name of the device. Defaults to None.
+
+        Return:
+            None
+        """
+        with self._lock:
+            data = self._load()
+            if name is not None:
+                key = data["devices"].pop(name, key)
+            if key is not None:
+                data["entries"].pop(key, None)
+            self._save()
+        return
+
+    def reload(self):
+        """Read the cache file again at the next access.
+
+        Return:
+            None
+        """
+        with self._lock:
+            self._data = None
+        return
+
+
+def probe(handler, cache=None, name=None, refresh=False):
+    """Probe a device, reading the results from the cache if possible.
+
+    Args:
+        handler (maodevice.core.BaseDeviceHandler): The device handler,
+            which has "IDENTITY" and "PROBES".
+        cache (ProbeCache or None): The cache. Defaults to None
+            (the default cache file).
+        name (str or None): Name of the device, with which the entry of
+            an older identity is removed. Defaults to None.
+        refresh (bool): Execute the probes even if they are cached.
+            Defaults to False.
+
+    Return:
+        result (ProbeResult): The result, whose "results" is also set
+            to "capabilities" of the handler.
+    """
+    assert handler.IDENTITY is not None, \
+        f"{type(handler).__name__}: the identity method is not defined."
+
+    cache = cache or ProbeCache()
+    identity = handler.parse_identity(getattr(handler, handler.IDENTITY)())
+    key = f"{type(handler).__name__}:{identity}"
+    probes = [p for p in handler.PROBES if p != handler.IDENTITY]
+
+    entry = None if refresh else cache.get(key)
+    if entry is not None \
+            and entry["probes"] == sorted(probes + [handler.IDENTITY]):
+        handler.capabilities = entry["results"]
+        return ProbeResult(key, identity, entry["results"], True)
+
+    results = {handler.IDENTITY: identity}
+    for method in probes:
+        results[method] = getattr(handler, method)()
+    cache.put(key, identity, results, name)
+    handler.capabilities = results
+    return ProbeResult(key, identity, results, False)
@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""Execute commands of devices at given times.
+
+Entries of (UTC time, device, command) are kept in a heap, so that
+an observation sequence of many entries is planned in advance cheaply.
+The runner sleeps until shortly before the next entry and busy-waits
+for the last stretch, so that the command is sent with sub-millisecond
+accuracy. The actual send time of each entry is recorded for audit::
+
+    scheduler = CommandScheduler()
+    scheduler.schedule(t0, octad, "start_correlation", "20201224123456")
+    scheduler.schedule(t0 + 3600, octad, "stop_correlation")
+    scheduler.start()
+"""
+__all__ = [
+    "CommandScheduler",
+    "Execution",
+    "to_timestamp",
+]
+
+import heapq
+import itertools
+import json
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import datetime, timezone
+
+
+Execution = namedtuple(
+    "Execution",
+    ["seq", "device", "command", "scheduled", "sent", "done", "value",
+     "error"],
+)
+Execution.__doc__ = """Audit record of an executed entry.
+
+Attributes:
+    seq (int): Sequence number of the entry.
+    device (str): Name of the device.
+    command (str): Name of the command.
+    scheduled (float): Scheduled UNIX time (sec).
+    sent (float): UNIX time when the command was called (sec).
+    done (float): UNIX time when the command returned (sec).
+    value: Return value of the command (None if failed or skipped).
+    error (str or None): Error of the command, or "skipped" if
+        it was later than "max_lateness".
+"""
+
+
+def to_timestamp(when):
+    """Convert a time to the UNIX time.
+
+    Args:
+        when (float or datetime.datetime): UNIX time, or datetime
+            (regarded as UTC if it has no timezone).
+
+    Return:
+        ret (float): The UNIX time (sec).
+    """
+    if isinstance(when, datetime):
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return when.timestamp()
+    return float(when)
+
+
+class CommandScheduler(object):
+    """Time-scheduled queue of commands of devices.
+
+    Args:
+        spin (float): Time to busy-wait before each entry (sec).
+            Defaults to 0.002.
+        max_lateness (float or None): Entries later than this are
+            skipped (sec). Defaults to None (always executed).
+        audit_size (int): Number of audit records kept.
+            Defaults to 100000.
+
+    Attributes:
+        audit (collections.deque): Audit records ("Execution").
+    """
+    def __init__(self, spin=0.002, max_lateness=None, audit_size=100000):
+        assert spin >= 0, "spin: expected to be non-negative."
+
+        self.spin = spin
+        self.max_lateness = max_lateness
+        self.audit = deque(maxlen=audit_size)
+        self._heap = []
+        self._cancelled = set()
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        with self._cond:
+            return len(self._heap) - len(self._cancelled)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def next_time(self):
+        """float or None: UNIX time of the next entry."""
+        with self._cond:
+            self._drop_cancelled()
+            return self._heap[0][0] if self._heap else None
+
+    def schedule(self, when, device, command, *args, **kwargs):
+        """Schedule a command of a device.
+
+        Args:
+            when (float or datetime.datetime): Time to send the command
+                (see "to_timestamp").
+            device (maodevice.core.BaseDeviceHandler): The device.
+            command (str or function): Name of the method, or function
+                which takes the device as the first argument.
+            *args: Positional arguments of the command.
+            **kwargs: Keyword arguments of the command.
+
+        Return:
+            seq (int): Sequence number of the entry.
+        """
+        return self.schedule_many([(when, device, command, args, kwargs)])[0]
+
+    def schedule_many(self, entries):
+        """Schedule several commands at once.
+
+        Args:
+            entries (list): Tuples of (when, device, command) or
+                (when, device, command, args, kwargs).
+
+        Return:
+            seqs (:obj:`list` of :obj:`int`): Sequence numbers of
+                the entries.
+        """
+        items = []
+        for entry in entries:
+            when, device, command, *rest = entry
+            args = tuple(rest[0]) if len(rest) > 0 else ()
+            kwargs = dict(rest[1]) if len(rest) > 1 else {}
+
+            assert callable(command) or callable(getattr(device, command)), \
+                f"command: '{command}' is not a method of the device."
+
+            seq = next(self._seq)
+            items.append(
+                (to_timestamp(when), seq, device, command, args, kwargs)
+            )
+
+        with self._cond:
+            if len(items) > len(self._heap):
+                self._heap.extend(items)
+                heapq.heapify(self._heap)
+            else:
+                for item in items:
+                    heapq.heappush(self._heap, item)
+            self._cond.notify()
+        return [item[1] for item in items]
+
+    def cancel(self, seq):
+        """Cancel an entry.
+
+        Args:
+            seq (int): Sequence number of the entry.
+
+        Return:
+            None
+        """
+        with self._cond:
+            if any(item[1] == seq for item in self._heap):
+                self._cancelled.add(seq)
+            self._cond.notify()
+        return
+
+    def clear(self):
+        """Cancel all the entries.
+
+        Return:
+            None
+        """
+        with self._cond:
+            self._heap.clear()
+            self._cancelled.clear()
+            self._cond.notify()
+        return
+
+    def _drop_cancelled(self):
+        while self._heap and self._heap[0][1] in self._cancelled:
+            self._cancelled.discard(heapq.heappop(self._heap)[1])
+
+    def _next(self, stop):
+        """Wait until shortly before the next entry.
+
+        Note:
+            This method is only for the internal use.
+
+        Return:
+            item (tuple or None): The entry, or None if stopped or
+                no entry is left and "stop" is None.
+        """
+        with self._cond:
+            while True:
+                if stop is not None and stop.is_set():
+                    return None
+                self._drop_cancelled()
+                if not self._heap:
+                    if stop is None:
+                        return None
+                    self._cond.wait()
+                    continue
+                delay = self._heap[0][0] - time.time() - self.spin
+                if delay <= 0:
+                    return heapq.heappop(self._heap)
+                self._cond.wait(delay)
+
+    def _execute(self, item):
+        """Busy-wait until the scheduled time and execute an entry.
+
+        Note:
+            This method is only for the internal use.
+
+        Return:
+            record (Execution): The audit record.
+        """
+        when, seq, device, command, args, kwargs = item
+        # The spin is bounded by the monotonic clock in case the wall
+        # clock steps backwards.
+        limit = time.perf_counter() + self.spin
+        while time.time() < when and time.perf_counter() < limit:
+            pass
+
+        sent = time.time()
+        name = getattr(command, "__name__", command)
+        device_name = type(device).__name__
+        if self.max_lateness is not None \
+                and sent - when > self.max_lateness:
+            record = Execution(
+                seq, device_name, name, when, sent, sent, None, "skipped"
+            )
+        else:
+            func = getattr(device, command) if isinstance(command, str) \
+                else (lambda *a, **k: command(device, *a, **k))
+            try:
+                value, error = func(*args, **kwargs), None
+            except Exception as err:
+                value, error = None, f"{type(err).__name__}: {err}"
+            record = Execution(
+                seq, device_name, name, when, sent, time.time(), value, error
+            )
+        self.audit.append(record)
+        return record
+
+    def run(self, stop=None):
+        """Execute the entries in order of their times.
+
+        Args:
+            stop (threading.Event or None): Event to stop the runner.
+                Defaults to None (return when no entry is left).
+
+        Return:
+            None
+        """
+        while True:
+            item = self._next(stop)
+            if item is None:
+                return
+            self._execute(item)
+
+    def start(self):
+        """Execute the entries in a background thread.
+
+        Return:
+            None
+        """
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self.run,
+                args=(self._stop,),
+                name="command-scheduler",
+                daemon=True,
+            )
+            self._thread.start()
+        return
+
+    def stop(self):
+        """Stop the background thread.
+
+        Note:
+            The entries which are not executed yet are kept.
+
+        Return:
+            None
+        """
+        if self._thread is not None:
+            self._stop.set()
+            with self._cond:
+                self._cond.notify()
+            self._thread.join()
+            self._thread = None
+        return
+
+    def lateness(self):
+        """Lateness of the executed entries.
+
+        Return:
+            ret (dict): "count", "mean" and "max" of the differences
+                between the send times and the scheduled times (sec).
+        """
+        late = [r.sent - r.scheduled for r in self.audit]
+        if not late:
+            return {"count": 0, "mean": 0., "max": 0.}
+        return {
+            "count": len(late),
+            "mean": sum(late) / len(late),
+            "max": max(late),
+        }
+
+    def dump_audit(self, path):
+        """Write the audit records to a file of JSON lines.
+
+        Args:
+            path (str): Path of the file, which is appended.
+
+        Return:
+            None
+        """
+        with open(path, "a") as f:
+            for record in list(self.audit):
+                row = record._asdict()
+                row["value"] = repr(row["value"])
+                f.write(json.dumps(row) + "\n")
+        return
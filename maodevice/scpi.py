@@ -1,4 +1,10 @@
 # -*- coding: utf-8 -*-
+import re
+import socket
+import threading
+import time
+from collections import deque, namedtuple
+
 from maodevice.core import BaseDeviceHandler
 
 
@@ -222,7 +228,7 @@ class ScpiCommonCommands(BaseDeviceHandler):
         """
         ret = self.com.query("*ESE?")
         return ret
-    
+
     def standard_event_status_register_query(self):
         """ESR?: Standard Event Status Register query
 
@@ -273,7 +279,7 @@ class ScpiCommonCommands(BaseDeviceHandler):
         """
         ret = self.com.query("*LRN?")
         return ret
- 
+
     def operation_complete_query(self):
         """OPC?: Operation Complete query
 
@@ -365,7 +371,10 @@ class ScpiHandler(BaseDeviceHandler):
     Attribute:
         enable_cmds (:obj:`list` of :obj:`str`):
             IEEE-488.2 common commands to use.
+        IDENTITY (str): Name of the method which identifies the device
+            ("*IDN?"), used by "probe".
     """
+    IDENTITY = "identification_query"
     enable_cmds = ["*CLS", "*ESE", "*OPC", "*PSC", "*RCL",
                    "*RST", "*SAV", "*SRE", "*TRG", "*WAI",
                    "*ESE?", "*ESR?", "*IDN?", "*LRN?",
@@ -396,4 +405,168 @@ class ScpiHandler(BaseDeviceHandler):
             fix_cmd = cmd.replace("*", "").replace("?", "Q")
             self.__setattr__(fix_cmd, self.__getattribute__(verbose_cmd))
 
-        return
\ No newline at end of file
+        return
+
+
+def ieee_block(data):
+    """Encode bytes to an IEEE-488.2 definite length arbitrary block.
+
+    The block is "#", the number of digits of the length, the length
+    and the bytes, e.g. b"#15hello" for b"hello".
+
+    Args:
+        data (bytes-like): Bytes to encode.
+
+    Return:
+        ret (bytes): The block.
+    """
+    data = bytes(data)
+    length = str(len(data))
+
+    assert len(length) <= 9, "data: expected to be less than 1 GB."
+
+    return f"#{len(length)}{length}".encode() + data
+
+
+def parse_ieee_block(raw):
+    """Decode an IEEE-488.2 definite length arbitrary block.
+
+    Args:
+        raw (bytes-like): The block, which may be followed by
+            the termination character.
+
+    Return:
+        ret (bytes): The bytes in the block.
+    """
+    raw = bytes(raw)
+    start = raw.index(b"#")
+    n_digits = int(raw[start + 1:start + 2])
+
+    assert n_digits > 0, "raw: indefinite length blocks are not supported."
+
+    head = start + 2 + n_digits
+    length = int(raw[start + 2:head])
+    return raw[head:head + length]
+
+
+ScpiError = namedtuple("ScpiError", ["time", "code", "message"])
+ScpiError.__doc__ = """Entry of the error queue of a SCPI device.
+
+Attributes:
+    time (float): UNIX time when the entry was read.
+    code (int): SCPI error code (0 is no error).
+    message (str): Error message.
+"""
+
+_ERROR = re.compile(rb'([-+]?\d+)\s*,\s*"((?:[^"]|"")*)"')
+
+
+def parse_errors(raw, t=None):
+    """Parse replies of "SYST:ERR?".
+
+    Args:
+        raw (bytes): Replies separated by ";".
+        t (float or None): Time of the entries.
+            Defaults to None (now).
+
+    Return:
+        errors (:obj:`list` of :obj:`ScpiError`): Entries of the
+            replies in order, including no errors.
+    """
+    t = time.time() if t is None else t
+    return [
+        ScpiError(t, int(code), message.decode(errors="replace")
+                  .replace('""', '"'))
+        for code, message in _ERROR.findall(bytes(raw))
+    ]
+
+
+class ErrorQueue(object):
+    """Drain the error queue of a SCPI device.
+
+    "SYST:ERR?" is repeated "depth" times in one message, so that the
+    queue is drained by one exchange however many errors are queued.
+    If all the replies are errors, the exchange is repeated until
+    "No error" is read. The errors are kept in a log with the times.
+
+    Args:
+        com (maodevice.core.BaseCommunicator): Communicator of the device.
+        depth (int): Number of "SYST:ERR?" in a message, which should be
+            the depth of the error queue of the device. Defaults to 20.
+        log_size (int): Number of errors in the log. Defaults to 1024.
+        clock (function): Function which returns the current time.
+            Defaults to time.time.
+
+    Attributes:
+        log (collections.deque): The latest errors (ScpiError).
+    """
+    def __init__(self, com, depth=20, log_size=1024, clock=time.time):
+        assert depth > 0, "depth: expected to be positive."
+
+        self.com = com
+        self.depth = depth
+        self.clock = clock
+        self.log = deque(maxlen=log_size)
+        self._lock = threading.Lock()
+        self._msg = ";:".join(["SYST:ERR?"] * depth)
+
+    def drain(self):
+        """Read all the errors in the queue of the device.
+
+        Return:
+            errors (:obj:`list` of :obj:`ScpiError`): The errors,
+                which are also added to the log.
+        """
+        errors = []
+        while True:
+            entries = parse_errors(self._query(), self.clock())
+            for entry in entries:
+                if entry.code == 0:
+                    break
+                errors.append(entry)
+            else:
+                if len(entries) == self.depth:
+                    continue
+            break
+
+        with self._lock:
+            self.log.extend(errors)
+        return errors
+
+    def _query(self):
+        """Query "SYST:ERR?" and read the whole reply.
+
+        Note:
+            This method is only for the internal use.
+            The reply of "depth" entries may be received in pieces or
+            be longer than one receive, so it is read until the
+            termination character.
+
+        Return:
+            raw (bytes): The reply.
+
+        Raises:
+            socket.timeout: If the reply is not terminated.
+        """
+        term = self.com.terminator.encode()
+        raw = bytes(self.com.query(self._msg))
+        while not raw.endswith(term):
+            chunk = self.com.recv()
+            if not chunk:
+                raise socket.timeout(
+                    f"incomplete reply of SYST:ERR?: {raw[-32:]!r}"
+                )
+            raw += chunk
+        return raw
+
+    def since(self, t):
+        """Errors in the log after a time.
+
+        Args:
+            t (float): UNIX time.
+
+        Return:
+            errors (:obj:`list` of :obj:`ScpiError`): The errors.
+        """
+        with self._lock:
+            return [e for e in self.log if e.time > t]
@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+"""Simulate devices on the local host.
+
+"DeviceSimulator" answers the messages of a command table over TCP,
+so that a handler is driven through its real communicator without the
+device. The messages are matched by "CommandTable.parse": a setter
+updates "state", a query is answered by "replies" (or a default value
+of the type of its reply), and a callback registered by "on" is
+called with the arguments, e.g. to start a VDIF stream when the
+destination is set::
+
+    octad = DeviceSimulator(octad_s.COMMANDS, ";")
+    sender = VdifSender(rate=1e9)
+    octad.on("set_vdif_destination_port",
+             lambda n, port: sender.start(("127.0.0.1", port), n))
+    octad.start()
+    handler = OctadS(SocketCom(*octad.address))
+
+"VdifSender" sends VDIF frames over UDP at a given bit rate.
+"""
+__all__ = [
+    "DeviceSimulator",
+    "VdifSender",
+]
+
+import socket
+import socketserver
+import struct
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from maodevice.correlator.vdif import HEADER_BYTES
+
+
+_DEFAULT_REPLIES = {int: "0", float: "0.0", bool: "0"}
+
+
+class _SimulatorHandler(socketserver.BaseRequestHandler):
+    """Answer the messages of a client connection.
+    """
+    def handle(self):
+        server = self.server
+        terminator = server.terminator.encode()
+        buffer = bytearray()
+        while not server.closed.is_set():
+            try:
+                chunk = self.request.recv(65536)
+            except OSError:
+                return
+            if not chunk:
+                return
+            buffer += chunk
+            while True:
+                end = buffer.find(terminator)
+                if end < 0:
+                    break
+                msg = bytes(buffer[:end]).decode(errors="replace")
+                del buffer[:end + len(terminator)]
+                reply = server.respond(msg.strip())
+                if server.delay:
+                    time.sleep(server.delay)
+                if reply is not None:
+                    try:
+                        self.request.sendall(reply + terminator)
+                    except OSError:
+                        return
+
+
+class DeviceSimulator(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Simulate a device which is controlled by a command table.
+
+    Args:
+        commands (maodevice.commands.CommandTable): Command table of
+            the device.
+        terminator (str): Termination character of the messages.
+        replies (dict or None): Correspondance dict of names of query
+            commands (or raw messages, e.g. "*IDN?") and their replies.
+            A reply is a string, or a function which takes the arguments
+            of the command and returns the string. Defaults to None.
+        separator (str or None): Separator of the messages in a compound
+            message, e.g. ";:" of SCPI. The replies of the messages are
+            joined by ";". Defaults to None (no compound messages).
+        delay (float): Processing time of a message (sec).
+            Defaults to 0.0.
+        address (tuple): Address (host, port) to bind.
+            Defaults to ("127.0.0.1", 0) (a free port).
+
+    Attributes:
+        state (dict): Correspondance dict of names of the setters and
+            their last arguments.
+        counts (collections.Counter): Numbers of the received messages
+            by the names of the commands ("unknown" if not matched).
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+            self,
+            commands,
+            terminator,
+            replies=None,
+            separator=None,
+            delay=0.,
+            address=("127.0.0.1", 0),
+    ):
+        self.commands = commands
+        self.terminator = terminator
+        self.replies = dict(replies or {})
+        self.separator = separator
+        self.delay = delay
+        self.state = {}
+        self.counts = Counter()
+        self.closed = threading.Event()
+        self._callbacks = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        super().__init__(address, _SimulatorHandler)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def address(self):
+        """tuple: Address (host, port) of the simulator."""
+        return self.server_address[:2]
+
+    def on(self, name, callback):
+        """Register a callback of a command.
+
+        Args:
+            name (str): Name of the command.
+            callback (function): Function which takes the arguments of
+                the command as keyword arguments.
+
+        Return:
+            None
+        """
+        self._callbacks.setdefault(name, []).append(callback)
+        return
+
+    def respond(self, msg):
+        """Process a message.
+
+        Args:
+            msg (str): A message without the termination character.
+
+        Return:
+            reply (bytes or None): The reply without the termination
+                character, or None if the message is not a query.
+        """
+        msgs = msg.split(self.separator) if self.separator else [msg]
+        replies = [r for r in map(self._respond, msgs) if r is not None]
+        if not replies:
+            return None
+        return ";".join(replies).encode()
+
+    def _respond(self, msg):
+        if msg in self.replies:
+            with self._lock:
+                self.counts[msg] += 1
+            return self._reply(self.replies[msg], {})
+
+        command, kwargs = self.commands.parse(msg)
+        if command is None:
+            with self._lock:
+                self.counts["unknown"] += 1
+            return None
+
+        with self._lock:
+            self.counts[command.name] += 1
+            if not command.is_query:
+                self.state[command.name] = kwargs
+        for callback in self._callbacks.get(command.name, []):
+            callback(**kwargs)
+        if not command.is_query:
+            return None
+        reply = self.replies.get(
+            command.name, _DEFAULT_REPLIES.get(command.reply.type, "")
+        )
+        return self._reply(reply, kwargs)
+
+    @staticmethod
+    def _reply(reply, kwargs):
+        return str(reply(**kwargs) if callable(reply) else reply)
+
+    def start(self):
+        """Serve in a background thread.
+
+        Return:
+            None
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.serve_forever,
+                kwargs={"poll_interval": 0.05},
+                name=f"simulator-{self.address[1]}",
+                daemon=True,
+            )
+            self._thread.start()
+        return
+
+    def stop(self):
+        """Stop serving and close the socket.
+
+        Return:
+            None
+        """
+        self.closed.set()
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+        return
+
+
+class VdifSender(object):
+    """Send VDIF frames over UDP at a given bit rate.
+
+    The frames have the headers of "OCTAD-S" (32-bit real samples, or
+    complex ones for thread 5) and a fixed random payload. The frames
+    are sent in bursts to keep up with the rate. If the sender falls
+    behind the rate by more than a second, the backlog is skipped.
+
+    Args:
+        rate (float): Bit rate of a stream including the headers
+            (bit/s).
+        frame_bytes (int): Bytes of a frame including the header.
+            Defaults to 8224.
+        station (int): Station ID. Defaults to 0.
+
+    Attributes:
+        frames_per_second (int): Frames per second of a stream.
+        stats (dict): Numbers of "sent" frames, "skipped" frames and
+            send "errors" of all the streams.
+    """
+    def __init__(self, rate, frame_bytes=8224, station=0):
+        assert rate > 0, "rate: expected to be positive."
+        assert frame_bytes % 8 == 0 and frame_bytes > HEADER_BYTES, \
+            f"frame_bytes: expected to be a multiple of 8 " \
+            f"larger than {HEADER_BYTES}."
+
+        self.rate = rate
+        self.frame_bytes = frame_bytes
+        self.station = station
+        self.frames_per_second = max(1, int(rate // (8 * frame_bytes)))
+        self.stats = {"sent": 0, "skipped": 0, "errors": 0}
+        self._payload = np.random.default_rng(0).standard_normal(
+            (frame_bytes - HEADER_BYTES) // 4
+        ).astype(">f4").tobytes()
+        self._lock = threading.Lock()
+        self._streams = {}
+
+    def frame(self, seconds, number, thread=1):
+        """Build a frame.
+
+        Args:
+            seconds (int): Seconds from the reference epoch.
+            number (int): Frame number within the second.
+            thread (int): Thread ID. Defaults to 1.
+
+        Return:
+            frame (bytes): The frame.
+        """
+        w3 = (31 << 26) | (thread << 16) | self.station
+        if thread == 5:
+            w3 |= 1 << 31
+        header = struct.pack(
+            "<8I", seconds & 0x3FFFFFFF, number & 0xFFFFFF,
+            self.frame_bytes // 8, w3, 0, 0, 0, 0,
+        )
+        return header + self._payload
+
+    def _count(self, **counts):
+        with self._lock:
+            for key, value in counts.items():
+                self.stats[key] += value
+
+    def run(self, address, thread=1, duration=None, stop=None):
+        """Send frames of a thread.
+
+        Args:
+            address (tuple): Destination address (host, port).
+            thread (int): Thread ID. Defaults to 1.
+            duration (float or None): Time to send (sec).
+                Defaults to None (until "stop" is set).
+            stop (threading.Event or None): Event to stop sending.
+                Defaults to None.
+
+        Return:
+            None
+        """
+        fps = self.frames_per_second
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        frame = bytearray(self.frame(0, 0, thread))
+        view = memoryview(frame)
+        start = time.perf_counter()
+        end = None if duration is None else start + duration
+        done = 0
+        try:
+            while stop is None or not stop.is_set():
+                now = time.perf_counter()
+                if end is not None and now >= end:
+                    return
+                due = int((now - start) * fps)
+                if due - done > fps:
+                    self._count(skipped=due - done - fps)
+                    done = due - fps
+                if due <= done:
+                    time.sleep(0.0005)
+                    continue
+                sent = errors = 0
+                for index in range(done, due):
+                    struct.pack_into("<2I", frame, 0, *divmod(index, fps))
+                    try:
+                        sock.sendto(view, address)
+                        sent += 1
+                    except OSError:
+                        errors += 1
+                done = due
+                self._count(sent=sent, errors=errors)
+        finally:
+            sock.close()
+
+    def start(self, address, thread=1):
+        """Send frames of a thread in a background thread.
+
+        Note:
+            A running stream of the same thread ID is redirected to
+            the new address.
+
+        Args:
+            address (tuple): Destination address (host, port).
+            thread (int): Thread ID. Defaults to 1.
+
+        Return:
+            None
+        """
+        self.stop(thread)
+        stop = threading.Event()
+        worker = threading.Thread(
+            target=self.run,
+            args=(tuple(address), thread, None, stop),
+            name=f"vdif-{thread}",
+            daemon=True,
+        )
+        worker.start()
+        self._streams[thread] = (stop, worker)
+        return
+
+    def stop(self, thread=None):
+        """Stop streams.
+
+        Args:
+            thread (int or None): Thread ID.
+                Defaults to None (all the streams).
+
+        Return:
+            None
+        """
+        threads = list(self._streams) if thread is None else [thread]
+        for key in threads:
+            stream = self._streams.pop(key, None)
+            if stream is not None:
+                stream[0].set()
+                stream[1].join()
+        return
@@ -1,6 +1,21 @@
 # -*- coding: utf-8 -*-
-from .rfll_20_h import *
-from .model3390_awg import Model3390AWG
+from maodevice.utils.lazy import lazy_loader
 
-del rfll_20_h
-del model3390_awg
+__all__ = [
+    "Md20M",
+    "Lta20Q",
+    "Pd30M",
+    "Model3390AWG",
+    "WaveformCache",
+]
+
+__getattr__, __dir__ = lazy_loader(
+    __name__,
+    attributes={
+        "Md20M": ".rfll_20_h",
+        "Lta20Q": ".rfll_20_h",
+        "Pd30M": ".rfll_20_h",
+        "Model3390AWG": ".model3390_awg",
+        "WaveformCache": ".waveform",
+    },
+)
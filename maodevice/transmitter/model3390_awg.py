@@ -1,76 +1,212 @@
 # -*- coding: utf-8 -*-
-from maodevice.scpi import ScpiHandler
+import numpy as np
+
+from maodevice.commands import Argument, Command, CommandTable, Reply
+from maodevice.core import unvalidated
+from maodevice.exceptions import Model3390AWGError
+from maodevice.scpi import ErrorQueue, ScpiHandler, ieee_block
+from maodevice.transmitter.waveform import digest
 from maodevice.validators import Model3390AWGValidator
 
 
+COMMANDS = CommandTable([
+    Command(
+        "set_function", "FUNC {func}",
+        [Argument("func", str, "Function of the signal.")],
+        doc="Set function of the signal.",
+    ),
+    Command(
+        "query_function", "FUNC?",
+        reply=Reply(str, "Function of the signal."),
+        doc="Query the function of the signal.",
+    ),
+    Command(
+        "select_user_waveform", "FUNC:USER {name}",
+        [Argument("name", str, "Name of the arbitrary waveform.",
+                  default="VOLATILE")],
+        doc="Select the arbitrary waveform output by \"FUNC USER\".",
+    ),
+    Command(
+        "set_frequency", "FREQ {freq}",
+        [Argument("freq", float, "Value of the frequency.", unit="Hz")],
+        doc="Set frequency of the signal.",
+    ),
+    Command(
+        "query_frequency", "FREQ?",
+        reply=Reply(float, "The frequency value.", unit="Hz"),
+        doc="Query frequency of the signal.",
+    ),
+    Command(
+        "query_voltage", "VOLT?",
+        reply=Reply(float, "The voltage value in the specified unit."),
+        doc="Query voltage of the signal.",
+    ),
+    Command(
+        "set_dc_offset_voltage", "VOLT:OFFS {v_off}",
+        [Argument("v_off", float, "The DC offset voltage values.",
+                  unit="V")],
+        doc="Set DC offset voltage of the signal.",
+    ),
+    Command(
+        "query_offset_voltage", "VOLT:OFFS?",
+        reply=Reply(float, "The DC offset voltage value.", unit="V"),
+        doc="Query the DC offset voltage of the signal.",
+    ),
+    Command(
+        "set_waveform_polarity", "OUTP:POL {invert}",
+        [Argument("invert", bool, "If it is True,\n"
+                  "    the waveform polarity is specified inverted.",
+                  default=False, mapping={False: "NORM", True: "INV"})],
+        doc="Set the waveform polarity.",
+    ),
+    Command(
+        "query_waveform_polarity", "OUTP:POL?",
+        reply=Reply(str, "The waveform polarity."),
+        doc="Query waveform polarity.",
+    ),
+    Command(
+        "set_output_termination", "OUTP:LOAD {ohms}",
+        [Argument("ohms", None,
+                  "The output termination (ohm) or \"INF\".")],
+        doc="Set the output termination.",
+    ),
+    Command(
+        "query_scpi_version", "SYST:VERS?",
+        reply=Reply(str, "The SCPI version."),
+        doc="Query the SCPI version with which the device complies.",
+    ),
+    Command("enable_output", "OUTP ON", doc="Enables the RF output."),
+    Command("disable_output", "OUTP OFF", doc="Disable the RF output."),
+    Command(
+        "enable_synchronize", "OUTP:SYNC ON",
+        doc="Enable synchronization.",
+    ),
+    Command(
+        "disable_synchronize", "OUTP:SYNC OFF",
+        doc="Disable synchronization.",
+    ),
+])
+
+
 class Model3390AWG(ScpiHandler, metaclass=Model3390AWGValidator):
     """Control "Model 3390 Arbitrary Waveform Generator".
 
     Note:
-        This class is based on "maodevice.scpi.ScpiHandler".
+        - This class is based on "maodevice.scpi.ScpiHandler".
+        - The methods of the single commands are generated
+          from "COMMANDS".
+        - The error queue is drained after every setter, and after
+          queries at the rate of "validation_policy.queries".
+          Errors are raised as "maodevice.exceptions.Model3390AWGError".
 
     Attributes:
         MANUFACTURER (str): Manufacturer of the device.
         PRODUCT_NAME (str): Name of the device.
         CLASSIFICATION (str): Classification of the device.
+        COMMANDS (maodevice.commands.CommandTable):
+            Command table of the device.
         enable_cmds (:obj:`list` of :obj:`str`):
             IEEE-488.2 common commands to use.
+        MAX_POINTS (int): Maximum number of points of
+            an arbitrary waveform.
+        ERROR_QUEUE_DEPTH (int): Depth of the error queue.
+        PROBES (tuple of str): Methods whose results are cached
+            once per "*IDN?" by "probe".
+        error_queue (maodevice.scpi.ErrorQueue): Error queue of the
+            device, whose "log" keeps the errors with the times.
+        uploaded (dict): Correspondance dict of names of arbitrary
+            waveforms and digests of the uploaded codes.
     """
     MANUFACTURER = "Keithley"
     PRODUCT_NAME = "Model 3390 Arbitrary Waveform Generator"
     CLASSIFICATION = "Function generator"
+    COMMANDS = COMMANDS
 
     enable_cmds = ["*CLS", "*ESE", "*OPC", "*PSC", "*RCL",
                    "*RST", "*SAV", "*SRE", "*TRG", "*WAI",
                    "*ESE?", "*ESR?", "*IDN?", "*LRN?",
                    "*OPC?", "*PSC?", "*SRE?", "*STB?", "*TST?"]
 
+    MAX_POINTS = 262144
+    ERROR_QUEUE_DEPTH = 20
+    PROBES = ("query_scpi_version",)
+
     def __init__(self, com):
         super().__init__(com)
         self.com.set_terminator("\n")
+        self.uploaded = {}
+        self.error_queue = ErrorQueue(self.com, depth=self.ERROR_QUEUE_DEPTH)
 
-    def set_function(self, func):
-        """Set function of the signal.
-
-        Args:
-            func (str): Function of the signal.
-
-        Return:
-            None
-        """
-        self.com.send(f"FUNC {func}")
-        return
+    @unvalidated
+    def upload_waveform(self, codes, name="VOLATILE"):
+        """Upload an arbitrary waveform as DAC codes.
 
-    def query_function(self):
-        """Query the function of the signal.
+        The codes are sent as a binary block to the volatile memory
+        and copied to the non-volatile one of the given name.
+        The uploaded codes are tracked by their digests, and
+        an identical waveform is not sent again.
 
-        Return:
-            ret (bytes): Function of the signal.
-        """
-        ret = self.com.query('FUNC?')
-        return ret
+        Note:
+            - Call "forget_uploads" after the device is reset or
+              the waveforms are changed by others.
+            - The error queue is drained before the digests are
+              recorded, so that a rejected waveform is sent again.
 
-    def set_frequency(self, freq):
-        """Set frequency of the signal.
+        Args:
+            codes (numpy.ndarray): DAC codes from -8191 to 8191
+                (see "maodevice.transmitter.waveform.to_dac").
+            name (str): Name of the waveform. (Default: 'VOLATILE')
+
+        Return:
+            ret (bool): False if the waveform was already uploaded.
+        """
+        codes = np.asarray(codes)
+
+        assert codes.ndim == 1 and 1 < len(codes) <= self.MAX_POINTS, \
+            f"codes: expected to have 2 to {self.MAX_POINTS} points."
+        assert np.issubdtype(codes.dtype, np.integer) \
+            and np.all(np.abs(codes) <= 8191), \
+            "codes: expected to be integers from -8191 to 8191."
+
+        key = digest(codes.astype(np.int16, copy=False))
+        if self.uploaded.get(name) == key:
+            return False
+
+        self.uploaded.pop(name, None)
+        if self.uploaded.pop("VOLATILE", None) != key:
+            block = ieee_block(codes.astype("<i2").tobytes())
+            self.com.send_raw(
+                b"FORM:BORD SWAP;:DATA:DAC VOLATILE, " + block
+            )
+        if name != "VOLATILE":
+            self.com.send(f"DATA:COPY {name}, VOLATILE")
+
+        policy = self.validation_policy
+        if policy is None or policy.should_validate("setter"):
+            errors = self.error_queue.drain()
+            if errors:
+                raise Model3390AWGError.from_errors(errors)
+        self.uploaded["VOLATILE"] = key
+        self.uploaded[name] = key
+        return True
+
+    @unvalidated
+    def forget_uploads(self, name=None):
+        """Forget the tracked uploads.
 
         Args:
-            freq (float): Value of the frequency.
+            name (str or None): Name of the waveform.
+                Defaults to None (all the waveforms).
 
         Return:
             None
         """
-        self.com.send(f"FREQ {freq}")
+        if name is None:
+            self.uploaded.clear()
+        else:
+            self.uploaded.pop(name, None)
         return
 
-    def query_frequency(self):
-        """Query frequency of the signal.
-
-        Return:
-            ret (bytes): The frequency value in Hz.
-        """
-        ret = self.com.query('FREQ?')
-        return ret
-
     def set_voltage(self, volt, unit="dBm"):
         """Set voltage of the signal.
 
@@ -85,36 +221,6 @@ class Model3390AWG(ScpiHandler, metaclass=Model3390AWGValidator):
         self.com.send(f"VOLT {volt}")
         return
 
-    def query_voltage(self):
-        """Query voltage of the signal.
-
-        Return:
-            ret (float): The voltage value in the specified unit.
-        """
-        ret = self.com.query('VOLT?')
-        return ret
-
-    def set_dc_offset_voltage(self, v_off):
-        """Set DC offset voltage of the signal.
-
-        Args:
-            v_off (float): The DC offset voltage values.
-
-        Return:
-            None
-        """
-        self.com.send(f"VOLT:OFFS {v_off}")
-        return
-
-    def query_offset_voltage(self):
-        """Query the DC offset voltage of the signal.
-
-        Return:
-            ret (float): The DC offset voltage value.
-        """
-        ret = self.com.query('VOLT:OFFS?')
-        return ret
-
     def set_pulse_high_low_levels(self, v_hi, v_low):
         """Set pulse high and low levels.
 
@@ -141,68 +247,3 @@ class Model3390AWG(ScpiHandler, metaclass=Model3390AWGValidator):
         _v_low = self.com.readline()
         ret = {'HIGH': float(_v_hi), 'LOW': float(_v_low)}
         return ret
-
-    def set_waveform_polarity(self, invert=False):
-        """Set the waveform polarity.
-
-        Args:
-            invert (bool): If it is True,
-                the waveform polarity is specified inverted.
-
-        Return:
-            None
-        """
-        _polarity = 'NORM' if not invert else 'INV'
-        self.com.send(f'OUTP:POL {_polarity}')
-        return
-
-    def query_waveform_polarity(self):
-        """Query waveform polarity.
-
-        Return:
-            ret (str): The waveform polarity.
-        """
-        ret = self.com.query('OUTP:POL?')
-        return ret
-
-    def set_output_termination(self, ohms):
-        """Set the output termination.
-        """
-        self.com.send(f"OUTP:LOAD {ohms}")
-        return
-
-    def enable_output(self):
-        """Enables the RF output.
-
-        Return:
-            None
-        """
-        self.com.send('OUTP ON')
-        return
-
-    def disable_output(self):
-        """Disable the RF output.
-
-        Return:
-            None
-        """
-        self.com.send('OUTP OFF')
-        return
-
-    def enable_synchronize(self):
-        """Enable synchronization.
-
-        Return:
-            None
-        """
-        self.com.send('OUTP:SYNC ON')
-        return
-
-    def disable_synchronize(self):
-        """Disable synchronization.
-
-        Return:
-            None
-        """
-        self.com.send('OUTP:SYNC OFF')
-        return
\ No newline at end of file
@@ -6,10 +6,57 @@ __all__ = [
 ]
 
 
+from maodevice.commands import Argument, Command, CommandTable, Reply
 from maodevice.core import BaseDeviceHandler
 from maodevice.validators import Rfll20HValidator
 
 
+MD_20_M_COMMANDS = CommandTable([
+    Command(
+        "set_vadj", "SETADJ:{vadj}",
+        [Argument("vadj", float,
+                  "The voltage which controls the duty cycle.",
+                  range=(0.01, 4.99), step=0.01, unit="V")],
+        doc="Set the voltage which controls the duty cycle.",
+    ),
+    Command(
+        "set_vbias", "SETBIAS:{vbias}",
+        [Argument("vbias", float,
+                  "The voltage of the output DC voltage.",
+                  range=(0.01, 9.99), step=0.01, unit="V")],
+        doc="Set the voltage of the output DC voltage.",
+    ),
+    Command(
+        "set_vgain", "SETGAIN:{vgain}",
+        [Argument("vgain", float,
+                  "The voltage which controls the RF gain.",
+                  range=(1.00, 8.50), step=0.01, unit="V")],
+        doc="Set the voltage which controls the RF gain.",
+    ),
+    Command(
+        "show_status", "READ",
+        reply=Reply(str, 'Status of "MD-20-M".', byte=1024),
+        doc='Show the status of "MD-20-M".',
+    ),
+])
+
+LTA_20_Q_COMMANDS = CommandTable([
+    Command(
+        "show_status", "READ",
+        reply=Reply(str, 'Status of "LTA-20-Q".', byte=1024),
+        doc='Show status of "LTA-20-Q".',
+    ),
+])
+
+PD_30_M_COMMANDS = CommandTable([
+    Command(
+        "show_status", "READP",
+        reply=Reply(str, 'Status of "PD-30-M".'),
+        doc='Show status of "PD-30-M".',
+    ),
+])
+
+
 class Md20M(BaseDeviceHandler, metaclass=Rfll20HValidator):
     """Control "MD-20-M".
 
@@ -28,69 +75,18 @@ class Md20M(BaseDeviceHandler, metaclass=Rfll20HValidator):
         MANUFACTURER (str): Manufacturer of the device.
         PRODUCT_NAME (str): Name of the device.
         CLASSIFICATION (str): Classification of the device.
+        COMMANDS (maodevice.commands.CommandTable):
+            Command table of the device.
     """
     MANUFACTURER = "Optilab"
     PRODUCT_NAME = "MD-20-M"
     CLASSIFICATION = "Modulator Driver"
+    COMMANDS = MD_20_M_COMMANDS
 
     def __init__(self, com):
         super().__init__(com)
         self.com.set_terminator("\r\n")
 
-    def set_vadj(self, vadj):
-        """Set the voltage which controls the duty cycle.
-
-        Note:
-            The setting range is 0.01 - 4.99.
-
-        Args:
-            vadj (float): The voltage which controls the duty cycle.
-
-        Return:
-            None
-        """
-        self.com.send(f"SETADJ:{vadj}")
-        return
-
-    def set_vbias(self, vbias):
-        """Set the voltage of the output DC voltage.
-
-        Note:
-            The setting range is 0.01 - 9.99.
-
-        Args:
-            vbias (float): The voltage of the output DC voltage.
-
-        Return:
-            None
-        """
-        self.com.send(f"SETBIAS:{vbias}")
-        return
-
-    def set_vgain(self, vgain):
-        """Set the voltage which controls the RF gain.
-
-        Note:
-            The setting range is 1.00 - 8.50.
-
-        Args:
-            vgain (float): The voltage which controls the RF gain.
-
-        Return:
-            None
-        """
-        self.com.send(f"SETGAIN:{vgain}")
-        return
-
-    def show_status(self):
-        """Show the status fo "MD-20-M".
-
-        Return:
-            ret (bytes): Status of "MD-20-M"
-        """
-        ret = self.com.query(msg="READ", byte=1024)
-        return ret
-
 
 class Lta20Q(BaseDeviceHandler, metaclass=Rfll20HValidator):
     """Control "LTA-20-Q".
@@ -110,24 +106,18 @@ class Lta20Q(BaseDeviceHandler, metaclass=Rfll20HValidator):
         MANUFACTURER (str): Manufacturer of the device.
         PRODUCT_NAME (str): Name of the device.
         CLASSIFICATION (str): Classification of the device.
+        COMMANDS (maodevice.commands.CommandTable):
+            Command table of the device.
     """
     MANUFACTURER = "Optilab"
     PRODUCT_NAME = "LTA-20-Q"
     CLASSIFICATION = "E/O Converter"
+    COMMANDS = LTA_20_Q_COMMANDS
 
     def __init__(self, com):
         super().__init__(com)
         self.com.set_terminator("\r\n")
 
-    def show_status(self):
-        """Show status of "LTA-20-M".
-
-        Return:
-            ret (bytes): Status of "LTA-20-Q".
-        """
-        ret = self.com.query("READ", byte=1024)
-        return ret
-
 
 class Pd30M(BaseDeviceHandler, metaclass=Rfll20HValidator):
     """Control "PD-30-M".
@@ -147,20 +137,14 @@ class Pd30M(BaseDeviceHandler, metaclass=Rfll20HValidator):
         MANUFACTURER (str): Manufacturer of the device.
         PRODUCT_NAME (str): Name of the device.
         CLASSIFICATION (str): Classification of the device.
+        COMMANDS (maodevice.commands.CommandTable):
+            Command table of the device.
     """
     MANUFACTURER = "Optilab"
     PRODUCT_NAME = "PD-30-M"
     CLASSIFICATION = "O/E converter"
+    COMMANDS = PD_30_M_COMMANDS
 
     def __init__(self, com):
         super().__init__(com)
         self.com.set_terminator("\r\n")
-
-    def show_status(self):
-        """Show status of "PD-30-M".
-
-        Return:
-            ret (bytes): Status of "PD-30-M"
-        """
-        ret = self.com.query("READP")
-        return ret
\ No newline at end of file
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+"""Synthesize waveforms for arbitrary waveform generators.
+
+The generators return floating point waveforms within [-1, 1] of one
+period of the arbitrary waveform, where frequencies are given in cycles
+per buffer. "to_dac" converts them to the DAC codes, and
+"WaveformCache" keeps the DAC-ready buffers in memory and on disk,
+addressed by the parameters, so that the same waveform is synthesized
+only once.
+"""
+__all__ = [
+    "GENERATORS",
+    "WaveformCache",
+    "chirp",
+    "digest",
+    "prbs",
+    "pulse_train",
+    "to_dac",
+    "tones",
+]
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+# Feedback taps of maximal length LFSRs (x^order + x^tap + 1).
+PRBS_TAPS = {7: 6, 9: 5, 11: 9, 15: 14, 20: 17, 23: 18, 31: 28}
+
+
+def chirp(n, f0, f1, phase=0.):
+    """Linear frequency sweep.
+
+    Args:
+        n (int): Number of samples.
+        f0 (float): Frequency at the start (cycles per buffer).
+        f1 (float): Frequency at the end (cycles per buffer).
+        phase (float): Phase at the start (rad). Defaults to 0.0.
+
+    Return:
+        signal (numpy.ndarray): The waveform.
+    """
+    assert n > 0, "n: expected to be positive."
+
+    t = np.arange(n) / n
+    return np.cos(2 * np.pi * (f0 * t + (f1 - f0) * t ** 2 / 2) + phase)
+
+
+def pulse_train(n, period, width, delay=0):
+    """Train of rectangular pulses.
+
+    Args:
+        n (int): Number of samples.
+        period (int): Period of the pulses (samples).
+        width (int): Width of a pulse (samples).
+        delay (int): Delay of the first pulse (samples). Defaults to 0.
+
+    Return:
+        signal (numpy.ndarray): The waveform, which is 1 during
+            the pulses and -1 otherwise.
+    """
+    assert n > 0, "n: expected to be positive."
+    assert 0 < width <= period, "width: expected to be in (0, period]."
+
+    phase = (np.arange(n) - delay) % period
+    return np.where(phase < width, 1., -1.)
+
+
+def prbs(n, order=7, chip=1, seed=1):
+    """Pseudo random binary sequence.
+
+    The sequence is generated by a maximal length linear feedback
+    shift register (Fibonacci type) of the given order.
+
+    Args:
+        n (int): Number of samples.
+        order (int): Order of the register. One of 7, 9, 11, 15, 20,
+            23 and 31. Defaults to 7.
+        chip (int): Number of samples per bit. Defaults to 1.
+        seed (int): Initial state of the register (nonzero).
+            Defaults to 1.
+
+    Return:
+        signal (numpy.ndarray): The waveform of 1 and -1.
+    """
+    assert n > 0, "n: expected to be positive."
+    assert order in PRBS_TAPS, f"order: expected to be in {list(PRBS_TAPS)}."
+    assert chip > 0, "chip: expected to be positive."
+
+    mask = (1 << order) - 1
+    state = seed & mask
+    assert state, "seed: expected to be nonzero."
+
+    shift = order - PRBS_TAPS[order]
+    n_bits = -(-n // chip)
+    bits = np.empty(n_bits, dtype=np.int8)
+    for i in range(n_bits):
+        bit = (state ^ (state >> shift)) & 1
+        bits[i] = bit
+        state = (state >> 1) | (bit << (order - 1))
+    return np.repeat(1. - 2. * bits, chip)[:n]
+
+
+def tones(n, freqs, amps=None, phases=None, normalize=True):
+    """Sum of sinusoidal tones.
+
+    Note:
+        Use integer frequencies for a waveform continuous
+        at the boundary of the buffer.
+
+    Args:
+        n (int): Number of samples.
+        freqs (list of float): Frequencies (cycles per buffer).
+        amps (list of float or None): Amplitudes of the tones.
+            Defaults to None (all 1.0).
+        phases (list of float or None): Phases of the tones (rad).
+            Defaults to None (all 0.0).
+        normalize (bool): Scale the waveform so that its peak is 1.
+            Otherwise, it is divided by the sum of the amplitudes.
+            Defaults to True.
+
+    Return:
+        signal (numpy.ndarray): The waveform.
+    """
+    assert n > 0, "n: expected to be positive."
+
+    freqs = np.asarray(freqs, dtype=float)
+    amps = np.ones_like(freqs) if amps is None else np.asarray(amps, float)
+    phases = np.zeros_like(freqs) if phases is None \
+        else np.asarray(phases, float)
+
+    assert freqs.ndim == 1 and len(freqs) > 0, \
+        "freqs: expected to have at least one frequency."
+    assert amps.shape == freqs.shape and phases.shape == freqs.shape, \
+        "amps, phases: expected to have the same length as freqs."
+
+    t = np.arange(n) / n
+    signal = amps @ np.cos(2 * np.pi * freqs[:, None] * t + phases[:, None])
+    scale = np.max(np.abs(signal)) if normalize else np.sum(np.abs(amps))
+    return signal / scale if scale > 0 else signal
+
+
+GENERATORS = {
+    "chirp": chirp,
+    "prbs": prbs,
+    "pulse_train": pulse_train,
+    "tones": tones,
+}
+
+
+def to_dac(signal, bits=14):
+    """Convert a waveform to DAC codes.
+
+    Args:
+        signal (numpy.ndarray): The waveform within [-1, 1], which is
+            clipped.
+        bits (int): Resolution of the DAC. Defaults to 14, whose codes
+            are from -8191 to 8191.
+
+    Return:
+        codes (numpy.ndarray): The codes of int16.
+    """
+    assert 2 <= bits <= 16, "bits: expected to be from 2 to 16."
+
+    full = 2 ** (bits - 1) - 1
+    codes = np.clip(signal, -1., 1.) * full
+    return np.rint(codes, out=codes).astype(np.int16)
+
+
+def digest(codes):
+    """Digest of the contents of a buffer.
+
+    Args:
+        codes (numpy.ndarray): The buffer.
+
+    Return:
+        ret (str): SHA-256 of the data type and the bytes of the buffer.
+    """
+    codes = np.ascontiguousarray(codes)
+    h = hashlib.sha256(codes.dtype.str.encode())
+    h.update(memoryview(codes).cast("B"))
+    return h.hexdigest()
+
+
+def _default_directory():
+    base = os.environ.get("XDG_CACHE_HOME") \
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "maodevice", "waveforms")
+
+
+class WaveformCache(object):
+    """Content-addressed cache of DAC-ready waveforms.
+
+    A waveform is addressed by the SHA-256 of its generator, parameters,
+    number of samples and resolution. It is kept in memory (least
+    recently used ones are dropped) and stored as a ".npy" file, so that
+    it is reused by later observations::
+
+        cache = WaveformCache()
+        codes = cache.get("chirp", 4096, f0=1, f1=100)
+        awg.upload_waveform(codes)
+
+    Args:
+        directory (str or None): Directory of the files. Defaults to None
+            ("$XDG_CACHE_HOME/maodevice/waveforms", or
+            "~/.cache/maodevice/waveforms").
+        maxsize (int): Number of waveforms kept in memory.
+            Defaults to 32.
+
+    Attributes:
+        directory (str): Directory of the files.
+        stats (dict): Numbers of "hits" in memory, "loads" from files
+            and "misses" (synthesized waveforms).
+    """
+    def __init__(self, directory=None, maxsize=32):
+        assert maxsize >= 0, "maxsize: expected to be non-negative."
+
+        self.directory = directory or _default_directory()
+        self.maxsize = maxsize
+        self.stats = {"hits": 0, "loads": 0, "misses": 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._memory)
+
+    @staticmethod
+    def key(kind, n, bits=14, **params):
+        """Address of a waveform.
+
+        Args:
+            kind (str): Name of the generator in "GENERATORS".
+            n (int): Number of samples.
+            bits (int): Resolution of the DAC. Defaults to 14.
+            **params: Parameters of the generator.
+
+        Return:
+            ret (str): The address.
+        """
+        spec = {"kind": kind, "n": n, "bits": bits, "params": params}
+        text = json.dumps(spec, sort_keys=True, default=_jsonable)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def path(self, key):
+        """Path of the file of a waveform.
+
+        Args:
+            key (str): The address of the waveform.
+
+        Return:
+            ret (str): The path.
+        """
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def get(self, kind, n, bits=14, **params):
+        """Get a waveform, synthesizing it if it is not cached.
+
+        Args:
+            kind (str): Name of the generator in "GENERATORS".
+            n (int): Number of samples.
+            bits (int): Resolution of the DAC. Defaults to 14.
+            **params: Parameters of the generator.
+
+        Return:
+            codes (numpy.ndarray): The read-only DAC codes.
+        """
+        assert kind in GENERATORS, \
+            f"kind: expected to be in {list(GENERATORS)}."
+
+        key = self.key(kind, n, bits, **params)
+        with self._lock:
+            codes = self._memory.get(key)
+            if codes is not None:
+                self._memory.move_to_end(key)
+                self.stats["hits"] += 1
+                return codes
+
+        codes = self._load(key)
+        if codes is None:
+            codes = to_dac(GENERATORS[kind](n, **params), bits)
+            self._store(key, codes)
+            self.stats["misses"] += 1
+        else:
+            self.stats["loads"] += 1
+
+        codes.flags.writeable = False
+        with self._lock:
+            self._memory[key] = codes
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+        return codes
+
+    def clear(self, files=False):
+        """Clear the cache.
+
+        Args:
+            files (bool): Remove the files too. Defaults to False.
+
+        Return:
+            None
+        """
+        with self._lock:
+            self._memory.clear()
+        if files and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".npy"):
+                    os.remove(os.path.join(self.directory, name))
+        return
+
+    def _load(self, key):
+        try:
+            return np.load(self.path(key))
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, key, codes):
+        """Store a waveform as a file.
+
+        Note:
+            This method is only for the internal use.
+            The file is written to a temporary file and renamed,
+            so that a partial file is never loaded.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp, "wb") as f:
+            np.save(f, codes)
+        os.replace(temp, path)
+
+
+def _jsonable(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (tuple, set, frozenset)):
+        return list(obj)
+    raise TypeError(f"{obj!r} is not JSON serializable.")
@@ -1,3 +1,8 @@
 # -*- coding: utf-8 -*-
-from . import decorators
-from . import misc
+from .lazy import lazy_loader
+
+__getattr__, __dir__ = lazy_loader(
+    __name__,
+    submodules=["decorators", "misc", "profiling", "serialize",
+                "stats"],
+)
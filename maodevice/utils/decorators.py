@@ -9,6 +9,8 @@ import decimal
 from functools import wraps
 from inspect import signature
 
+from maodevice.utils.profiling import profiled
+
 
 def chooser(arg_name, choice_list):
     """Check whether the value in the choices.
@@ -28,13 +30,16 @@ def chooser(arg_name, choice_list):
         AssertionError: If the value of "arg_name" is not in the "choice_list".
     """
     def _chooser(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
+        @profiled(f"check:chooser({arg_name})")
+        def check(*args, **kwargs):
             arg_val = get_arg_value(arg_name, func, *args, **kwargs)
 
             assert arg_val in choice_list, \
                 f"{arg_name}: expected to be in 'choice_list'."
 
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            check(*args, **kwargs)
             return func(*args, **kwargs)
         return wrapper
     return _chooser
@@ -117,8 +122,8 @@ def limitter(arg_name, min_val, max_val, step):
             is not expected type and value.
     """
     def _limitter(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
+        @profiled(f"check:limitter({arg_name})")
+        def check(*args, **kwargs):
             arg_val = get_arg_value(arg_name, func, *args, **kwargs)
 
             assert isinstance(arg_val, (int, float)), \
@@ -138,6 +143,9 @@ def limitter(arg_name, min_val, max_val, step):
             assert is_correct_step, \
                 f"{arg_name}: expected to be a multiple of {step}."
 
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            check(*args, **kwargs)
             return func(*args, **kwargs)
         return wrapper
     return _limitter
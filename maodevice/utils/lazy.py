@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+__all__ = [
+    "lazy_loader",
+]
+
+import sys
+from importlib import import_module
+
+
+def lazy_loader(package, submodules=(), attributes=None):
+    """Create module-level "__getattr__" and "__dir__" for lazy loading.
+
+    The submodules and attributes are imported when they are accessed
+    for the first time, and then cached in the namespace of the package.
+    This function is intended to be used in "__init__.py" like follows::
+
+        >>> __getattr__, __dir__ = lazy_loader(
+        ...     __name__,
+        ...     submodules=["foo"],
+        ...     attributes={"Bar": ".bar"},
+        ... )
+
+    Args:
+        package (str): Name of the package.
+        submodules (:obj:`list` of :obj:`str`): Names of submodules.
+        attributes (dict): Correspondance dict of attribute names and
+            (relative) names of modules which define them.
+
+    Return:
+        __getattr__ (function): Module-level "__getattr__".
+        __dir__ (function): Module-level "__dir__".
+    """
+    submodules = frozenset(submodules)
+    attributes = dict(attributes or {})
+
+    def __getattr__(name):
+        if name in submodules:
+            value = import_module(f".{name}", package)
+        elif name in attributes:
+            module = import_module(attributes[name], package)
+            value = getattr(module, name)
+        else:
+            raise AttributeError(
+                f"module '{package}' has no attribute '{name}'"
+            )
+
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        namespace = vars(sys.modules[package])
+        return sorted(set(namespace) | submodules | set(attributes))
+
+    return __getattr__, __dir__
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""Profile the layers of calls to devices.
+
+If the environment variable "MAODEVICE_PROFILE" is set when "maodevice"
+is imported, the layers of a call (the method of the handler, the
+validation, the checks of arguments, the encoding and the transport)
+are timed, and the self time of each stack of layers is written at the
+exit in the collapsed stack format of flame graphs::
+
+    Model3390AWG.set_frequency;encode 412
+    Model3390AWG.set_frequency;transport:send 1820
+    Model3390AWG.set_frequency;validate:Model3390AWGValidator;... 2950
+
+The value of the variable is the path of the output file, or "1" for
+"maodevice-<pid>.folded" in the current directory ("0", "false", "no"
+and "off" disable profiling as an unset variable). The times are in
+microseconds. Since the layers are wrapped when they are defined,
+profiling costs nothing if the variable is not set.
+"""
+__all__ = [
+    "ENABLED",
+    "StackProfiler",
+    "profiled",
+    "profiler",
+]
+
+import atexit
+import os
+import threading
+from functools import wraps
+from time import perf_counter_ns
+
+
+ENV = "MAODEVICE_PROFILE"
+ENABLED = os.environ.get(ENV, "").strip().lower() \
+    not in ("", "0", "false", "no", "off")
+
+
+class StackProfiler(object):
+    """Accumulate the self times of stacks of layers.
+
+    Each thread has its own stack of layers, and the self time of a
+    layer (the time excluding its inner layers) is added to the path
+    of the stack like "outer;inner".
+    """
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def _stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            self._local.names = []
+            return self._local.stack
+
+    def enter(self, name):
+        """Enter a layer.
+
+        Args:
+            name (str): Name of the layer.
+
+        Return:
+            None
+        """
+        self._stack().append([perf_counter_ns(), 0])
+        self._local.names.append(name)
+
+    def exit(self):
+        """Exit the current layer.
+
+        Return:
+            None
+        """
+        end = perf_counter_ns()
+        stack = self._local.stack
+        names = self._local.names
+        start, inner = stack.pop()
+        elapsed = end - start
+        path = ";".join(names)
+        names.pop()
+        if stack:
+            stack[-1][1] += elapsed
+
+        with self._lock:
+            total = self._totals.get(path)
+            if total is None:
+                self._totals[path] = [elapsed - inner, 1]
+            else:
+                total[0] += elapsed - inner
+                total[1] += 1
+
+    def stats(self):
+        """Show the accumulated times.
+
+        Return:
+            ret (dict): Correspondance dict of paths of stacks and
+                dicts of "self" (self time in ns) and "calls".
+        """
+        with self._lock:
+            return {
+                path: {"self": total[0], "calls": total[1]}
+                for path, total in self._totals.items()
+            }
+
+    def collapsed(self):
+        """Lines in the collapsed stack format.
+
+        Return:
+            lines (:obj:`list` of :obj:`str`): "<path> <self time in us>".
+        """
+        return [
+            f"{path} {stat['self'] // 1000}"
+            for path, stat in sorted(self.stats().items())
+        ]
+
+    def write(self, path):
+        """Write the collapsed stacks to a file.
+
+        Args:
+            path (str): Path of the file.
+
+        Return:
+            None
+        """
+        with open(path, "w") as f:
+            for line in self.collapsed():
+                f.write(line + "\n")
+        return
+
+    def reset(self):
+        """Clear the accumulated times.
+
+        Return:
+            None
+        """
+        with self._lock:
+            self._totals.clear()
+        return
+
+
+profiler = StackProfiler()
+
+
+def profiled(name=None, enabled=None):
+    """Time a function as a layer.
+
+    This function is intended to be used as a decorator like follows::
+
+        >>> @profiled("encode")
+        >>> def func(*args, **kwargs):
+        >>>     # do something
+        >>>     return
+
+    Args:
+        name (str or None): Name of the layer.
+            Defaults to None (the qualified name of the function).
+        enabled (bool or None): Time the function.
+            Defaults to None ("ENABLED").
+
+    Return:
+        decorator (function): The decorator, which returns the function
+            itself if it is not enabled.
+    """
+    enabled = ENABLED if enabled is None else enabled
+
+    def decorator(func):
+        if not enabled:
+            return func
+
+        label = name or func.__qualname__
+        enter = profiler.enter
+        exit = profiler.exit
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            enter(label)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                exit()
+        return wrapper
+    return decorator
+
+
+def _write_at_exit():
+    path = os.environ.get(ENV, "")
+    if path.lower() in ("1", "true", "yes", "on"):
+        path = f"maodevice-{os.getpid()}.folded"
+    profiler.write(path)
+
+
+if ENABLED:
+    atexit.register(_write_at_exit)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Encode objects with bytes to JSON-serializable ones.
+
+Values of the type "bytes" are encoded as ``{"bytes": "<base64>"}``.
+"""
+__all__ = [
+    "decode",
+    "encode",
+]
+
+import base64
+
+
+def encode(obj):
+    """Encode an object to a JSON-serializable one.
+
+    Args:
+        obj: An object to encode.
+
+    Return:
+        ret: JSON-serializable object.
+    """
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return {"bytes": base64.b64encode(bytes(obj)).decode()}
+    if isinstance(obj, dict):
+        return {str(key): encode(val) for key, val in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [encode(val) for val in obj]
+    return obj
+
+
+def decode(obj):
+    """Decode an object encoded by "encode".
+
+    Args:
+        obj: An object to decode.
+
+    Return:
+        ret: Decoded object.
+    """
+    if isinstance(obj, dict):
+        if list(obj) == ["bytes"]:
+            return base64.b64decode(obj["bytes"])
+        return {key: decode(val) for key, val in obj.items()}
+    if isinstance(obj, list):
+        return [decode(val) for val in obj]
+    return obj
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+__all__ = [
+    "Ewma",
+    "P2Quantile",
+    "RunningRegression",
+]
+
+import math
+
+import numpy as np
+
+
+class RunningRegression(object):
+    """Linear regression over a sliding window of samples.
+
+    The samples are kept in preallocated ring buffers, and the sums of
+    the regression are updated in O(1) per sample. The sums are
+    recomputed from the buffers once per window, so that rounding
+    errors do not accumulate.
+
+    Note:
+        The x values are shifted by the first one to keep the sums
+        small, e.g. for UNIX times.
+
+    Args:
+        window (int): Maximum number of samples. Defaults to 1024.
+
+    Attributes:
+        x (numpy.ndarray): Ring buffer of the x values (shifted).
+        y (numpy.ndarray): Ring buffer of the y values.
+    """
+    def __init__(self, window=1024):
+        assert window >= 2, "window: expected to be 2 or more."
+
+        self.window = window
+        self.x = np.zeros(window, dtype=np.float64)
+        self.y = np.zeros(window, dtype=np.float64)
+        self.reset()
+
+    def __len__(self):
+        return min(self._count, self.window)
+
+    def reset(self):
+        """Forget all the samples.
+
+        Return:
+            None
+        """
+        self._count = 0
+        self._origin = None
+        self._sx = self._sy = self._sxx = self._sxy = self._syy = 0.
+        return
+
+    def update(self, x, y):
+        """Add a sample.
+
+        Args:
+            x (float): The x value (e.g. time).
+            y (float): The y value.
+
+        Return:
+            None
+        """
+        if self._origin is None:
+            self._origin = x
+        x -= self._origin
+
+        slot = self._count % self.window
+        if self._count >= self.window:
+            old_x, old_y = self.x.item(slot), self.y.item(slot)
+            self._sx -= old_x
+            self._sy -= old_y
+            self._sxx -= old_x * old_x
+            self._sxy -= old_x * old_y
+            self._syy -= old_y * old_y
+
+        self.x[slot] = x
+        self.y[slot] = y
+        self._sx += x
+        self._sy += y
+        self._sxx += x * x
+        self._sxy += x * y
+        self._syy += y * y
+        self._count += 1
+
+        if slot == self.window - 1:
+            self._resum()
+        return
+
+    def _resum(self):
+        """Recompute the sums from the buffers.
+
+        Note:
+            This method is only for the internal use.
+
+        Return:
+            None
+        """
+        x, y = self.x, self.y
+        self._sx = float(x.sum())
+        self._sy = float(y.sum())
+        self._sxx = float(x @ x)
+        self._sxy = float(x @ y)
+        self._syy = float(y @ y)
+        return
+
+    @property
+    def slope(self):
+        """float: Slope of the fitted line (NaN if undetermined)."""
+        n = len(self)
+        det = n * self._sxx - self._sx * self._sx
+        if n < 2 or det <= 0:
+            return math.nan
+        return (n * self._sxy - self._sx * self._sy) / det
+
+    @property
+    def intercept(self):
+        """float: Value of the fitted line at the first x."""
+        n = len(self)
+        if n == 0:
+            return math.nan
+        slope = self.slope
+        if math.isnan(slope):
+            return self._sy / n
+        return (self._sy - slope * self._sx) / n
+
+    @property
+    def residual(self):
+        """float: Standard deviation of the residuals."""
+        n = len(self)
+        if n < 3:
+            return math.nan
+        slope, intercept = self.slope, self.intercept
+        sse = (self._syy - 2 * slope * self._sxy - 2 * intercept * self._sy
+               + slope * slope * self._sxx + 2 * slope * intercept * self._sx
+               + n * intercept * intercept)
+        return math.sqrt(max(sse, 0.) / (n - 2))
+
+    def predict(self, x):
+        """Predict the y value by the fitted line.
+
+        Args:
+            x (float): The x value.
+
+        Return:
+            y (float): The predicted y value.
+        """
+        return self.intercept + self.slope * (x - self._origin)
+
+    def solve(self, y):
+        """Find the x value where the fitted line reaches a y value.
+
+        Args:
+            y (float): The y value.
+
+        Return:
+            x (float): The x value (NaN if the line is flat).
+        """
+        slope = self.slope
+        if math.isnan(slope) or slope == 0:
+            return math.nan
+        return self._origin + (y - self.intercept) / slope
+
+
+class Ewma(object):
+    """Exponentially weighted moving average and variance.
+
+    Args:
+        alpha (float): Weight of a new sample. Defaults to 0.1.
+
+    Attributes:
+        count (int): Number of the samples.
+        mean (float): The moving average (NaN if no sample).
+        var (float): The moving variance.
+    """
+    def __init__(self, alpha=0.1):
+        assert 0 < alpha <= 1, "alpha: expected to be in (0, 1]."
+
+        self.alpha = alpha
+        self.count = 0
+        self.mean = math.nan
+        self.var = 0.
+
+    @property
+    def std(self):
+        """float: The moving standard deviation."""
+        return math.sqrt(self.var)
+
+    def update(self, x):
+        """Add a sample.
+
+        Args:
+            x (float): The sample.
+
+        Return:
+            None
+        """
+        self.count += 1
+        if self.count == 1:
+            self.mean = x
+            return
+        diff = x - self.mean
+        incr = self.alpha * diff
+        self.mean += incr
+        self.var = (1 - self.alpha) * (self.var + diff * incr)
+        return
+
+
+class P2Quantile(object):
+    """Estimate a quantile by the P-square algorithm.
+
+    The quantile is estimated from five markers without storing the
+    samples (R. Jain and I. Chlamtac, Commun. ACM 28, 1076, 1985).
+
+    Args:
+        q (float): The quantile to estimate (e.g. 0.99).
+
+    Attributes:
+        count (int): Number of the samples.
+    """
+    def __init__(self, q):
+        assert 0 < q < 1, "q: expected to be in (0, 1)."
+
+        self.q = q
+        self.count = 0
+        self._heights = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self._increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    @property
+    def value(self):
+        """float: The estimated quantile (NaN if no sample)."""
+        if self.count >= 5:
+            return self._heights[2]
+        if not self._heights:
+            return math.nan
+        heights = sorted(self._heights)
+        return heights[min(int(self.q * len(heights)), len(heights) - 1)]
+
+    def update(self, x):
+        """Add a sample.
+
+        Args:
+            x (float): The sample.
+
+        Return:
+            None
+        """
+        self.count += 1
+        h, n = self._heights, self._positions
+        if self.count <= 5:
+            h.append(x)
+            if self.count == 5:
+                h.sort()
+            return
+
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= h[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in (1, 2, 3):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) \
+                    or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not h[i - 1] < height < h[i + 1]:
+                    height = h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+                h[i] = height
+                n[i] += d
+        return
+
+    def _parabolic(self, i, d):
+        h, n = self._heights, self._positions
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from maodevice.core import BaseValidator
-# from maodevice.exceptions import *
+from maodevice.exceptions import Model3390AWGError
 
 
 # OCTAD-S (Elecs, Inc.)
@@ -29,7 +29,12 @@ class Model3390AWGValidator(BaseValidator):
     This class is based on "maodevice.core.BaseValidator".
 
     Note:
-        This class is used as a metaclass.
+        - This class is used as a metaclass.
+        - The error queue is drained by "error_queue" of the instance
+          (see "maodevice.scpi.ErrorQueue").
+
+    Raises:
+        Model3390AWGError: The subclass of the code of the first error.
     """
     def _validate(self):
         """Actual validator function of this validator.
@@ -37,10 +42,9 @@ class Model3390AWGValidator(BaseValidator):
         Note:
             This method override the "_validator" in the base class.
         """
-        ret = self.com.query("SYST:ERR?")
-        # NOTE: TBD
-        if not ret == b'+0,"No error"\n':
-            raise AssertionError(ret.decode())
+        errors = self.error_queue.drain()
+        if errors:
+            raise Model3390AWGError.from_errors(errors)
 
         return
 
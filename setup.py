@@ -7,11 +7,11 @@ MAJOR = 1
 MINOR = 0
 VERSION = f"{MAJOR}.{MINOR}"
 CLASSIFIERS = [
-    "Programming Language :: Python :: 3.6",
-    "Programming Language :: Python :: 3.7",
+    "Programming Language :: Python :: 3.8",
     "License :: OSI Approved :: MIT License",
 ]
 REQUIREMENTS = [
+    "numpy>=1.17",
     "pyserial>=3.4",
 ]
 
@@ -34,5 +34,9 @@ setup(
     license="MIT",
     packages=find_packages(exclude=("docs", "tests")),
     install_requires=REQUIREMENTS,
+    entry_points={
+        "console_scripts": ["maodevice = maodevice.cli:main"],
+    },
+    python_requires=">=3.8",
     classifiers=CLASSIFIERS,
 )
\ No newline at end of file
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import time
+
+from maodevice.core import BaseCommunicator
+
+
+class FakeCom(BaseCommunicator):
+    """Communicator which answers the written messages without a device.
+
+    A written message is answered once, at the first receive after it,
+    and the reply is received in pieces of "chunk" bytes. A receive
+    with nothing to answer returns b"" (a timeout of a device).
+
+    Args:
+        reply (bytes or function): Reply to a message, or a function
+            which takes the message (bytes) and returns the reply
+            (bytes or None). Defaults to b"" (no reply).
+        data (bytes): Bytes to receive before any message.
+            Defaults to b"".
+        terminator (str or None): Termination character.
+            Defaults to None ("\\n").
+        delay (float): Time to write a message (sec). Defaults to 0.0.
+        latency (float): Time to receive (sec). Defaults to 0.0.
+        chunk (int or None): Maximum bytes of a receive.
+            Defaults to None (no limit).
+
+    Attributes:
+        written (list of bytes): The written messages.
+        times (list of float): Times of the writes (time.time()).
+        buffer (bytearray): Bytes to receive.
+        opened (int): Number of the opens.
+        closed (int): Number of the closes.
+    """
+    METHOD = "Fake"
+
+    def __init__(self, reply=b"", data=b"", terminator=None, delay=0.,
+                 latency=0., chunk=None):
+        if terminator is not None:
+            self.terminator = terminator
+        self.reply = reply
+        self.delay = delay
+        self.latency = latency
+        self.chunk = chunk
+        self.written = []
+        self.times = []
+        self.buffer = bytearray(data)
+        self.opened = 0
+        self.closed = 0
+        self._answered = 0
+
+    def open(self):
+        self.opened += 1
+        self.connection = True
+
+    def close(self):
+        self.closed += 1
+        self.connection = False
+
+    def write(self, data):
+        time.sleep(self.delay)
+        self.written.append(bytes(data))
+        self.times.append(time.time())
+
+    def answer(self, msg):
+        """Reply to a message, which is overridden by a child class."""
+        return self.reply(msg) if callable(self.reply) else self.reply
+
+    def recv(self, byte=4096):
+        time.sleep(self.latency)
+        if not self.buffer and self._answered < len(self.written):
+            self._answered = len(self.written)
+            self.buffer += self.answer(self.written[-1]) or b""
+        size = byte if self.chunk is None else min(byte, self.chunk)
+        ret = bytes(self.buffer[:size])
+        del self.buffer[:len(ret)]
+        return ret
+
+    def count(self, msg):
+        """Number of the written messages which contain "msg"."""
+        return sum(msg in w for w in self.written)
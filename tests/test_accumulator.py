@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+from maodevice.correlator import SpectralAccumulator
+
+
+class TestSpectralAccumulator(object):
+    """Test class of 'maodevice.correlator.SpectralAccumulator'
+    """
+    def test_cadence(self):
+        """Test method for emitting products at the cadence
+        """
+        acc = SpectralAccumulator(4, integ_time=0.01, cadence=0.03)
+        emitted = []
+        acc.subscribe(emitted.append)
+        for i in range(1, 7):
+            acc.add(1, np.full(4, float(i)), time=i * 0.01)
+
+        assert [p.n_spectra for p in emitted] == [3, 3]
+        assert emitted[0].spectrum.tolist() == [2.] * 4
+        assert emitted[1].spectrum.tolist() == [5.] * 4
+        assert emitted[1].start == pytest.approx(0.04)
+        assert emitted[1].stop == pytest.approx(0.06)
+
+    def test_flags(self):
+        """Test method for the flagged channels and the weights
+        """
+        acc = SpectralAccumulator(3, cadence=0.02, mask=[False, False, True])
+        acc.add(5, np.array([1j, np.nan, 1.]), flags=[False, True, False])
+        product, = acc.add(5, np.array([3j, 4., 1.]))
+
+        assert product.spectrum.dtype == np.complex128
+        assert product.spectrum[:2].tolist() == [2j, 4.]
+        assert np.isnan(product.spectrum[2])
+        assert product.weight.tolist() == [2., 1., 0.]
+
+    def test_add_block(self):
+        """Test method for adding a block of spectra
+        """
+        spectra = np.arange(10 * 2, dtype=float).reshape(10, 2)
+        flags = np.zeros((10, 2), dtype=bool)
+        flags[0, 1] = True
+
+        acc = SpectralAccumulator(2, cadence=0.04, threads=(2,))
+        products = acc.add_block(2, spectra, times=np.arange(10), flags=flags)
+        products += acc.flush()
+
+        assert [p.n_spectra for p in products] == [4, 4, 2]
+        assert products[0].spectrum.tolist() == [3., 5.]
+        assert products[1].spectrum.tolist() == [11., 12.]
+        assert (products[2].start, products[2].stop) == (8, 9)
+        assert acc.flush() == []
+
+
+if __name__ == "__main__":
+    pytest.main()
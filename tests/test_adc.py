@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+from math import erf
+
+import numpy as np
+import pytest
+from maodevice.correlator import AdcHealthAnalyzer
+from maodevice.correlator.adc import optimal_step, parse_bit_distribution
+
+
+def gaussian(sigma, n_levels=256, total=10 ** 6):
+    edges = np.arange(1, n_levels) - n_levels / 2
+    cdf = [0.5 * (1 + erf(e / sigma / 2 ** 0.5)) for e in edges]
+    cdf = np.concatenate([[0.], cdf, [1.]])
+    return np.round(np.diff(cdf) * total).astype(np.int64)
+
+
+class TestParseBitDistribution(object):
+    """Test class of 'maodevice.correlator.adc.parse_bit_distribution'
+    """
+    def test_reply(self):
+        """Test method for parsing a reply of show_adc_sampling_bit
+        """
+        ret = parse_bit_distribution(b"show_adc_sampling_bit=1,20,300,4;\n")
+        assert ret.tolist() == [1, 20, 300, 4]
+
+
+class TestOptimalStep(object):
+    """Test class of 'maodevice.correlator.adc.optimal_step'
+    """
+    @pytest.mark.parametrize(
+        "bits, expected", [(1, 1.596), (2, 0.9957), (3, 0.5860)]
+    )
+    def test_max_table(self, bits, expected):
+        """Test method for the optimal steps of 1 to 3 bits
+        """
+        assert optimal_step(bits) == pytest.approx(expected, abs=2e-3)
+
+
+class TestAdcHealthAnalyzer(object):
+    """Test class of 'maodevice.correlator.AdcHealthAnalyzer'
+    """
+    def test_statistics(self):
+        """Test method for the statistics of a Gaussian input
+        """
+        analyzer = AdcHealthAnalyzer().update(gaussian(20.))
+        assert analyzer.sigma == pytest.approx(20., rel=1e-3)
+        assert analyzer.mean == pytest.approx(0., abs=1e-6)
+        assert analyzer.power_dbfs == pytest.approx(-16.12, abs=0.01)
+        assert analyzer.clipping == 0.
+        assert not analyzer.needs_calibration()
+
+    def test_threshold_occupancy(self):
+        """Test method for the occupancy between the thresholds
+        """
+        analyzer = AdcHealthAnalyzer().update(gaussian(20.))
+        ret = analyzer.threshold_occupancy([-20., 0., 20.])
+        assert ret == pytest.approx([0.1587, 0.3413, 0.3413, 0.1587], abs=1e-3)
+
+    def test_requantization_scaling(self):
+        """Test method for the scaling by the input gain
+        """
+        assert AdcHealthAnalyzer().update(gaussian(20.)) \
+            .optimal_requantization_scaling() == 4
+        assert AdcHealthAnalyzer(input_gain=64.).update(gaussian(20.)) \
+            .optimal_requantization_scaling() == 10
+
+    def test_rolling_window(self):
+        """Test method for the rolling window of distributions
+        """
+        analyzer = AdcHealthAnalyzer(window=2)
+        analyzer.update(gaussian(5.)).update(gaussian(40.))
+        analyzer.update(gaussian(40.))
+        assert len(analyzer) == 2
+        assert analyzer.sigma == pytest.approx(40., rel=1e-3)
+        assert analyzer.counts.sum() == gaussian(40.).sum() * 2
+
+    def test_missing_codes(self):
+        """Test method for detecting missing codes
+        """
+        counts = gaussian(20.)
+        counts[1::2] = 0
+        analyzer = AdcHealthAnalyzer().update(counts)
+        assert len(analyzer.missing_codes())
+        assert analyzer.needs_calibration()
+
+    def test_exception(self):
+        """Test method for exceptions
+        """
+        with pytest.raises(AssertionError):
+            AdcHealthAnalyzer().update(np.ones(16, dtype=np.int64))
+
+
+if __name__ == "__main__":
+    pytest.main()
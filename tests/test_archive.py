@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import os
+
+import numpy as np
+import pytest
+from maodevice.archive import (
+    HOT_SUFFIX,
+    INDEX_FILE,
+    ArchiveReader,
+    ArchiveWriter,
+    _segment_path,
+    compress_segments,
+)
+
+
+DTYPE = np.dtype([("time", "<f8"), ("value", "<i4"), ("spec", "<f4", (4,))])
+
+
+def make_records(start, stop):
+    records = np.zeros(stop - start, dtype=DTYPE)
+    records["time"] = np.arange(start, stop) * 0.5
+    records["value"] = np.arange(start, stop)
+    records["spec"] = np.arange(start, stop)[:, None]
+    return records
+
+
+class TestArchive(object):
+    """Test class of 'maodevice.archive'
+    """
+    def test_roundtrip(self, tmp_path):
+        """Test method for appending and reading records
+        """
+        path = str(tmp_path / "night")
+        with ArchiveWriter(path, DTYPE, segment_records=100,
+                           buffer_records=16) as writer:
+            for record in make_records(0, 150):
+                writer.append(record)
+            writer.extend(make_records(150, 250))
+
+        reader = ArchiveReader(path)
+        assert len(reader) == 250
+        np.testing.assert_array_equal(reader.read(), make_records(0, 250))
+
+        # A range within one hot segment is a view of the file.
+        view = reader.read(110, 120)
+        assert isinstance(view, np.memmap)
+        np.testing.assert_array_equal(view["value"], np.arange(110, 120))
+
+    def test_search(self, tmp_path):
+        """Test method for the time index
+        """
+        path = str(tmp_path / "night")
+        with ArchiveWriter(path, DTYPE, segment_records=64) as writer:
+            writer.extend(make_records(0, 300))
+
+        reader = ArchiveReader(path)
+        assert reader.search(0.0) == 0
+        assert reader.search(50.0) == 100
+        assert reader.search(50.0, side="right") == 101
+        assert reader.search(1000.0) == 300
+        records = reader.between(10.0, 40.0)
+        np.testing.assert_array_equal(records["value"], np.arange(20, 80))
+
+    def test_compress(self, tmp_path):
+        """Test method for compressing cold segments
+        """
+        path = str(tmp_path / "night")
+        with ArchiveWriter(path, DTYPE, segment_records=64) as writer:
+            writer.extend(make_records(0, 300))
+
+        assert compress_segments(path, keep=1, chunk_records=16) == [0, 1, 2]
+
+        reader = ArchiveReader(path)
+        np.testing.assert_array_equal(reader.read(), make_records(0, 300))
+        assert reader.search(20.25) == 41
+        np.testing.assert_array_equal(
+            reader.between(10.0, 100.0)["value"], np.arange(20, 200)
+        )
+
+    def test_resume(self, tmp_path):
+        """Test method for resuming an existing archive
+        """
+        path = str(tmp_path / "night")
+        with ArchiveWriter(path, DTYPE, segment_records=64) as writer:
+            writer.extend(make_records(0, 100))
+        with ArchiveWriter(path) as writer:
+            writer.extend(make_records(100, 200))
+
+            with pytest.raises(AssertionError):
+                writer.append(make_records(0, 1)[0])
+
+        reader = ArchiveReader(path)
+        np.testing.assert_array_equal(reader.read(), make_records(0, 200))
+
+    def test_resume_full_segment(self, tmp_path):
+        """Test method for resuming after a crash before sealing
+        """
+        path = str(tmp_path / "night")
+        with ArchiveWriter(path, DTYPE, segment_records=64) as writer:
+            writer.extend(make_records(0, 100))
+        # The crash before the first segment was registered.
+        os.remove(_segment_path(path, 1, HOT_SUFFIX))
+        os.truncate(os.path.join(path, INDEX_FILE), 0)
+
+        with ArchiveWriter(path) as writer:
+            writer.extend(make_records(64, 100))
+
+        reader = ArchiveReader(path)
+        np.testing.assert_array_equal(reader.read(), make_records(0, 100))
+
+
+if __name__ == "__main__":
+    pytest.main()
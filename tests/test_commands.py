@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+import inspect
+
+import pytest
+from maodevice.commands import Argument, Command, CommandTable, Reply
+from maodevice.correlator import OctadS
+from maodevice.transmitter import Md20M
+from tests.conftest import FakeCom
+
+
+TABLE = CommandTable([
+    Command(
+        "set_scaling", "set_scaling{n}={scale}",
+        [
+            Argument("n", int, "Thread ID.", choices=(1, 2, 5)),
+            Argument("scale", int, "Scaling.", default=0, range=(0, 31)),
+        ],
+    ),
+    Command(
+        "set_gain", "SETGAIN:{gain}",
+        [Argument("gain", float, "Gain.", range=(1., 8.5), step=0.01)],
+    ),
+    Command(
+        "set_repeat", "set_ipreq={flag}",
+        [Argument("flag", bool, "Flag.", mapping={True: "on", False: "off"})],
+    ),
+    Command("show_temp", "show_temp?", reply=Reply(float, "Temperature.")),
+])
+
+
+class TestCommandTable(object):
+    """Test class of 'maodevice.commands.CommandTable'
+    """
+    @pytest.mark.parametrize(
+        "name, args, expected",
+        [
+            ("set_scaling", (5,), "set_scaling5=0"),
+            ("set_scaling", (1, 31), "set_scaling1=31"),
+            ("set_gain", (3.27,), "SETGAIN:3.27"),
+            ("set_repeat", (1,), "set_ipreq=on"),
+            ("show_temp", (), "show_temp?"),
+        ],
+    )
+    def test_encode(self, name, args, expected):
+        """Test method for encoding messages
+        """
+        assert TABLE.encode(name, *args) == expected
+
+    @pytest.mark.parametrize(
+        "name, args",
+        [
+            ("set_scaling", (3,)),
+            ("set_scaling", (1, 32)),
+            ("set_scaling", (1, 1.5)),
+            ("set_gain", (3.275,)),
+            ("set_gain", ("foo",)),
+        ],
+    )
+    def test_exception(self, name, args):
+        """Test method for invalid arguments
+        """
+        with pytest.raises(AssertionError):
+            TABLE.encode(name, *args)
+
+    @pytest.mark.parametrize(
+        "msg, name, kwargs",
+        [
+            ("set_scaling5=12", "set_scaling", {"n": 5, "scale": 12}),
+            ("SETGAIN:3.27", "set_gain", {"gain": 3.27}),
+            ("set_ipreq=off", "set_repeat", {"flag": False}),
+            ("show_temp?", "show_temp", {}),
+            ("foo", None, None),
+        ],
+    )
+    def test_parse(self, msg, name, kwargs):
+        """Test method for parsing messages
+        """
+        command, ret = TABLE.parse(msg)
+        assert (command.name if command else None) == name
+        assert ret == kwargs
+
+    def test_reply(self):
+        """Test method for parsing replies
+        """
+        assert TABLE["show_temp"].reply.parse(b"show_temp=45.5;") == 45.5
+
+
+class TestGeneratedMethods(object):
+    """Test class of methods generated from command tables
+    """
+    def test_signature(self):
+        """Test method for signatures and docstrings
+        """
+        method = OctadS.select_correlation_scaling
+        assert str(inspect.signature(method)) == "(self, n, scale=0)"
+        assert "Set within the range of 0 - 31." in method.__doc__
+        assert method.__qualname__ == "OctadS.select_correlation_scaling"
+
+    def test_call(self):
+        """Test method for calling generated methods
+        """
+        com = FakeCom(b"show_temp=45.5;")
+        octad = OctadS(com)
+        octad.select_correlation_scaling(5, scale=3)
+        octad.dispatch("set_adc_dynamic_range", 1, 250.)
+        assert octad.show_temperature() == b"show_temp=45.5;"
+        assert com.written == [
+            b"set_scaling5=3;",
+            b"set_adc1=250.0:0.0;",
+            b"show_temp?;",
+        ]
+
+        with pytest.raises(AssertionError):
+            octad.set_window_function("foo")
+        with pytest.raises(KeyError):
+            octad.dispatch("start_correlation", 0)
+
+    def test_cache(self):
+        """Test method for the cache of encoded commands
+        """
+        com = FakeCom(b"show_temp=45.5;")
+        octad = OctadS(com)
+        for _ in range(3):
+            octad.select_correlation_scaling(5, 3)
+        octad.select_repeat_response(True)
+        octad.select_repeat_response(1)
+
+        info = com.cache_info()
+        assert (info.hits, info.misses) == (2, 3)
+        assert com.written[-2:] == [b"set_ipreq=on;", b"set_ipreq=on;"]
+
+        # Invalid arguments are checked at every call.
+        for _ in range(2):
+            with pytest.raises(AssertionError):
+                octad.select_correlation_scaling(3)
+
+    def test_rfll(self):
+        """Test method for RFLL modules
+        """
+        com = FakeCom(b"show_temp=45.5;")
+        md = Md20M(com)
+        md.set_vgain(3.27)
+        assert com.written == [b"SETGAIN:3.27\r\n"]
+
+
+if __name__ == "__main__":
+    pytest.main()
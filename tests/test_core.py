@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import pytest
+from tests.conftest import FakeCom
+
+
+class TestBatch(object):
+    """Test class of 'maodevice.core.BaseCommunicator.batch'
+    """
+    def test_coalesce(self):
+        """Test method for coalescing messages into one write
+        """
+        com = FakeCom(b"ok", terminator=";")
+        with com.batch():
+            com.send("set_iplen=5")
+            with com.batch():
+                com.send("set_window=none")
+            assert com.written == []
+        com.send("ctl_sync")
+        assert com.written == [b"set_iplen=5;set_window=none;", b"ctl_sync;"]
+
+    def test_query(self):
+        """Test method for a query inside the block
+        """
+        com = FakeCom(b"ok", terminator=";")
+        with com.batch():
+            com.send("set_iplen=5")
+            assert com.query("show_temp?") == b"ok"
+            com.send("ctl_sync")
+        assert com.written == [b"set_iplen=5;show_temp?;", b"ctl_sync;"]
+
+    def test_exception(self):
+        """Test method for an exception inside the block
+        """
+        com = FakeCom(b"ok", terminator=";")
+        with pytest.raises(ValueError):
+            with com.batch():
+                com.send("set_iplen=5")
+                raise ValueError()
+        assert com.written == [b"set_iplen=5;"]
+
+
+if __name__ == "__main__":
+    pytest.main()
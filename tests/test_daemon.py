@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import numpy as np
+import pytest
+from maodevice.cli import parse_arguments
+from maodevice.core import BaseDeviceHandler
+from maodevice.daemon import DaemonClient, DaemonError, DeviceDaemon
+from tests.conftest import FakeCom
+
+
+class LoopbackCom(FakeCom):
+    """Communicator which replies the last message with its name.
+    """
+    opened = 0
+    closed = 0
+
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+    def open(self):
+        LoopbackCom.opened += 1
+        self.connection = True
+
+    def close(self):
+        LoopbackCom.closed += 1
+        self.connection = False
+
+    def answer(self, msg):
+        return f"{self.name}:{msg.decode().rstrip()}".encode()
+
+
+class EchoHandler(BaseDeviceHandler):
+    """Handler which queries the given message.
+    """
+    def echo(self, msg, suffix=""):
+        return self.com.query(msg + suffix)
+
+    def spectrum(self):
+        return np.arange(3, dtype=np.float32), np.int64(4)
+
+    def opaque(self):
+        return object()
+
+    def fail(self):
+        raise ConnectionResetError("reset")
+
+
+CONFIG = {
+    "dev": {
+        "handler": "tests.test_daemon:EchoHandler",
+        "communicator": {"type": "tests.test_daemon:LoopbackCom",
+                         "name": "dev"},
+    },
+}
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    server = DeviceDaemon(CONFIG, str(tmp_path / "daemon.sock"))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def test_daemon(daemon):
+    """Test function of 'maodevice.daemon.DeviceDaemon'
+    """
+    LoopbackCom.opened = 0
+    with DaemonClient(daemon.path) as client:
+        assert client.call(None, "ping") == "pong"
+        assert client.call("dev", "echo", "foo") == b"dev:foo"
+        assert client.call("dev", "echo", "foo", suffix="?") == b"dev:foo?"
+        assert client.call(None, "list")["dev"]["connected"]
+
+        with pytest.raises(DaemonError):
+            client.call("dev", "_validate")
+        with pytest.raises(DaemonError):
+            client.call("foo", "echo", "bar")
+
+    with DaemonClient(daemon.path) as client:
+        assert client.call("dev", "echo", "bar") == b"dev:bar"
+
+    # The connection is kept across clients.
+    assert LoopbackCom.opened == 1
+
+
+def test_access(daemon):
+    """Test function of the access checks of 'DeviceDaemon.dispatch'
+    """
+    with pytest.raises(DaemonError, match="not allowed"):
+        daemon.dispatch({"device": "dev", "method": "_validate"})
+    with pytest.raises(DaemonError, match="unknown device"):
+        daemon.dispatch({"device": "foo", "method": "echo"})
+
+    with DaemonClient(daemon.path) as client:
+        with pytest.raises(DaemonError, match="^DaemonError: __init__"):
+            client.call("dev", "__init__")
+
+
+def test_results(daemon):
+    """Test function of results which JSON does not support
+    """
+    with DaemonClient(daemon.path) as client:
+        assert client.call("dev", "spectrum") == [[0., 1., 2.], 4]
+        with pytest.raises(DaemonError):
+            client.call("dev", "opaque")
+        # The connection is kept after the error.
+        assert client.call(None, "ping") == "pong"
+
+
+def test_reconnect(daemon):
+    """Test function of reconnection after an OSError
+    """
+    LoopbackCom.opened = LoopbackCom.closed = 0
+    with DaemonClient(daemon.path) as client:
+        with pytest.raises(DaemonError):
+            client.call("dev", "fail")
+        assert LoopbackCom.closed == 1
+        assert not client.call(None, "list")["dev"]["connected"]
+        assert client.call("dev", "echo", "foo") == b"dev:foo"
+
+    assert LoopbackCom.opened == 2
+
+
+def test_parse_arguments():
+    """Test function of 'maodevice.cli.parse_arguments'
+    """
+    args, kwargs = parse_arguments(["1", "1.5", "none", "scale=5", "a=b"])
+    assert args == [1, 1.5, "none"]
+    assert kwargs == {"scale": 5, "a": "b"}
+
+
+if __name__ == "__main__":
+    pytest.main()
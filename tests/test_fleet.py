@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import time
+
+import pytest
+from maodevice.correlator import OctadS, OctadSFleet
+from maodevice.correlator.fleet import PerUnit
+from maodevice.exceptions import FleetError
+from tests.conftest import FakeCom
+
+
+def make_fleet(n, delay=0.):
+    coms = [FakeCom(b"show_temp=40.5;", delay=delay) for _ in range(n)]
+    return OctadSFleet([OctadS(com) for com in coms]), coms
+
+
+class TestOctadSFleet(object):
+    """Test class of 'maodevice.correlator.OctadSFleet'
+    """
+    def test_parallel(self):
+        """Test method for sending a command to the units in parallel
+        """
+        fleet, coms = make_fleet(8, delay=0.1)
+        start = time.perf_counter()
+        results = fleet.select_integration_time(10)
+        assert time.perf_counter() - start < 0.5
+        assert results.ok
+        assert all(0.1 <= t for t in results.elapsed.values())
+        assert all(com.written[-1] == b"set_iplen=10;" for com in coms)
+
+    def test_per_unit(self):
+        """Test method for the arguments of each unit
+        """
+        fleet, coms = make_fleet(3)
+        fleet.set_vdif_destination_port(1, PerUnit([60000, 60001, 60002]))
+        assert [com.written[-1] for com in coms] == [
+            b"set_vdifdesport1=60000;",
+            b"set_vdifdesport1=60001;",
+            b"set_vdifdesport1=60002;",
+        ]
+        assert fleet.show_temperature().values == {
+            f"unit{i}": b"show_temp=40.5;" for i in range(3)
+        }
+
+    def test_errors(self):
+        """Test method for the errors of the units
+        """
+        fleet, coms = make_fleet(2)
+        results = fleet.select_integration_time(PerUnit({
+            "unit0": 10, "unit1": 7,
+        }))
+        assert not results.ok
+        assert list(results.errors) == ["unit1"]
+        assert isinstance(results.errors["unit1"], AssertionError)
+        with pytest.raises(FleetError):
+            results.raise_for_errors()
+
+    def test_synchronize(self):
+        """Test method for synchronizing the units at once
+        """
+        fleet, coms = make_fleet(4)
+        results = fleet.synchronize_with_external(offset=0.)
+        assert results.ok
+        sent = [com.times[-1] for com in coms]
+        assert max(sent) - min(sent) < 0.05
+        assert all(com.written[-1] == b"ctl_sync;" for com in coms)
+
+    def test_close(self):
+        """Test method for closing the units
+        """
+        fleet, coms = make_fleet(2)
+        with fleet:
+            pass
+        assert not any(com.connection for com in coms)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+import socket
+import socketserver
+import threading
+import time
+
+import pytest
+from maodevice.communicator import Gateway, SocketCom
+from maodevice.transmitter import Lta20Q, Md20M
+
+
+class BusHandler(socketserver.StreamRequestHandler):
+    """Multi-drop bus which answers "<address>:<command>" to each line.
+    """
+    def handle(self):
+        for line in self.rfile:
+            address, _, command = line.strip().partition(b" ")
+            self.server.log.append(line)
+            if command == b"SLOW":
+                time.sleep(0.3)
+            if command.startswith(b"SET"):
+                continue
+            time.sleep(self.server.delay)
+            self.wfile.write(address + b":" + command + b"\r\n")
+
+
+class Bus(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, delay=0.):
+        super().__init__(("127.0.0.1", 0), BusHandler)
+        self.delay = delay
+        self.log = []
+
+
+@pytest.fixture
+def bus():
+    server = Bus(delay=0.002)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestGateway(object):
+    """Test class of 'maodevice.communicator.Gateway'
+    """
+    def test_devices(self, bus):
+        """Test method for devices sharing a gateway
+        """
+        gateway = Gateway(*bus.server_address)
+        md = Md20M(gateway.channel("md", prefix=b"@1 "))
+        lta = Lta20Q(gateway.channel("lta", prefix=b"@2 "))
+        assert gateway.running
+
+        md.set_vadj(1.5)
+        assert md.show_status() == b"@1:READ\r\n"
+        assert lta.show_status() == b"@2:READ\r\n"
+        assert bus.log[0] == b"@1 SETADJ:1.5\r\n"
+
+        md.close()
+        assert gateway.running
+        lta.close()
+        assert not gateway.running
+
+    def test_fair(self, bus):
+        """Test method for serving the channels in round robin
+        """
+        gateway = Gateway(*bus.server_address)
+        busy = gateway.channel("busy", prefix=b"@1 ")
+        idle = gateway.channel("idle", prefix=b"@2 ")
+        busy.open()
+        idle.open()
+
+        replies = []
+        threads = [
+            threading.Thread(target=lambda: replies.append(
+                busy.query("READ")))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.005)
+        assert idle.query("READ") == b"@2:READ\r\n"
+        served = [line[:2] for line in bus.log]
+        assert served.index(b"@2") <= 3
+        for thread in threads:
+            thread.join()
+        assert replies == [b"@1:READ\r\n"] * 10
+
+        busy.close()
+        idle.close()
+
+    def test_timeout(self, bus):
+        """Test method for discarding a late reply after a timeout
+        """
+        gateway = Gateway(*bus.server_address, timeout=0.1)
+        com = gateway.channel("md", prefix=b"@1 ")
+        com.open()
+        with pytest.raises(socket.timeout):
+            com.query("SLOW")
+        time.sleep(0.3)
+        assert com.query("READ") == b"@1:READ\r\n"
+        com.close()
+
+    def test_batch(self, bus):
+        """Test method for batched messages on a prefixed channel
+        """
+        gateway = Gateway(*bus.server_address)
+        com = gateway.channel("md", prefix=b"@1 ")
+        com.open()
+        with com.batch():
+            com.send("SETA 1")
+            com.send("SETB 2")
+            assert com.query("READ") == b"@1:READ\r\n"
+        with com.batch():
+            com.send("SETC 3")
+        com.query("READ")
+        com.close()
+
+        assert bus.log == [
+            b"@1 SETA 1\r\n", b"@1 SETB 2\r\n", b"@1 READ\r\n",
+            b"@1 SETC 3\r\n", b"@1 READ\r\n",
+        ]
+
+    def test_closed(self, bus):
+        """Test method for a query before the channel is opened
+        """
+        gateway = Gateway(*bus.server_address)
+        com = gateway.channel("md")
+        with pytest.raises(ConnectionError):
+            com.query("READ")
+
+
+class TestTerminator(object):
+    """Test class of the termination character of each instance
+    """
+    def test_instance(self):
+        """Test method for the terminator set per instance
+        """
+        com1 = SocketCom("127.0.0.1", 1)
+        com2 = SocketCom("127.0.0.1", 2)
+        com1.set_terminator(";")
+        assert com1.terminator == ";"
+        assert com2.terminator == SocketCom.terminator == "\n"
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import time
+
+import numpy as np
+import pytest
+from maodevice.core import DeviceGroup, PerMember
+from maodevice.correlator import OctadS
+from maodevice.exceptions import FleetError
+from maodevice.transmitter import Md20M
+from tests.conftest import FakeCom
+
+
+def make_group(delays):
+    coms = [FakeCom(f"STATUS {delay}\r\n".encode(), delay=delay)
+            for delay in delays]
+    return DeviceGroup([Md20M(com) for com in coms]), coms
+
+
+class TestDeviceGroup(object):
+    """Test class of 'maodevice.core.DeviceGroup'
+    """
+    def test_slowest(self):
+        """Test method for the time bounded by the slowest member
+        """
+        group, _ = make_group([0.05, 0.05, 0.05, 0.2])
+        start = time.perf_counter()
+        results = group.show_status()
+        assert time.perf_counter() - start < 0.35
+        assert results.ok
+        assert results.elapsed["member3"] >= 0.2
+        assert results.values["member0"] == b"STATUS 0.05\r\n"
+
+    def test_per_member_array(self):
+        """Test method for the arguments of each member
+        """
+        group, coms = make_group([0., 0., 0.])
+        group.set_vgain(PerMember(np.array([5., 6.5, 7.])))
+        assert [com.written[-1] for com in coms] == [
+            b"SETGAIN:5.0\r\n", b"SETGAIN:6.5\r\n", b"SETGAIN:7.0\r\n",
+        ]
+        group.set_vbias(vbias=PerMember({
+            "member0": 1., "member1": 2., "member2": 3.,
+        }))
+        assert coms[2].written[-1] == b"SETBIAS:3.0\r\n"
+
+        with pytest.raises(AssertionError):
+            group.set_vgain(PerMember([5., 6.]))
+
+    def test_to_array(self):
+        """Test method for converting the results to an array
+        """
+        group, _ = make_group([0., 0.01])
+        array = group.show_status().to_array()
+        assert array.dtype.names == ("name", "value", "error", "elapsed")
+        assert list(array["name"]) == ["member0", "member1"]
+        assert array["elapsed"][1] >= 0.01
+
+    def test_errors(self):
+        """Test method for the errors of the members
+        """
+        group, _ = make_group([0., 0.])
+        results = group.set_vgain(PerMember([5., 100.]))
+        assert not results.ok
+        assert isinstance(results.errors["member1"], AssertionError)
+        with pytest.raises(FleetError) as info:
+            results.raise_for_errors()
+        assert list(info.value.errors) == ["member1"]
+
+    def test_unknown(self):
+        """Test method for an unknown method
+        """
+        group, _ = make_group([0.])
+        with pytest.raises(AttributeError):
+            group.no_such_method()
+        with group:
+            pass
+
+    def test_member_errors(self):
+        """Test method for the errors of some members
+        """
+        group, _ = make_group([0., 0.])
+        results = group.set_vgain(PerMember({"member0": 5.}))
+        assert list(results.errors) == ["member1"]
+        assert isinstance(results.errors["member1"], KeyError)
+
+        group = DeviceGroup([Md20M(FakeCom()), OctadS(FakeCom())])
+        results = group.call("set_vgain", 6.)
+        assert list(results.errors) == ["member1"]
+        assert isinstance(results.errors["member1"], AttributeError)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+
+import pytest
+
+
+def imported_modules(stmt):
+    """Return the modules imported by executing the statement.
+    """
+    code = f"import sys; {stmt}; print(' '.join(sys.modules))"
+    out = subprocess.check_output([sys.executable, "-c", code])
+    return set(out.decode().split())
+
+
+@pytest.mark.parametrize(
+    "stmt, unexpected",
+    [
+        ("import maodevice", {
+            "serial",
+            "maodevice.communicator",
+            "maodevice.correlator",
+            "maodevice.transmitter",
+        }),
+        ("from maodevice.correlator import OctadS", {
+            "serial",
+            "maodevice.transmitter",
+        }),
+        ("from maodevice.communicator import SerialCom", {"serial"}),
+    ],
+)
+def test_lazy_import(stmt, unexpected):
+    """Test function of lazy loading of 'maodevice'
+    """
+    assert not imported_modules(stmt) & unexpected
+
+
+def test_lazy_attributes():
+    """Test function of 'maodevice.utils.lazy.lazy_loader'
+    """
+    import maodevice
+    from maodevice.correlator import OctadS
+
+    assert maodevice.OctadS is OctadS
+    assert maodevice.correlator.OctadS is OctadS
+    assert "Model3390AWG" in dir(maodevice.transmitter)
+
+    with pytest.raises(AttributeError):
+        maodevice.foo
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+from maodevice.correlator import OctadS
+from maodevice.probe import ProbeCache, probe
+from maodevice.transmitter import Model3390AWG
+from tests.conftest import FakeCom
+
+IDN = b"Keithley Instruments Inc., 3390, 1234567, 1.02-0B1\n"
+
+
+def identity_com(idn=IDN):
+    """Communicator which answers "*IDN?" and "SYST:VERS?"."""
+    def reply(msg):
+        if msg.endswith(b"*IDN?\n"):
+            return idn
+        if msg.endswith(b"SYST:VERS?\n"):
+            return b"1999.0\n"
+        return b'+0,"No error"\n'
+    return FakeCom(reply)
+
+
+def system_com(temp="45.2", status="none"):
+    """Communicator which answers "show_system?" of "OCTAD-S"."""
+    return FakeCom(f"serial=OS0012, fw_ver=1.2.3, temp={temp}, "
+                   f"status={status};".encode(), terminator=";")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ProbeCache(str(tmp_path / "probes.json"))
+
+
+class TestProbe(object):
+    """Test class of 'maodevice.probe.probe'
+    """
+    def test_first(self, cache):
+        """Test method for the first probe of a device
+        """
+        awg = Model3390AWG(identity_com())
+        result = awg.probe(cache)
+
+        assert not result.cached
+        assert result.key == "Model3390AWG:" + IDN.decode().strip()
+        assert awg.capabilities["query_scpi_version"] == b"1999.0\n"
+        assert awg.com.count(b"SYST:VERS?") == 1
+
+    def test_cached(self, cache):
+        """Test method for the probe cached by another process
+        """
+        Model3390AWG(identity_com()).probe(cache)
+
+        # A new process reads the file.
+        cache = ProbeCache(cache.path)
+        awg = Model3390AWG(identity_com())
+        result = awg.probe(cache)
+
+        assert result.cached
+        assert awg.capabilities["query_scpi_version"] == b"1999.0\n"
+        assert awg.com.count(b"*IDN?") == 1
+        assert awg.com.count(b"SYST:VERS?") == 0
+
+    def test_refresh(self, cache):
+        """Test method for refreshing the cache
+        """
+        Model3390AWG(identity_com()).probe(cache)
+        awg = Model3390AWG(identity_com())
+        result = awg.probe(cache, refresh=True)
+
+        assert not result.cached
+        assert awg.com.count(b"SYST:VERS?") == 1
+
+    def test_firmware_update(self, cache):
+        """Test method for the identity changed by a firmware update
+        """
+        Model3390AWG(identity_com()).probe(cache, name="awg")
+        idn = IDN.replace(b"1.02", b"1.03")
+        awg = Model3390AWG(identity_com(idn))
+        result = awg.probe(cache, name="awg")
+
+        assert not result.cached
+        assert awg.com.count(b"SYST:VERS?") == 1
+        with open(cache.path) as f:
+            data = json.load(f)
+        assert list(data["entries"]) == [result.key]
+        assert data["devices"] == {"awg": result.key}
+
+    def test_probes_changed(self, cache, monkeypatch):
+        """Test method for the probes changed by the handler
+        """
+        Model3390AWG(identity_com()).probe(cache)
+        monkeypatch.setattr(
+            Model3390AWG, "PROBES",
+            ("query_scpi_version", "query_function"),
+        )
+        awg = Model3390AWG(identity_com())
+
+        assert not probe(awg, cache).cached
+        assert "query_function" in awg.capabilities
+
+    def test_invalidate(self, cache):
+        """Test method for invalidating the entry of a device
+        """
+        Model3390AWG(identity_com()).probe(cache, name="awg")
+        cache.invalidate(name="awg")
+
+        assert not Model3390AWG(identity_com()).probe(cache).cached
+
+    def test_volatile_fields(self, cache):
+        """Test method for the identity without volatile fields
+        """
+        first = OctadS(system_com()).probe(cache, name="octad")
+        octad = OctadS(system_com(temp="47.0", status="alarm"))
+        result = octad.probe(cache, name="octad")
+
+        assert result.cached
+        assert result.key == first.key == "OctadS:serial=OS0012,fw_ver=1.2.3"
+        assert octad.capabilities["show_system"] == result.identity
+        with open(cache.path) as f:
+            assert len(json.load(f)["entries"]) == 1
+
+
+class TestProbeCache(object):
+    """Test class of 'maodevice.probe.ProbeCache'
+    """
+    def test_bytes(self, cache):
+        """Test method for caching bytes
+        """
+        cache.put("key", "id", {"raw": b"\x00\xff"})
+        cache.reload()
+
+        assert cache.get("key")["results"] == {"raw": b"\x00\xff"}
+
+    def test_broken_file(self, cache):
+        """Test method for a broken cache file
+        """
+        with open(cache.path, "w") as f:
+            f.write("{")
+
+        assert cache.get("key") is None
+
+
+if __name__ == "__main__":
+    pytest.main()
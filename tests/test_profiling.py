@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+from maodevice.utils.profiling import StackProfiler, profiled, profiler
+
+SCRIPT = textwrap.dedent('''
+    from maodevice.transmitter import Model3390AWG
+    from maodevice.utils.decorators import limitter
+    from tests.conftest import FakeCom
+
+
+    @limitter("volt", 0., 5., 0.01)
+    def set_volt(volt):
+        return volt
+
+
+    awg = Model3390AWG(FakeCom(b'+0,"No error"\\n'))
+    for _ in range(10):
+        awg.set_frequency(1000.)
+    set_volt(1.5)
+''')
+
+
+class TestStackProfiler(object):
+    """Test class of 'maodevice.utils.profiling.StackProfiler'
+    """
+    def test_self_time(self):
+        """Test method for the self time of the stacks
+        """
+        prof = StackProfiler()
+        prof.enter("outer")
+        time.sleep(0.01)
+        prof.enter("inner")
+        time.sleep(0.02)
+        prof.exit()
+        prof.exit()
+
+        stats = prof.stats()
+        assert set(stats) == {"outer", "outer;inner"}
+        assert 0.01e9 <= stats["outer"]["self"] < 0.02e9
+        assert stats["outer;inner"]["self"] >= 0.02e9
+        assert stats["outer;inner"]["calls"] == 1
+
+        lines = prof.collapsed()
+        assert lines[0].startswith("outer ")
+        prof.reset()
+        assert prof.stats() == {}
+
+    def test_profiled(self):
+        """Test method for the decorator
+        """
+        def func():
+            return 1
+
+        assert profiled("layer", enabled=False)(func) is func
+        wrapped = profiled("layer", enabled=True)(func)
+        assert wrapped() == 1
+        assert profiler.stats()["layer"]["calls"] == 1
+        profiler.reset()
+
+
+class TestEnvironment(object):
+    """Test class of profiling enabled by the environment variable
+    """
+    def test_folded(self, tmp_path):
+        """Test method for the folded stacks written at exit
+        """
+        path = tmp_path / "profile.folded"
+        env = dict(os.environ, MAODEVICE_PROFILE=str(path))
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env["PYTHONPATH"] = root
+        subprocess.run(
+            [sys.executable, "-c", SCRIPT], env=env, check=True,
+        )
+
+        stacks = {}
+        for line in path.read_text().splitlines():
+            stack, _, value = line.rpartition(" ")
+            stacks[stack] = int(value)
+
+        call = "Model3390AWG.set_frequency"
+        assert f"{call};encode" in stacks
+        assert f"{call};transport:send" in stacks
+        validate = f"{call};validate:Model3390AWGValidator"
+        assert f"{validate};transport:exchange;transport:send" in stacks
+        assert "check:limitter(volt)" in stacks
+
+    @pytest.mark.parametrize("value", ["0", "false", "No", "off"])
+    def test_disabled(self, tmp_path, value):
+        """Test method for the values which disable profiling
+        """
+        env = dict(os.environ, MAODEVICE_PROFILE=value)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env["PYTHONPATH"] = root
+        subprocess.run(
+            [sys.executable, "-c", SCRIPT
+             + "from maodevice.utils import profiling\n"
+             "assert not profiling.ENABLED\n"],
+            env=env, cwd=tmp_path, check=True,
+        )
+
+        assert list(tmp_path.iterdir()) == []
+
+
+if __name__ == "__main__":
+    pytest.main()
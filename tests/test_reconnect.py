@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import pytest
+from maodevice.communicator import ReconnectingCom
+from maodevice.communicator.reconnect import is_query
+from maodevice.correlator import OctadS
+from maodevice.exceptions import ConnectionLostError
+from tests.conftest import FakeCom
+
+
+class FlakyCom(FakeCom):
+    """Communicator which fails at the given operations.
+    """
+    def __init__(self, failures=(), refusals=0):
+        super().__init__(lambda msg: msg.rstrip() + b":ok")
+        self.failures = list(failures)
+        self.refusals = refusals
+
+    def open(self):
+        if self.refusals:
+            self.refusals -= 1
+            raise ConnectionRefusedError()
+        super().open()
+
+    def write(self, data):
+        if self.failures and self.failures.pop(0):
+            raise BrokenPipeError()
+        super().write(data)
+
+
+class TestReconnectingCom(object):
+    """Test class of 'maodevice.communicator.ReconnectingCom'
+    """
+    def test_replay_query(self):
+        """Test method for replaying an idempotent query
+        """
+        inner = FlakyCom(failures=[True], refusals=2)
+        com = ReconnectingCom(inner, backoff=0., idempotent=is_query)
+        com.open()
+        assert com.query("FREQ?") == b"FREQ?:ok"
+        assert inner.opened == 2
+
+    def test_non_idempotent(self):
+        """Test method for sends which cannot be replayed
+        """
+        inner = FlakyCom(failures=[False, False, True])
+        com = ReconnectingCom(inner, backoff=0.)
+        com.open()
+        com.send("VOLT:HIGH 1")
+        com.send("VOLT:LOW 0")
+
+        with pytest.raises(ConnectionLostError) as err:
+            com.send("OUTP ON")
+        assert err.value.msg == "OUTP ON"
+        assert err.value.applied == ["VOLT:HIGH 1", "VOLT:LOW 0"]
+        assert not com.connection
+
+        # The next operation reconnects.
+        com.send("OUTP ON")
+        assert inner.opened == 2
+        assert com.query("*OPC?") == b"*OPC?:ok"
+        assert list(com.applied) == []
+
+    def test_batch(self):
+        """Test method for messages coalesced by 'batch'
+        """
+        inner = FlakyCom(failures=[True])
+        com = ReconnectingCom(inner, backoff=0.)
+        com.open()
+        with pytest.raises(ConnectionLostError) as err:
+            with com.batch():
+                com.send("VOLT:HIGH 1")
+                com.send("VOLT:LOW 0")
+        assert err.value.msg == "VOLT:HIGH 1\nVOLT:LOW 0"
+
+        with com.batch():
+            com.send("OUTP ON")
+            assert com.query("FREQ?") == b"OUTP ON\nFREQ?:ok"
+
+    def test_commands(self):
+        """Test method for replaying the idempotent commands of a handler
+        """
+        inner = FlakyCom(failures=[True])
+        octad = OctadS(ReconnectingCom(inner, backoff=0.))
+        assert octad.show_temperature() == b"show_temp?;:ok"
+        assert inner.opened == 2
+
+        # "show_status" is READ & CLEAR, so it is not replayed.
+        inner.failures = [True]
+        with pytest.raises(ConnectionLostError):
+            octad.show_status()
+        assert inner.count(b"show_status?") == 0
+
+        # A message out of the command table is not replayed.
+        inner.failures = [True]
+        with pytest.raises(ConnectionLostError):
+            octad.com.query("foo?")
+
+    def test_give_up(self):
+        """Test method for exceeding the retries
+        """
+        com = ReconnectingCom(FlakyCom(refusals=10), retries=2, backoff=0.)
+        with pytest.raises(ConnectionLostError):
+            com.query("FREQ?")
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import math
+import time
+
+import pytest
+from maodevice.communicator import RecordingCom, ReplayCom
+from maodevice.communicator.record import read_records
+from maodevice.correlator import OctadS
+from maodevice.exceptions import ReplayError
+from tests.conftest import FakeCom
+
+
+def echo_com(delay=0.):
+    """Communicator which echoes the last message after a delay."""
+    return FakeCom(lambda msg: b"reply:" + msg, latency=delay)
+
+
+def record_session(path, delay=0.):
+    with RecordingCom(echo_com(delay), path) as com:
+        octad = OctadS(com)
+        octad.select_correlation_scaling(5, 12)
+        ret = octad.show_temperature()
+    return ret
+
+
+class TestRecordingCom(object):
+    """Test class of 'maodevice.communicator.RecordingCom'
+    """
+    def test_records(self, tmp_path):
+        """Test method for the records of a session
+        """
+        path = tmp_path / "session.rec"
+        record_session(path)
+
+        _, records = read_records(path)
+        assert [r.kind for r in records] == ["O", "W", "W", "R", "C"]
+        assert records[1].data == b"set_scaling5=12;"
+        assert records[3].data == b"reply:show_temp?;"
+        assert all(a.time <= b.time for a, b in zip(records, records[1:]))
+
+    def test_reopen(self, tmp_path):
+        """Test method for recording a reopened connection
+        """
+        path = tmp_path / "session.rec"
+        with RecordingCom(echo_com(), path) as com:
+            octad = OctadS(com)
+            octad.close()
+            octad.open()
+            octad.show_temperature()
+
+        _, records = read_records(path)
+        assert [r.kind for r in records] == ["O", "C", "O", "W", "R", "C"]
+
+
+class TestReplayCom(object):
+    """Test class of 'maodevice.communicator.ReplayCom'
+    """
+    def test_replay(self, tmp_path):
+        """Test method for replaying a recorded session
+        """
+        path = tmp_path / "session.rec"
+        expected = record_session(path)
+
+        com = ReplayCom(path, speed=math.inf)
+        octad = OctadS(com)
+        octad.select_correlation_scaling(5, 12)
+        assert octad.show_temperature() == expected
+        octad.close()
+        assert com.done
+
+    def test_latency(self, tmp_path):
+        """Test method for replaying the latency at a speed
+        """
+        path = tmp_path / "session.rec"
+        record_session(path, delay=0.2)
+
+        for speed, min_sec, max_sec in [(1., 0.19, 0.4), (4., 0.04, 0.15)]:
+            octad = OctadS(ReplayCom(path, speed=speed))
+            octad.select_correlation_scaling(5, 12)
+            start = time.perf_counter()
+            octad.show_temperature()
+            assert min_sec <= time.perf_counter() - start <= max_sec
+
+    def test_mismatch(self, tmp_path):
+        """Test method for a message which differs from the record
+        """
+        path = tmp_path / "session.rec"
+        record_session(path)
+
+        octad = OctadS(ReplayCom(path, speed=math.inf))
+        with pytest.raises(ReplayError):
+            octad.select_correlation_scaling(5, 13)
+
+
+if __name__ == "__main__":
+    pytest.main()
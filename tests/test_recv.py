@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import socketserver
+import threading
+
+import numpy as np
+import pytest
+from maodevice.communicator import SocketCom
+from maodevice.scpi import ieee_block
+from tests.conftest import FakeCom
+
+PAYLOAD = np.arange(50000, dtype="<i2")
+
+
+class BlockHandler(socketserver.StreamRequestHandler):
+    """Answer a binary block to "DATA?" and the message to the others.
+    """
+    def handle(self):
+        for line in self.rfile:
+            if line.strip() == b"DATA?":
+                block = ieee_block(PAYLOAD.tobytes()) + b"\n"
+                # Send in pieces to exercise partial receives.
+                for i in range(0, len(block), 7000):
+                    self.wfile.write(block[i:i + 7000])
+                    self.wfile.flush()
+            else:
+                self.wfile.write(line)
+
+
+@pytest.fixture
+def server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), BlockHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestReceiveBuffer(object):
+    """Test class of the receive path with a reusable buffer
+    """
+    def test_recv_view(self, server):
+        """Test method for receiving into the reusable buffer
+        """
+        com = SocketCom(*server.server_address)
+        com.open()
+        com.send("show_temp?")
+        first = com.recv_view()
+        assert isinstance(first, memoryview)
+        assert bytes(first) == b"show_temp?\n"
+        com.send("FREQ?")
+        second = com.recv_view()
+        assert bytes(second) == b"FREQ?\n"
+        assert second.obj is first.obj
+        com.close()
+
+    def test_query_block(self, server):
+        """Test method for querying a binary block
+        """
+        com = SocketCom(*server.server_address)
+        com.open()
+        block = com.query_block("DATA?")
+        assert np.array_equal(np.frombuffer(block, "<i2"), PAYLOAD)
+
+        out = np.empty_like(PAYLOAD)
+        com.query_block("DATA?", out=out)
+        assert np.array_equal(out, PAYLOAD)
+        assert com.query("FREQ?") == b"FREQ?\n"
+        com.close()
+
+    def test_fallback(self):
+        """Test method for reading a block without a socket
+        """
+        com = FakeCom(data=ieee_block(b"hello world") + b"\n", chunk=3)
+        assert bytes(com.read_block()) == b"hello world"
+        assert not com.buffer
+
+        with pytest.raises(ValueError):
+            FakeCom(data=b"+0,\"No error\"\n", chunk=3).read_block()
+        with pytest.raises(OSError):
+            FakeCom(data=b"#15hel", chunk=3).read_block()
+
+    def test_terminator(self):
+        """Test method for the terminator after a block
+        """
+        com = FakeCom(b"+0\r\n", data=ieee_block(b"hello") + b"\r\n",
+                      terminator="\r\n", chunk=1)
+        assert bytes(com.read_block()) == b"hello"
+        assert not com.buffer
+
+        com.chunk = None
+        assert com.query("SYST:ERR?") == b"+0\r\n"
+
+
+if __name__ == "__main__":
+    pytest.main()
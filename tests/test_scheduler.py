@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import time
+from datetime import datetime, timezone
+
+import pytest
+from maodevice.scheduler import CommandScheduler, to_timestamp
+
+
+class Device(object):
+    """Device which records the times of the calls.
+    """
+    def __init__(self):
+        self.calls = []
+
+    def start_correlation(self, start):
+        self.calls.append((time.time(), "start", start))
+        return start
+
+    def stop_correlation(self):
+        self.calls.append((time.time(), "stop", None))
+
+    def fail(self):
+        raise ValueError("failed")
+
+
+class TestCommandScheduler(object):
+    """Test class of 'maodevice.scheduler.CommandScheduler'
+    """
+    def test_order_and_accuracy(self):
+        """Test method for the order and the times of execution
+        """
+        device = Device()
+        scheduler = CommandScheduler()
+        t0 = time.time() + 0.05
+        scheduler.schedule(t0 + 0.04, device, "stop_correlation")
+        scheduler.schedule(t0, device, "start_correlation", "20201224")
+        scheduler.run()
+
+        assert [c[1] for c in device.calls] == ["start", "stop"]
+        assert [r.value for r in scheduler.audit] == ["20201224", None]
+        for record in scheduler.audit:
+            assert record.sent >= record.scheduled
+            assert record.done >= record.sent
+        assert scheduler.lateness()["count"] == 2
+
+    def test_submillisecond(self):
+        """Test method for the lateness below a millisecond
+        """
+        device = Device()
+        scheduler = CommandScheduler()
+        t0 = time.time() + 0.05
+        scheduler.schedule_many([
+            (t0 + 0.01 * i, device, "stop_correlation") for i in range(20)
+        ])
+        scheduler.run()
+
+        late = sorted(r.sent - r.scheduled for r in scheduler.audit)
+        assert late[0] >= 0
+        assert (late[9] + late[10]) / 2 < 0.001
+
+    def test_spin_bound(self):
+        """Test method for the spin bounded by the monotonic clock
+        """
+        scheduler = CommandScheduler(spin=0.01)
+        start = time.perf_counter()
+        # An entry far ahead, e.g. after the wall clock stepped back.
+        scheduler._execute(
+            (time.time() + 100, 0, Device(), "stop_correlation", (), {})
+        )
+        assert time.perf_counter() - start < 0.5
+
+    def test_many(self):
+        """Test method for scheduling and cancelling many entries
+        """
+        device = Device()
+        scheduler = CommandScheduler(spin=0.)
+        t0 = time.time()
+        entries = [(t0 - i, device, "stop_correlation") for i in range(1000)]
+        seqs = scheduler.schedule_many(entries)
+        assert len(scheduler) == 1000
+        assert scheduler.next_time == t0 - 999
+        scheduler.cancel(seqs[-1])
+        assert scheduler.next_time == t0 - 998
+        scheduler.run()
+        assert len(device.calls) == 999
+        assert [r.seq for r in scheduler.audit][:2] == [seqs[-2], seqs[-3]]
+
+    def test_errors_and_lateness(self, tmp_path):
+        """Test method for the errors and the skipped entries
+        """
+        device = Device()
+        scheduler = CommandScheduler(max_lateness=1.)
+        now = time.time()
+        scheduler.schedule(now - 10, device, "stop_correlation")
+        scheduler.schedule(now, device, "fail")
+        scheduler.schedule(now, device, lambda d, x: x * 2, 21)
+        scheduler.run()
+
+        skipped, failed, called = scheduler.audit
+        assert skipped.error == "skipped" and not device.calls
+        assert failed.error == "ValueError: failed"
+        assert called.value == 42 and called.command == "<lambda>"
+
+        path = tmp_path / "audit.jsonl"
+        scheduler.dump_audit(path)
+        assert len(path.read_text().splitlines()) == 3
+
+    def test_background(self):
+        """Test method for executing in the background
+        """
+        device = Device()
+        with CommandScheduler() as scheduler:
+            scheduler.start()
+            time.sleep(0.01)
+            t0 = time.time() + 0.03
+            scheduler.schedule(t0, device, "stop_correlation")
+            time.sleep(0.06)
+            assert len(device.calls) == 1
+            assert abs(device.calls[0][0] - t0) < 0.002
+            scheduler.schedule(time.time() + 10, device, "stop_correlation")
+        assert len(scheduler) == 1
+
+    def test_unknown_command(self):
+        """Test method for an unknown command
+        """
+        with pytest.raises(AttributeError):
+            CommandScheduler().schedule(0, Device(), "no_such_command")
+
+
+class TestToTimestamp(object):
+    """Test class of 'maodevice.scheduler.to_timestamp'
+    """
+    def test_naive_utc(self):
+        """Test method for a naive datetime in UTC
+        """
+        when = datetime(2020, 12, 24, 12, 34, 56)
+        expected = datetime(2020, 12, 24, 12, 34, 56, tzinfo=timezone.utc)
+        assert to_timestamp(when) == expected.timestamp()
+        assert to_timestamp(1.5) == 1.5
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+import socket
+
+import pytest
+from maodevice.exceptions import (
+    Model3390AWGCommandError, Model3390AWGDeviceError, Model3390AWGError,
+    Model3390AWGExecutionError,
+)
+from maodevice.scpi import ErrorQueue, parse_errors
+from maodevice.transmitter import Model3390AWG
+from tests.conftest import FakeCom
+
+NO_ERROR = b'+0,"No error"'
+
+
+class ErrorQueueCom(FakeCom):
+    """Communicator which simulates the error queue of a SCPI device.
+    """
+    def __init__(self, errors=(), chunk=None):
+        super().__init__(chunk=chunk)
+        self.queue = list(errors)
+
+    def answer(self, msg):
+        replies = []
+        for _ in range(msg.count(b"SYST:ERR?")):
+            replies.append(self.queue.pop(0) if self.queue else NO_ERROR)
+        return b";".join(replies) + b"\n"
+
+
+class TestParseErrors(object):
+    """Test class of 'maodevice.scpi.parse_errors'
+    """
+    def test_parse(self):
+        """Test method for parsing the replies of SYST:ERR?
+        """
+        raw = b'-222,"Data out of range";-113,"Say ""hi""";+0,"No error"\n'
+        errors = parse_errors(raw, t=1.)
+        assert [(e.code, e.message) for e in errors] == [
+            (-222, "Data out of range"),
+            (-113, 'Say "hi"'),
+            (0, "No error"),
+        ]
+        assert all(e.time == 1. for e in errors)
+
+
+class TestErrorQueue(object):
+    """Test class of 'maodevice.scpi.ErrorQueue'
+    """
+    def test_chunked(self):
+        """Test method for draining the replies received in pieces
+        """
+        com = ErrorQueueCom([b'-222,"Data out of range"'] * 3, chunk=7)
+        queue = ErrorQueue(com, depth=5)
+
+        assert [e.code for e in queue.drain()] == [-222] * 3
+        assert com.buffer == b""
+        assert queue.drain() == []
+
+    def test_incomplete(self):
+        """Test method for an incomplete reply
+        """
+        com = ErrorQueueCom(chunk=7)
+        queue = ErrorQueue(com, depth=2)
+        com.write = lambda data: com.buffer.extend(NO_ERROR)
+
+        with pytest.raises(socket.timeout):
+            queue.drain()
+
+    def test_one_exchange(self):
+        """Test method for draining the queue in one exchange
+        """
+        com = ErrorQueueCom([b'-222,"Data out of range"'] * 3)
+        queue = ErrorQueue(com, depth=5, clock=lambda: 10.)
+        errors = queue.drain()
+        assert [e.code for e in errors] == [-222] * 3
+        assert len(com.written) == 1
+        assert com.written[0].count(b"SYST:ERR?") == 5
+        assert list(queue.log) == errors
+        assert queue.since(5.) == errors and queue.since(10.) == []
+
+    def test_full(self):
+        """Test method for draining a queue deeper than the depth
+        """
+        com = ErrorQueueCom([b'-350,"Queue overflow"'] * 4)
+        errors = ErrorQueue(com, depth=2).drain()
+        assert len(errors) == 4
+        assert len(com.written) == 3
+
+    def test_no_error(self):
+        """Test method for an empty queue
+        """
+        com = ErrorQueueCom()
+        queue = ErrorQueue(com)
+        assert queue.drain() == []
+        assert len(queue.log) == 0
+
+
+class TestModel3390AWGError(object):
+    """Test class of errors of 'Model3390AWG'
+    """
+    @pytest.mark.parametrize("code, expected", [
+        (-113, Model3390AWGCommandError),
+        (-222, Model3390AWGExecutionError),
+        (-350, Model3390AWGDeviceError),
+        (501, Model3390AWGDeviceError),
+    ])
+    def test_from_errors(self, code, expected):
+        """Test method for the error class of a code
+        """
+        errors = parse_errors(f'{code},"error"'.encode())
+        error = Model3390AWGError.from_errors(errors)
+        assert type(error) is expected
+        assert error.code == code
+
+    def test_validate(self):
+        """Test method for raising the errors of a setter
+        """
+        com = ErrorQueueCom()
+        awg = Model3390AWG(com)
+        com.queue = [b'-222,"Data out of range"', b'-221,"Settings conflict"']
+        with pytest.raises(Model3390AWGExecutionError) as info:
+            awg.set_frequency(1e9)
+        assert [e.code for e in info.value.errors] == [-222, -221]
+        assert len(awg.error_queue.log) == 2
+        assert com.written[-2] == b"FREQ 1000000000.0\n"
+        assert com.written[-1].count(b"SYST:ERR?") == 20
+
+        awg.set_frequency(1e3)
+        assert len(awg.error_queue.log) == 2
+
+
+if __name__ == "__main__":
+    pytest.main()
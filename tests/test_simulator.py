@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+import socket
+import threading
+
+import pytest
+from maodevice.communicator import SocketCom
+from maodevice.correlator import OctadS, octad_s
+from maodevice.correlator.vdif import parse_header
+from maodevice.simulator import DeviceSimulator, VdifSender
+from maodevice.transmitter import Model3390AWG, model3390_awg
+
+
+@pytest.fixture
+def octad():
+    with DeviceSimulator(octad_s.COMMANDS, ";",
+                         replies={"show_temperature": "42.5"}) as sim:
+        yield sim
+
+
+class TestDeviceSimulator(object):
+    """Test class of 'maodevice.simulator.DeviceSimulator'
+    """
+    def test_respond(self, octad):
+        """Test method for the replies to messages
+        """
+        assert octad.respond("show_temp?") == b"42.5"
+        assert octad.respond("show_1ppsgap?") == b"0"
+        assert octad.respond("set_iplen=1000") is None
+        assert octad.respond("foo") is None
+
+        assert octad.state["select_integration_time"] == {"integ_time": 1000}
+        assert octad.counts["unknown"] == 1
+
+    def test_handler(self, octad):
+        """Test method for a handler connected to the simulator
+        """
+        handler = OctadS(SocketCom(*octad.address))
+        try:
+            assert handler.show_temperature() == b"42.5;"
+            handler.set_vdif_destination_port(1, 60000)
+            handler.show_1pps_gap()
+        finally:
+            handler.close()
+
+        assert octad.state["set_vdif_destination_port"] == {
+            "n": 1, "port": 60000,
+        }
+        assert octad.counts["show_temperature"] == 1
+
+    def test_callback(self, octad):
+        """Test method for the callback of a command
+        """
+        called = []
+        octad.on("set_vdif_destination_port",
+                 lambda n, port: called.append((n, port)))
+        octad.respond("set_vdifdesport5=60001")
+
+        assert called == [(5, 60001)]
+
+    def test_compound(self):
+        """Test method for compound SCPI messages
+        """
+        replies = {"*IDN?": "Keithley,3390,1,1.0",
+                   "SYST:ERR?": '+0,"No error"'}
+        with DeviceSimulator(model3390_awg.COMMANDS, "\n", replies,
+                             separator=";:") as sim:
+            awg = Model3390AWG(SocketCom(*sim.address))
+            try:
+                awg.set_frequency(1000.)
+                assert awg.query_frequency() == b"0.0\n"
+            finally:
+                awg.close()
+
+        assert sim.state["set_frequency"] == {"freq": 1000.}
+        assert sim.counts["SYST:ERR?"] == awg.ERROR_QUEUE_DEPTH
+
+
+class TestVdifSender(object):
+    """Test class of 'maodevice.simulator.VdifSender'
+    """
+    def test_frame(self):
+        """Test method for the header of a frame
+        """
+        sender = VdifSender(1e6, frame_bytes=1056)
+        header = parse_header(sender.frame(3, 7, thread=5))
+
+        assert header.seconds == 3
+        assert header.frame_number == 7
+        assert header.frame_bytes == 1056
+        assert header.thread == 5
+        assert header.is_complex
+        assert header.bits_per_sample == 32
+
+    def test_rate(self):
+        """Test method for the rate of frames
+        """
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(("127.0.0.1", 0))
+        receiver.settimeout(0.5)
+        frames = []
+
+        def receive():
+            try:
+                while True:
+                    frames.append(parse_header(receiver.recv(2048)))
+            except socket.timeout:
+                pass
+
+        thread = threading.Thread(target=receive)
+        thread.start()
+        sender = VdifSender(1056 * 8 * 200, frame_bytes=1056)
+        sender.run(receiver.getsockname(), thread=2, duration=0.5)
+        thread.join()
+        receiver.close()
+
+        assert 90 <= sender.stats["sent"] <= 101
+        assert len(frames) == sender.stats["sent"]
+        assert [f.frame_number for f in frames] == list(range(len(frames)))
+
+
+if __name__ == "__main__":
+    pytest.main()
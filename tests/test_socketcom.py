@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import socket
+import socketserver
+import statistics
+import threading
+import time
+
+import pytest
+from maodevice.communicator import SocketCom
+
+
+class SetterHandler(socketserver.StreamRequestHandler):
+    """Answer "OK" to a query, and nothing to a setter.
+    """
+    def handle(self):
+        for line in self.rfile:
+            if line.strip().endswith(b"?"):
+                self.wfile.write(b"OK\n")
+
+
+@pytest.fixture
+def server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), SetterHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestSocketCom(object):
+    """Test class of 'maodevice.communicator.SocketCom'
+    """
+    def test_nodelay(self, server):
+        """Test method for sending a query right after a setter
+        """
+        com = SocketCom(*server.server_address)
+        com.open()
+        try:
+            assert com.sock.getsockopt(
+                socket.IPPROTO_TCP, socket.TCP_NODELAY
+            )
+            elapsed = []
+            for _ in range(10):
+                t0 = time.perf_counter()
+                com.send("SET 1")
+                assert com.query("SET?") == b"OK\n"
+                elapsed.append(time.perf_counter() - t0)
+        finally:
+            com.close()
+
+        # Nagle's algorithm holds the query until the delayed ACK of
+        # the setter, which takes about 40 ms on Linux.
+        assert statistics.median(elapsed) < 0.02
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+import os
+import socket
+import threading
+
+import pytest
+from maodevice.correlator import StatusDispatcher
+from maodevice.correlator.status import (
+    StatusClient,
+    StatusPublisher,
+    parse_status,
+)
+from maodevice.daemon import DaemonError
+
+
+BIT_ALIGNMENT = "DBBC_module_adc_de-multiplexer_bit-alignment_error"
+
+
+class ScriptedOctad(object):
+    """Device handler which replies the given statuses in order.
+    """
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.polled = 0
+
+    def show_status(self):
+        self.polled += 1
+        return self.replies.pop(0).encode()
+
+
+class TestParseStatus(object):
+    """Test class of 'maodevice.correlator.status.parse_status'
+    """
+    @pytest.mark.parametrize(
+        "raw, expected",
+        [
+            ("show_status=OK;", []),
+            (f"show_status={BIT_ALIGNMENT};", [BIT_ALIGNMENT]),
+            ("show_status=a_error, b_error a_error;\n",
+             ["a_error", "b_error"]),
+        ],
+    )
+    def test_parse(self, raw, expected):
+        """Test method for parsing alarm codes
+        """
+        assert parse_status(raw) == expected
+
+
+class TestStatusDispatcher(object):
+    """Test class of 'maodevice.correlator.StatusDispatcher'
+    """
+    def test_deduplicate(self):
+        """Test method for dispatching only the changes of alarms
+        """
+        octad = ScriptedOctad([
+            f"show_status={BIT_ALIGNMENT};",
+            f"show_status={BIT_ALIGNMENT},fan_error;",
+            f"show_status={BIT_ALIGNMENT};",
+            "show_status=OK;",
+        ])
+        dispatcher = StatusDispatcher(octad, clock=lambda: 0.)
+        received = []
+        dispatcher.subscribe(received.append)
+        for _ in range(4):
+            dispatcher.poll()
+
+        assert [(e.seq, e.code, e.state) for e in received] == [
+            (1, BIT_ALIGNMENT, "raised"),
+            (2, "fan_error", "raised"),
+            (3, "fan_error", "cleared"),
+            (4, BIT_ALIGNMENT, "cleared"),
+        ]
+        assert dispatcher.active == {}
+
+    def test_replay(self):
+        """Test method for replaying the events in the history
+        """
+        dispatcher = StatusDispatcher(None, history=2)
+        for codes in (["a"], ["b"], []):
+            dispatcher.update(codes)
+
+        assert [e.seq for e in dispatcher.since(1)] == [3, 4]
+        received = []
+        dispatcher.subscribe(received.append, since=3)
+        assert [(e.code, e.state) for e in received] == [("b", "cleared")]
+
+
+    def test_callback_unlocked(self):
+        """Test method for a callback which uses the dispatcher in a thread
+        """
+        dispatcher = StatusDispatcher(None)
+        threads = []
+
+        def callback(event):
+            thread = threading.Thread(target=dispatcher.unsubscribe,
+                                      args=(callback,))
+            thread.start()
+            thread.join(timeout=1.)
+            threads.append(thread)
+
+        dispatcher.subscribe(callback)
+        dispatcher.update(["a"])
+        assert not threads[0].is_alive()
+        dispatcher.update([])
+        assert len(threads) == 1
+
+
+class TestStatusPublisher(object):
+    """Test class of 'maodevice.correlator.status.StatusPublisher'
+    """
+    def test_socket(self, tmp_path):
+        """Test method for streaming events over the socket
+        """
+        path = os.fspath(tmp_path / "status.sock")
+        dispatcher = StatusDispatcher(None)
+        dispatcher.update(["a"])
+
+        with StatusPublisher(dispatcher, path, heartbeat=0.05) as publisher:
+            thread = threading.Thread(target=publisher.serve_forever)
+            thread.start()
+            try:
+                events = StatusClient(path, timeout=5).events(since=0)
+                assert next(events).code == "a"
+                dispatcher.update(["b"])
+                assert [next(events).code for _ in range(2)] == ["a", "b"]
+                events.close()
+            finally:
+                publisher.shutdown()
+                thread.join()
+        assert not os.path.exists(path)
+
+    def test_path(self, tmp_path):
+        """Test method for the socket path which is used or left
+        """
+        path = os.fspath(tmp_path / "status.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(path)
+        with StatusPublisher(StatusDispatcher(None), path):
+            with pytest.raises(DaemonError):
+                StatusPublisher(StatusDispatcher(None), path)
+            assert os.path.exists(path)
+        assert not os.path.exists(path)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+import socket
+import socketserver
+import threading
+import time
+
+import numpy as np
+import pytest
+from maodevice.communicator import AdaptiveTimeout, SocketCom
+from maodevice.communicator.timeouts import mnemonic
+from maodevice.utils.stats import Ewma, P2Quantile
+from tests.conftest import FakeCom
+
+
+class LateHandler(socketserver.StreamRequestHandler):
+    """Answer "R<n>" to "Q<n>", and late to "LATE<n>".
+    """
+    def handle(self):
+        for line in self.rfile:
+            msg = line.strip().decode()
+            if msg.startswith("LATE"):
+                time.sleep(0.3)
+            self.wfile.write(f"R{msg.lstrip('QLATE')}\n".encode())
+
+
+@pytest.fixture
+def server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), LateHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TimedCom(FakeCom):
+    """Communicator which records the read timeouts.
+    """
+    def __init__(self, replies=()):
+        super().__init__()
+        self.replies = list(replies)
+        self.timeouts = []
+
+    def settimeout(self, timeout):
+        self.timeouts.append(timeout)
+
+    def answer(self, msg):
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+class TestStats(object):
+    """Test class of 'maodevice.utils.stats.Ewma' and 'P2Quantile'
+    """
+    def test_estimates(self):
+        """Test method for the estimates of an exponential distribution
+        """
+        x = np.random.default_rng(0).exponential(1., 20000)
+        ewma, sketch = Ewma(0.01), P2Quantile(0.9)
+        for v in x.tolist():
+            ewma.update(v)
+            sketch.update(v)
+
+        assert ewma.mean == pytest.approx(1., abs=0.2)
+        assert ewma.std == pytest.approx(1., abs=0.3)
+        assert sketch.value == pytest.approx(np.quantile(x, 0.9), rel=0.02)
+
+    def test_few_samples(self):
+        """Test method for the quantile of a few samples
+        """
+        sketch = P2Quantile(0.5)
+        assert np.isnan(sketch.value)
+        for v in (3., 1., 2.):
+            sketch.update(v)
+        assert sketch.value == 2.
+
+
+class TestAdaptiveTimeout(object):
+    """Test class of 'maodevice.communicator.AdaptiveTimeout'
+    """
+    @pytest.mark.parametrize(
+        "data, expected",
+        [
+            (b"show_temp?;", "show_temp?"),
+            (b"set_iplen=5;show_system?;", "show_system?"),
+            (b"SOUR:FREQ 1000\n", "SOUR:FREQ"),
+            (b"*IDN?\r\n", "*IDN?"),
+        ],
+    )
+    def test_mnemonic(self, data, expected):
+        """Test method for the mnemonic of a message
+        """
+        assert mnemonic(data) == expected
+
+    def test_adapt(self):
+        """Test method for adapting the timeout to the latency
+        """
+        policy = AdaptiveTimeout(
+            default=1., min_samples=5, overrides={"show_system?": 10.}
+        )
+        for _ in range(10):
+            policy.observe("*IDN?", 0.01)
+        assert policy.timeout("*IDN?") == pytest.approx(0.05)
+        assert policy.timeout("FREQ?") == 1.
+        assert policy.timeout("show_system?") == 10.
+
+        policy.timed_out("*IDN?")
+        policy.timed_out("*IDN?")
+        assert policy.timeout("*IDN?") == pytest.approx(0.2)
+        policy.observe("*IDN?", 0.01)
+        assert policy.timeout("*IDN?") == pytest.approx(0.05)
+
+    def test_communicator(self):
+        """Test method for the timeouts set by a communicator
+        """
+        com = TimedCom([b"a"] * 3 + [socket.timeout(), b""])
+        com.set_timeout_policy(
+            AdaptiveTimeout(default=2., min_samples=2, floor=0.5)
+        )
+        for _ in range(3):
+            com.query("*IDN?")
+        with pytest.raises(socket.timeout):
+            com.query("*IDN?")
+        assert com.query("*IDN?") == b""
+
+        assert com.timeouts == [2., 0.5, 1.]
+        assert com.timeout_policy.stats()["*IDN?"]["count"] == 3
+        assert com.timeout_policy.timeout("*IDN?") == 2.
+
+    def test_late_reply(self, server):
+        """Test method for discarding the late reply of a timed-out query
+        """
+        com = SocketCom(*server.server_address)
+        com.open()
+        com.set_timeout_policy(AdaptiveTimeout(default=0.1))
+        try:
+            assert com.query("Q1") == b"R1\n"
+            with pytest.raises(socket.timeout):
+                com.query("LATE2")
+            time.sleep(0.4)
+            assert com.query("Q3") == b"R3\n"
+            assert com.query("Q4") == b"R4\n"
+        finally:
+            com.close()
+
+
+if __name__ == "__main__":
+    pytest.main()
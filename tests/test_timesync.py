@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+from maodevice.correlator import TimeSyncMonitor
+from maodevice.correlator.octad_s import COMMANDS
+from maodevice.utils.stats import RunningRegression
+
+
+class DriftingOctad(object):
+    """Device handler whose 1PPS gap drifts linearly.
+    """
+    COMMANDS = COMMANDS
+
+    def __init__(self, drift):
+        self.drift = drift
+        self.t = 0.
+        self.offset = 0.
+        self.synced = 0
+
+    def show_1pps_gap(self):
+        gap = round(self.offset + self.drift * self.t)
+        return f"show_1ppsgap={gap};".encode()
+
+    def synchronize_with_external(self):
+        self.offset = -self.drift * self.t
+        self.synced += 1
+
+
+class TestRunningRegression(object):
+    """Test class of 'maodevice.utils.stats.RunningRegression'
+    """
+    def test_sliding_window(self):
+        """Test method for the fit over a sliding window
+        """
+        rng = np.random.default_rng(0)
+        x = 1.6e9 + np.arange(100.)
+        y = 3. * np.arange(100.) + rng.normal(size=100)
+
+        reg = RunningRegression(window=16)
+        for xi, yi in zip(x, y):
+            reg.update(xi, yi)
+
+        slope, intercept = np.polyfit(x[-16:] - x[0], y[-16:], 1)
+        assert len(reg) == 16
+        assert reg.slope == pytest.approx(slope)
+        assert reg.predict(x[-1]) == pytest.approx(
+            intercept + slope * (x[-1] - x[0])
+        )
+        assert reg.solve(reg.predict(x[-1] + 10)) == pytest.approx(x[-1] + 10)
+
+    def test_undetermined(self):
+        """Test method for the fit of less than two points
+        """
+        reg = RunningRegression()
+        reg.update(1., 2.)
+        assert np.isnan(reg.slope)
+        assert reg.intercept == 2.
+
+
+class TestTimeSyncMonitor(object):
+    """Test class of 'maodevice.correlator.TimeSyncMonitor'
+    """
+    def test_predictive_alert(self):
+        """Test method for the alert before the gap exceeds the limit
+        """
+        octad = DriftingOctad(drift=1.)
+        monitor = TimeSyncMonitor(
+            octad, threshold=100., horizon=30., clock=lambda: octad.t
+        )
+        received = []
+        monitor.alerts.append(received.append)
+
+        alert = None
+        while alert is None:
+            octad.t += 1.
+            alert = monitor.poll()
+
+        assert octad.t == 70.
+        assert alert.drift == pytest.approx(1.)
+        assert alert.eta == pytest.approx(30.)
+        assert not alert.synced
+        assert received == [alert]
+
+    def test_auto_sync(self):
+        """Test method for the synchronization by an alert
+        """
+        octad = DriftingOctad(drift=-2.)
+        monitor = TimeSyncMonitor(
+            octad, threshold=100., horizon=10., holdoff=0., auto_sync=True,
+            clock=lambda: octad.t,
+        )
+        alerts = []
+        for _ in range(200):
+            octad.t += 1.
+            alert = monitor.poll()
+            if alert is not None:
+                alerts.append(alert)
+
+        assert octad.synced == len(alerts) >= 4
+        assert all(a.synced and a.gap > -100 for a in alerts)
+
+    def test_degenerate(self):
+        """Test method for skipping the alert of a degenerate fit
+        """
+        octad = DriftingOctad(drift=1.)
+        monitor = TimeSyncMonitor(octad, threshold=100., min_samples=3)
+
+        # All the samples at the same time cannot be fitted.
+        assert all(monitor.update(5., gap) is None for gap in (10., 50.))
+        assert monitor.update(5., 90.) is None
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+import pytest
+from maodevice.core import (
+    BaseDeviceHandler, BaseValidator, ValidationPolicy, query, setter,
+    unvalidated,
+)
+from maodevice.transmitter import Model3390AWG
+from tests.conftest import FakeCom
+
+
+class CountingCom(FakeCom):
+    """Communicator which counts "SYST:ERR?" and answers no error.
+    """
+    def answer(self, msg):
+        if msg.endswith(b"SYST:ERR?\n"):
+            return b'+0,"No error"\n'
+        return b"1000.0\n"
+
+    @property
+    def checks(self):
+        return sum(w.endswith(b"SYST:ERR?\n") for w in self.written)
+
+
+class CountingValidator(BaseValidator):
+    def _validate(self):
+        self.validations += 1
+
+
+class Handler(BaseDeviceHandler, metaclass=CountingValidator):
+    validations = 0
+
+    def configure(self):
+        return
+
+    def show_state(self):
+        return
+
+    def status_query(self):
+        return
+
+    @query
+    def measure(self):
+        return
+
+    @setter
+    def show_and_reset(self):
+        return
+
+    @unvalidated
+    def reconnect(self):
+        return
+
+
+class TestClassify(object):
+    """Test class of 'maodevice.core.BaseValidator.classify'
+    """
+    @pytest.mark.parametrize("name, expected", [
+        ("configure", "setter"),
+        ("show_state", "query"),
+        ("status_query", "query"),
+        ("measure", "query"),
+        ("show_and_reset", "setter"),
+        ("reconnect", None),
+    ])
+    def test_marks(self, name, expected):
+        """Test method for the marks of the methods
+        """
+        method = getattr(Handler, name)
+        assert getattr(method, "validation", None) == expected
+
+    def test_commands(self):
+        """Test method for the marks of the generated methods
+        """
+        assert Model3390AWG.set_frequency.validation == "setter"
+        assert Model3390AWG.query_frequency.validation == "query"
+        assert Model3390AWG.query_pulse_high_low_levels.validation == "query"
+        assert Model3390AWG.forget_uploads.validation is None
+
+
+class TestValidationPolicy(object):
+    """Test class of 'maodevice.core.ValidationPolicy'
+    """
+    def test_default(self):
+        """Test method for validating only the setters by default
+        """
+        handler = Handler(CountingCom())
+        handler.configure()
+        handler.show_state()
+        handler.measure()
+        handler.reconnect()
+        assert handler.validations == 1
+        assert handler.validation_policy.skipped == 2
+
+    def test_sampling(self):
+        """Test method for validating a fraction of the queries
+        """
+        handler = Handler(CountingCom())
+        handler.set_validation_policy(ValidationPolicy(queries=0.25))
+        for _ in range(8):
+            handler.show_state()
+        assert handler.validations == 2
+
+    def test_disabled(self):
+        """Test method for disabling the validation
+        """
+        handler = Handler(CountingCom())
+        handler.set_validation_policy(ValidationPolicy(setters=False))
+        handler.configure()
+        assert handler.validations == 0
+
+        handler.set_validation_policy(None)
+        handler.configure()
+        handler.show_state()
+        handler.reconnect()
+        assert handler.validations == 2
+
+    def test_awg_round_trips(self):
+        """Test method for the error checks of the AWG
+        """
+        com = CountingCom()
+        awg = Model3390AWG(com)
+        for _ in range(10):
+            awg.query_frequency()
+        assert com.checks == 0
+
+        awg.set_frequency(1000.)
+        assert com.checks == 1
+
+        awg.set_validation_policy(ValidationPolicy(queries=1.))
+        awg.query_frequency()
+        assert com.checks == 2
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+import socket
+import struct
+
+import numpy as np
+import pytest
+from maodevice.correlator import DecodePipeline
+from maodevice.correlator.vdif import (
+    decode_frames,
+    parse_header,
+    parse_headers,
+    payload_view,
+)
+
+
+def frame(frame_number, thread=5, n_samples=8):
+    words = [
+        100,
+        (40 << 24) | frame_number,
+        (1 << 29) | ((32 + n_samples * 4) // 8),
+        (int(thread == 5) << 31) | (31 << 26) | (thread << 16) | 42,
+        0, 0, 0, 0,
+    ]
+    payload = (np.arange(n_samples) + frame_number).astype(">f4")
+    return struct.pack("<8I", *words) + payload.tobytes()
+
+
+class TestVDIF(object):
+    """Test class of 'maodevice.correlator.vdif'
+    """
+    def test_parse_header(self):
+        """Test method for parsing a header
+        """
+        header = parse_header(frame(7))
+        assert header.seconds == 100
+        assert header.ref_epoch == 40
+        assert header.frame_number == 7
+        assert header.frame_bytes == 64
+        assert header.is_complex
+        assert header.bits_per_sample == 32
+        assert (header.thread, header.station) == (5, 42)
+
+    def test_decode_in_place(self):
+        """Test method for decoding frames in place
+        """
+        buf = bytearray(frame(0) + frame(1))
+        frames = decode_frames(buf, 64)
+        assert np.shares_memory(frames, np.frombuffer(buf, np.uint8))
+        assert payload_view(frames)[1].tolist() == [1 + 2j, 3 + 4j,
+                                                    5 + 6j, 7 + 8j]
+        assert parse_headers(frames["header"])["frame_number"].tolist() \
+            == [0, 1]
+
+    def test_decode_real(self):
+        """Test method for decoding frames of real samples
+        """
+        frames = decode_frames(bytearray(frame(3, thread=1)), 64)
+        assert payload_view(frames)[0].tolist() == list(range(3, 11))
+
+
+class TestDecodePipeline(object):
+    """Test class of 'maodevice.correlator.DecodePipeline'
+    """
+    def test_write(self):
+        """Test method for decoding written frames by the workers
+        """
+        with DecodePipeline(64, frames_per_slot=4, n_slots=4,
+                            n_workers=2) as pipeline:
+            for head in range(0, 16, 4):
+                data = b"".join(frame(i) for i in range(head, head + 4))
+                pipeline.write(data)
+
+            numbers = []
+            for _ in range(4):
+                slot, frames = pipeline.get(timeout=10)
+                payload = payload_view(frames)
+                assert payload[:, 0].real.tolist() == \
+                    (frames["header"][:, 1] & 0xFFFFFF).astype(float).tolist()
+                headers = parse_headers(frames["header"])
+                numbers += headers["frame_number"].tolist()
+                del frames, payload
+                pipeline.release(slot)
+
+        assert sorted(numbers) == list(range(16))
+
+    def test_empty_slot(self):
+        """Test method for submitting an empty slot
+        """
+        with DecodePipeline(64, frames_per_slot=2, n_slots=1,
+                            n_workers=1) as pipeline:
+            pipeline.write(frame(0) + frame(1))
+            slot, frames = pipeline.get(timeout=10)
+            del frames
+            pipeline.release(slot)
+
+            slot = pipeline.acquire()
+            pipeline.submit(slot, n_frames=0)
+            slot, frames = pipeline.get(timeout=10)
+            assert len(frames) == 0
+            del frames
+            pipeline.release(slot)
+
+    def test_receive(self):
+        """Test method for receiving frames over UDP
+        """
+        with DecodePipeline(64, frames_per_slot=2, n_slots=2,
+                            n_workers=1) as pipeline:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.bind(("127.0.0.1", 0))
+                address = sock.getsockname()
+            pipeline.receive(address, timeout=0.05)
+
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                numbers = []
+                for i in range(50):
+                    sock.sendto(frame(i, thread=1), address)
+                    try:
+                        slot, frames = pipeline.get(timeout=0.05)
+                    except Exception:
+                        continue
+                    numbers += payload_view(frames)[:, 0].tolist()
+                    del frames
+                    pipeline.release(slot)
+                    if len(numbers) >= 2:
+                        break
+
+        assert len(numbers) >= 2
+
+    def test_receive_oversize(self):
+        """Test method for dropping the datagrams larger than a frame
+        """
+        with DecodePipeline(64, frames_per_slot=2, n_slots=2,
+                            n_workers=1) as pipeline:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.bind(("127.0.0.1", 0))
+                address = sock.getsockname()
+            pipeline.receive(address, timeout=0.05)
+
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                numbers = []
+                for i in range(50):
+                    sock.sendto(frame(1000 + i, thread=1, n_samples=10),
+                                address)
+                    sock.sendto(frame(i, thread=1), address)
+                    try:
+                        slot, frames = pipeline.get(timeout=0.05)
+                    except Exception:
+                        continue
+                    numbers += payload_view(frames)[:, 0].tolist()
+                    del frames
+                    pipeline.release(slot)
+                    if len(numbers) >= 4:
+                        break
+
+        assert len(numbers) >= 4
+        assert max(numbers) < 1000
+
+
+if __name__ == "__main__":
+    pytest.main()
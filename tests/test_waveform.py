@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+from maodevice.exceptions import Model3390AWGError
+from maodevice.scpi import ieee_block, parse_ieee_block
+from maodevice.transmitter import Model3390AWG, WaveformCache
+from maodevice.transmitter.waveform import (
+    chirp, digest, prbs, pulse_train, to_dac, tones,
+)
+from tests.conftest import FakeCom
+
+
+class AwgCom(FakeCom):
+    """Communicator which answers no error to "SYST:ERR?".
+    """
+    def __init__(self):
+        super().__init__()
+        self.errors = []
+
+    def answer(self, msg):
+        replies = self.errors + [b'+0,"No error"'] * 20
+        self.errors = []
+        return b";".join(replies[:20]) + b"\n"
+
+    @property
+    def uploads(self):
+        return [w for w in self.written if b"DATA:" in w]
+
+
+class TestGenerators(object):
+    """Test class of 'maodevice.transmitter.waveform'
+    """
+    def test_chirp(self):
+        """Test method for a chirp
+        """
+        signal = chirp(1024, 1, 10)
+        assert signal.shape == (1024,)
+        assert signal[0] == pytest.approx(1.)
+        assert np.all(np.abs(signal) <= 1.)
+
+    def test_pulse_train(self):
+        """Test method for a pulse train
+        """
+        signal = pulse_train(20, 10, 3, delay=2)
+        high = np.flatnonzero(signal > 0)
+        assert list(high) == [2, 3, 4, 12, 13, 14]
+        assert set(signal) <= {1., -1.}
+
+    def test_prbs_period(self):
+        """Test method for the period of a PRBS
+        """
+        signal = prbs(2 * 127, order=7)
+        assert np.array_equal(signal[:127], signal[127:])
+        assert not np.array_equal(signal[:63], signal[1:64])
+        assert np.sum(signal[:127] < 0) == 64
+
+    def test_prbs_chip(self):
+        """Test method for the chips of a PRBS
+        """
+        signal = prbs(30, order=9, chip=3)
+        assert np.all(signal[0::3] == signal[1::3])
+        assert np.all(signal[0::3] == signal[2::3])
+
+    def test_tones(self):
+        """Test method for the sum of tones
+        """
+        signal = tones(4096, [3, 7], amps=[1., 0.5])
+        assert np.max(np.abs(signal)) == pytest.approx(1.)
+        spectrum = np.abs(np.fft.rfft(signal))
+        assert set(np.argsort(spectrum)[-2:]) == {3, 7}
+
+    def test_to_dac(self):
+        """Test method for converting a signal to DAC codes
+        """
+        codes = to_dac(np.array([-2., -1., 0., 0.5, 1., 2.]))
+        assert codes.dtype == np.int16
+        assert list(codes) == [-8191, -8191, 0, 4096, 8191, 8191]
+
+
+class TestWaveformCache(object):
+    """Test class of 'maodevice.transmitter.WaveformCache'
+    """
+    def test_memory_and_disk(self, tmp_path):
+        """Test method for the caches in memory and on disk
+        """
+        cache = WaveformCache(tmp_path)
+        codes = cache.get("chirp", 512, f0=1, f1=50)
+        assert not codes.flags.writeable
+        assert cache.get("chirp", 512, f1=50, f0=1) is codes
+        assert cache.stats == {"hits": 1, "loads": 0, "misses": 1}
+        assert len(list(tmp_path.glob("*.npy"))) == 1
+
+        other = WaveformCache(tmp_path)
+        loaded = other.get("chirp", 512, f0=1, f1=50)
+        assert np.array_equal(loaded, codes)
+        assert other.stats == {"hits": 0, "loads": 1, "misses": 0}
+
+    def test_key(self):
+        """Test method for the key of a waveform
+        """
+        key = WaveformCache.key("tones", 64, freqs=(1, 2))
+        assert key == WaveformCache.key("tones", 64, freqs=[1, 2])
+        assert key != WaveformCache.key("tones", 64, freqs=[1, 3])
+        assert key != WaveformCache.key("tones", 64, 12, freqs=[1, 2])
+
+    def test_lru(self, tmp_path):
+        """Test method for evicting the least recently used waveform
+        """
+        cache = WaveformCache(tmp_path, maxsize=2)
+        for order in (7, 9, 11):
+            cache.get("prbs", 100, order=order)
+        assert len(cache) == 2
+        cache.clear(files=True)
+        assert len(cache) == 0
+        assert not list(tmp_path.glob("*.npy"))
+
+
+class TestIeeeBlock(object):
+    """Test class of IEEE-488.2 blocks in 'maodevice.scpi'
+    """
+    def test_roundtrip(self):
+        """Test method for building and parsing a block
+        """
+        assert ieee_block(b"hello") == b"#15hello"
+        data = bytes(range(256)) * 5
+        assert parse_ieee_block(ieee_block(data) + b"\n") == data
+
+
+class TestUploadWaveform(object):
+    """Test class of 'Model3390AWG.upload_waveform'
+    """
+    def test_skip_identical(self):
+        """Test method for skipping the upload of an identical waveform
+        """
+        com = AwgCom()
+        awg = Model3390AWG(com)
+        codes = to_dac(tones(256, [4]))
+
+        assert awg.upload_waveform(codes)
+        assert len(com.uploads) == 1
+        block = com.uploads[0].split(b"VOLATILE, ", 1)[1]
+        sent = np.frombuffer(parse_ieee_block(block), dtype="<i2")
+        assert np.array_equal(sent, codes)
+        assert awg.uploaded["VOLATILE"] == digest(codes)
+
+        assert not awg.upload_waveform(codes.copy())
+        assert len(com.uploads) == 1
+
+        assert awg.upload_waveform(codes, name="TONE4")
+        assert com.uploads[-1] == b"DATA:COPY TONE4, VOLATILE\n"
+        assert not awg.upload_waveform(codes, name="TONE4")
+        assert len(com.uploads) == 2
+
+        awg.forget_uploads()
+        assert awg.upload_waveform(codes)
+        assert len(com.uploads) == 3
+
+    def test_rejected(self):
+        """Test method for a waveform rejected by the device
+        """
+        com = AwgCom()
+        awg = Model3390AWG(com)
+        codes = to_dac(tones(256, [4]))
+
+        com.errors = [b'-222,"Data out of range"']
+        with pytest.raises(Model3390AWGError):
+            awg.upload_waveform(codes, name="TONE4")
+        assert awg.uploaded == {}
+
+        assert awg.upload_waveform(codes, name="TONE4")
+        assert len(com.uploads) == 4
+        assert awg.uploaded == {"VOLATILE": digest(codes),
+                                "TONE4": digest(codes)}
+
+    def test_invalid_codes(self):
+        """Test method for exceptions of invalid codes
+        """
+        awg = Model3390AWG(AwgCom())
+        with pytest.raises(AssertionError):
+            awg.upload_waveform(np.full(16, 9000))
+        with pytest.raises(AssertionError):
+            awg.upload_waveform(np.zeros(16))
+
+
+if __name__ == "__main__":
+    pytest.main()